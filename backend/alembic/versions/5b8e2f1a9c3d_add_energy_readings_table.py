@@ -0,0 +1,53 @@
+"""add energy readings table
+
+Revision ID: 5b8e2f1a9c3d
+Revises: e2232b839834
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f1a9c3d'
+down_revision: Union[str, None] = 'e2232b839834'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'energy_readings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('configuration_id', sa.Integer(), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('interval_minutes', sa.Integer(), nullable=False, server_default='60'),
+        sa.Column('source', sa.String(), nullable=False, server_default='meter'),
+        sa.Column('produced_kwh', sa.Float(), nullable=True),
+        sa.Column('consumed_kwh', sa.Float(), nullable=True),
+        sa.Column('shared_kwh', sa.Float(), nullable=True),
+        sa.Column('grid_import_kwh', sa.Float(), nullable=True),
+        sa.Column('grid_export_kwh', sa.Float(), nullable=True),
+        sa.Column('battery_charge_kwh', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['configuration_id'], ['cer_configuration.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_energy_readings_id'), 'energy_readings', ['id'], unique=False)
+    op.create_index(
+        'ix_energy_readings_configuration_member_timestamp',
+        'energy_readings',
+        ['configuration_id', 'member_id', 'timestamp'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_energy_readings_configuration_member_timestamp', table_name='energy_readings')
+    op.drop_index(op.f('ix_energy_readings_id'), table_name='energy_readings')
+    op.drop_table('energy_readings')
@@ -0,0 +1,50 @@
+"""add geography columns to configurations and members
+
+Revision ID: 7c4d9e2b6a1f
+Revises: 5b8e2f1a9c3d
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.types import Geography
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4d9e2b6a1f'
+down_revision: Union[str, None] = '5b8e2f1a9c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    op.add_column('cer_configuration', sa.Column('geog', Geography(), nullable=True))
+    op.add_column('members', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('members', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('members', sa.Column('geog', Geography(), nullable=True))
+
+    # Backfill from the existing {"lat": ..., "lng": ...} location documents
+    op.execute("""
+        UPDATE cer_configuration
+        SET geog = ST_SetSRID(
+            ST_MakePoint((location->>'lng')::float, (location->>'lat')::float), 4326
+        )::geography
+        WHERE location->>'lat' IS NOT NULL AND location->>'lng' IS NOT NULL
+    """)
+
+    op.create_index('ix_cer_configuration_geog', 'cer_configuration', ['geog'], unique=False, postgresql_using='gist')
+    op.create_index('ix_members_geog', 'members', ['geog'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_members_geog', table_name='members')
+    op.drop_index('ix_cer_configuration_geog', table_name='cer_configuration')
+    op.drop_column('members', 'geog')
+    op.drop_column('members', 'longitude')
+    op.drop_column('members', 'latitude')
+    op.drop_column('cer_configuration', 'geog')
@@ -0,0 +1,45 @@
+"""add primary substations table
+
+Revision ID: 9a3e5f7c1d2b
+Revises: 7c4d9e2b6a1f
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.types import Geometry
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e5f7c1d2b'
+down_revision: Union[str, None] = '7c4d9e2b6a1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'primary_substations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('region', sa.String(), nullable=True),
+        sa.Column('distributor', sa.String(), nullable=True),
+        sa.Column('area', Geometry('MULTIPOLYGON'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_primary_substations_id'), 'primary_substations', ['id'], unique=False)
+    op.create_index(op.f('ix_primary_substations_code'), 'primary_substations', ['code'], unique=True)
+    op.create_index('ix_primary_substations_area', 'primary_substations', ['area'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_primary_substations_area', table_name='primary_substations')
+    op.drop_index(op.f('ix_primary_substations_code'), table_name='primary_substations')
+    op.drop_index(op.f('ix_primary_substations_id'), table_name='primary_substations')
+    op.drop_table('primary_substations')
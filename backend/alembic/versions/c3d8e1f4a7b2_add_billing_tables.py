@@ -0,0 +1,78 @@
+"""add tariff rates and billing statements tables
+
+Revision ID: c3d8e1f4a7b2
+Revises: 9a3e5f7c1d2b
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e1f4a7b2'
+down_revision: Union[str, None] = '9a3e5f7c1d2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tariff_rates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('region', sa.String(), nullable=False),
+        sa.Column('base_rate', sa.Float(), nullable=False),
+        sa.Column('regional_bonus', sa.Float(), nullable=False),
+        sa.Column('capacity_bonus_small', sa.Float(), nullable=False),
+        sa.Column('capacity_bonus_medium', sa.Float(), nullable=False),
+        sa.Column('capacity_bonus_large', sa.Float(), nullable=False),
+        sa.Column('social_bonus', sa.Float(), nullable=False),
+        sa.Column('valid_from', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('valid_to', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tariff_rates_id'), 'tariff_rates', ['id'], unique=False)
+    op.create_index('ix_tariff_rates_region_valid_from', 'tariff_rates', ['region', 'valid_from'], unique=False)
+
+    op.create_table(
+        'billing_statements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('configuration_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(), nullable=False),
+        sa.Column('energy_shared', sa.Float(), nullable=False),
+        sa.Column('base_rate', sa.Float(), nullable=False),
+        sa.Column('regional_bonus', sa.Float(), nullable=False),
+        sa.Column('capacity_bonus', sa.Float(), nullable=False),
+        sa.Column('social_bonus', sa.Float(), nullable=False),
+        sa.Column('total_incentive', sa.Float(), nullable=False),
+        sa.Column('grid_fees', sa.Float(), nullable=False),
+        sa.Column('community_fund', sa.Float(), nullable=False),
+        sa.Column('taxes', sa.Float(), nullable=False),
+        sa.Column('fees', sa.Float(), nullable=False),
+        sa.Column('net_payment', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['configuration_id'], ['cer_configuration.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id', 'period', name='uq_billing_statements_member_period')
+    )
+    op.create_index(op.f('ix_billing_statements_id'), 'billing_statements', ['id'], unique=False)
+    op.create_index(
+        'ix_billing_statements_configuration_period', 'billing_statements', ['configuration_id', 'period'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_billing_statements_configuration_period', table_name='billing_statements')
+    op.drop_index(op.f('ix_billing_statements_id'), table_name='billing_statements')
+    op.drop_table('billing_statements')
+    op.drop_index('ix_tariff_rates_region_valid_from', table_name='tariff_rates')
+    op.drop_index(op.f('ix_tariff_rates_id'), table_name='tariff_rates')
+    op.drop_table('tariff_rates')
@@ -0,0 +1,47 @@
+"""add billing runs table
+
+Revision ID: d4e9f2a5b8c3
+Revises: c3d8e1f4a7b2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9f2a5b8c3'
+down_revision: Union[str, None] = 'c3d8e1f4a7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'billing_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(), nullable=False),
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('total_members', sa.Integer(), nullable=False),
+        sa.Column('processed_members', sa.Integer(), nullable=False),
+        sa.Column('written_statements', sa.Integer(), nullable=False),
+        sa.Column('last_configuration_id', sa.Integer(), nullable=True),
+        sa.Column('last_member_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_billing_runs_id'), 'billing_runs', ['id'], unique=False)
+    op.create_index('ix_billing_runs_period_scope', 'billing_runs', ['period', 'scope'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_billing_runs_period_scope', table_name='billing_runs')
+    op.drop_index(op.f('ix_billing_runs_id'), table_name='billing_runs')
+    op.drop_table('billing_runs')
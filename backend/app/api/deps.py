@@ -1,7 +1,7 @@
-from typing import Generator, Optional
+from typing import Callable, Generator, Optional
 from datetime import datetime, timedelta
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -19,6 +19,20 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+def get_session_factory() -> Callable[[], Session]:
+    """
+    Session factory for handlers whose work outlives the request scope, such
+    as streaming responses; `get_db` sessions are closed before streaming.
+    """
+    return SessionLocal
+
+def get_tenant_id(x_tenant_id: Optional[str] = Header(None)) -> Optional[str]:
+    """
+    Tenant the request is scoped to. Read from a header rather than the token
+    so cached reads can be served without a user lookup.
+    """
+    return x_tenant_id
+
 async def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
@@ -7,12 +7,20 @@ from app.api.v1.endpoints import (
     members,
     participation_requests,
     app_users,
+    configurations,
+    substations,
+    billing,
 )
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(utils.router, prefix="/utils", tags=["utils"])
+api_router.include_router(
+    configurations.router,
+    prefix="/configurations",
+    tags=["configurations"]
+)
 api_router.include_router(members.router, prefix="/members", tags=["members"])
 api_router.include_router(
     participation_requests.router,
@@ -23,4 +31,6 @@ api_router.include_router(
     app_users.router,
     prefix="/app-users",
     tags=["app-users"]
-) 
\ No newline at end of file
+)
+api_router.include_router(substations.router, prefix="/substations", tags=["substations"])
+api_router.include_router(billing.router, prefix="/billing", tags=["billing"])
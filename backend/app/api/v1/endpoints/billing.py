@@ -0,0 +1,38 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import BillingRun
+from app.schemas import billing as schemas
+from app.api import deps
+
+router = APIRouter()
+
+@router.get("/runs", response_model=List[schemas.BillingRunInDB])
+def list_billing_runs(
+    db: Session = Depends(deps.get_db),
+    period: Optional[str] = Query(None, description="Filter by billing period (YYYY-MM)"),
+    limit: int = Query(50, ge=1, le=500),
+) -> Any:
+    """
+    Retrieve billing runs, latest first, with their progress.
+    """
+    query = db.query(BillingRun)
+    if period:
+        query = query.filter(BillingRun.period == period)
+    return query.order_by(BillingRun.id.desc()).limit(limit).all()
+
+@router.get("/runs/{run_id}", response_model=schemas.BillingRunInDB)
+def read_billing_run(
+    run_id: int,
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Get a billing run: status, processed members and checkpoint.
+    """
+    run = crud.billing_run.get(db, id=run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Billing run not found")
+    return run
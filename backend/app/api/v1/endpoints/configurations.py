@@ -1,21 +1,37 @@
-from typing import Any, List, Optional
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app import crud
+from app import crud, models
 from app.models import Configuration, Member
 from app.schemas import configuration as schemas
 from app.api import deps
 from app.core.config import settings
+from app.core.export import EXPORT_FORMATS, export_columns, export_stream
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified, query_fingerprint
+from app.core.live import broadcaster, channel_for
+from app.core.response_cache import cache_response, cached_response, request_cache_key, response_cache
+from app.db.types import make_point
+from app.schemas import energy_reading as reading_schemas
+from app.schemas import member as member_schemas
 
 router = APIRouter()
 
+# List and detail payloads include participant counts, so member writes
+# invalidate them too
+CACHE_NAMESPACE = "configurations"
+response_cache.depends_on(CACHE_NAMESPACE, (Configuration.__tablename__, Member.__tablename__))
+
 @router.post("/", response_model=schemas.ConfigurationInDB)
 def create_configuration(
     *,
     db: Session = Depends(deps.get_db),
+    current_user: models.AppUser = Depends(deps.get_current_active_user),
     configuration_in: schemas.ConfigurationCreate,
 ) -> Any:
     """
@@ -24,11 +40,52 @@ def create_configuration(
     configuration = crud.configuration.create(db=db, obj_in=configuration_in)
     return configuration
 
-@router.get("/", response_model=schemas.ConfigurationResponse)
-async def list_configurations(
+# Columns served by the list endpoint, in ConfigurationList field order.
+# Selecting columns rather than entities also keeps the `members` selectin
+# relationship from being loaded for every row.
+LIST_COLUMNS = (
+    Configuration.id,
+    Configuration.name,
+    Configuration.description,
+    Configuration.type,
+    Configuration.legal_type,
+    Configuration.status,
+    Configuration.address,
+    Configuration.location,
+    Configuration.region,
+    Configuration.is_active,
+    Configuration.created_at,
+    Configuration.updated_at,
+)
+LIST_FIELDS = tuple(column.key for column in LIST_COLUMNS) + ("participant_count",)
+
+def serialize_rows(rows) -> List[dict]:
+    """
+    Build response items straight from row tuples. The columns already have
+    the types ConfigurationList declares, so per-row validation is skipped.
+    """
+    return [dict(zip(LIST_FIELDS, row)) for row in rows]
+
+def _participant_count():
+    return (
+        select(func.count(Member.id))
+        .where(Member.configuration_id == Configuration.id)
+        .correlate(Configuration)
+        .scalar_subquery()
+        .label("participant_count")
+    )
+
+@router.get(
+    "/",
+    response_model=schemas.ConfigurationResponse,
+    response_class=ORJSONResponse,
+)
+def list_configurations(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    tenant_id: Optional[str] = Depends(deps.get_tenant_id),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10000),
     type_filter: Optional[str] = Query(None, description="Filter by configuration type (CER, GAC, etc.)"),
     status: Optional[str] = Query(None, description="Filter by status (draft, active, inactive)"),
     search: Optional[str] = Query(None, description="Search in name and description"),
@@ -36,83 +93,278 @@ async def list_configurations(
     """
     Retrieve configurations with optional filtering.
     """
-    query = db.query(
-        Configuration,
-        func.count(Member.id).label('participant_count')
-    ).outerjoin(
-        Member,
-        Configuration.id == Member.configuration_id
-    ).group_by(Configuration.id)
+    cache_key = request_cache_key(request, CACHE_NAMESPACE, tenant_id)
+    cached = cached_response(request, cache_key)
+    if cached is not None:
+        return cached
 
-    # Apply filters
+    filters = []
     if type_filter:
-        query = query.filter(Configuration.type == type_filter)
+        filters.append(Configuration.type == type_filter)
     if status:
-        query = query.filter(Configuration.status == status)
+        filters.append(Configuration.status == status)
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        filters.append(
             (Configuration.name.ilike(search_term)) |
             (Configuration.description.ilike(search_term))
         )
 
-    # Get total count for pagination
-    total = query.count()
-
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
-
-    # Execute query
-    results = query.all()
-
-    # Convert results to response model
-    configurations = []
-    for config, participant_count in results:
-        config_dict = {
-            "id": config.id,
-            "name": config.name,
-            "description": config.description,
-            "type": config.type,
-            "legal_type": config.legal_type,
-            "status": config.status,
-            "address": config.address,
-            "location": config.location,
-            "region": config.region,
-            "participant_count": participant_count,
-            "is_active": config.is_active,
-            "created_at": config.created_at,
-            "updated_at": config.updated_at
-        }
-        configurations.append(schemas.ConfigurationList(**config_dict))
+    # Total count for pagination plus an aggregate version of the result set:
+    # any insert, update or delete of a matching configuration or one of its
+    # members changes one of these values
+    total, config_version, member_count, member_version = db.execute(
+        select(
+            func.count(func.distinct(Configuration.id)),
+            func.max(func.coalesce(Configuration.updated_at, Configuration.created_at)),
+            func.count(Member.id),
+            func.max(func.coalesce(Member.updated_at, Member.created_at)),
+        )
+        .select_from(Configuration)
+        .outerjoin(Member, Member.configuration_id == Configuration.id)
+        .where(*filters)
+    ).one()
+
+    etag = make_etag("configurations", query_fingerprint(request), total, config_version, member_count, member_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    rows = db.execute(
+        select(*LIST_COLUMNS, _participant_count())
+        .where(*filters)
+        .order_by(Configuration.id)
+        .offset(skip)
+        .limit(limit)
+    ).all()
 
     # Calculate pagination info
     total_pages = (total + limit - 1) // limit
     current_page = skip // limit
 
-    return {
-        "items": configurations,
+    # Returned as a Response so FastAPI does not re-validate every item
+    # against response_model; the model still documents the payload
+    return cache_response(cache_key, ORJSONResponse({
+        "items": serialize_rows(rows),
         "total": total,
         "total_pages": total_pages,
         "page": current_page,
         "size": limit
-    }
+    }, headers=cache_headers(etag)))
+
+@router.get(
+    "/near",
+    response_model=List[schemas.ConfigurationNearby],
+    response_class=ORJSONResponse,
+)
+def list_configurations_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=1000),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Configurations within `radius_km` of a point, nearest first.
+    """
+    point = make_point(lng, lat)
+    distance = func.ST_Distance(Configuration.geog, point)
+    rows = db.execute(
+        select(*LIST_COLUMNS, _participant_count(), (distance / 1000.0).label("distance_km"))
+        .where(func.ST_DWithin(Configuration.geog, point, radius_km * 1000.0))
+        .order_by(distance)
+        .limit(limit)
+    ).all()
+    return ORJSONResponse([dict(zip(LIST_FIELDS + ("distance_km",), row)) for row in rows])
+
+@router.get("/export")
+def export_configurations(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = Query(None, description="Filter by status (draft, active, inactive)"),
+    session_factory: Callable[[], Session] = Depends(deps.get_session_factory),
+) -> StreamingResponse:
+    """
+    Stream all matching configurations as NDJSON or CSV using a server-side cursor.
+    """
+    statement = select(*export_columns(Configuration.__table__), _participant_count()).order_by(Configuration.id)
+    if status:
+        statement = statement.where(Configuration.status == status)
+    return StreamingResponse(
+        export_stream(format, session_factory, statement, settings.EXPORT_BATCH_SIZE),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="configurations.{format}"'},
+    )
+
+@router.get("/{configuration_id}/timeseries")
+def export_configuration_timeseries(
+    configuration_id: int,
+    format: str = Query("arrow", pattern="^(arrow|parquet|csv|ndjson)$"),
+    member_id: Optional[int] = Query(None, description="Only this member's series"),
+    columns: Optional[str] = Query(None, description="Comma-separated value columns to include"),
+    start: Optional[datetime] = Query(None, description="Inclusive start of the time range"),
+    end: Optional[datetime] = Query(None, description="Exclusive end of the time range"),
+    source: Optional[str] = Query(None, description="Filter by source (meter, simulation)"),
+    session_factory: Callable[[], Session] = Depends(deps.get_session_factory),
+) -> StreamingResponse:
+    """
+    Export a configuration's energy time series as an Arrow IPC stream or a
+    Parquet file. Column projection and the time range are applied in SQL.
+    """
+    try:
+        statement = crud.energy_reading.timeseries_query(
+            configuration_id=configuration_id,
+            member_id=member_id,
+            columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else None,
+            start=start,
+            end=end,
+            source=source,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"configuration-{configuration_id}-timeseries"
+    if member_id is not None:
+        filename += f"-member-{member_id}"
+    return StreamingResponse(
+        export_stream(format, session_factory, statement, settings.TIMESERIES_EXPORT_BATCH_SIZE),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+@router.get("/{configuration_id}/members/nearby", response_model=List[member_schemas.MemberNearby])
+def list_members_near_configuration(
+    configuration_id: int,
+    radius_km: Optional[float] = Query(
+        None, gt=0, le=1000, description="Defaults to the configuration's member_limits.geographical_limit_km"
+    ),
+    all_configurations: bool = Query(False, description="Include members of other configurations"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Members within a radius of the configuration's location, nearest first.
+    """
+    configuration = db.execute(
+        select(Configuration.geog, Configuration.member_limits).where(Configuration.id == configuration_id)
+    ).first()
+    if not configuration:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    if configuration.geog is None:
+        raise HTTPException(status_code=400, detail="Configuration has no location")
+    radius_km = radius_km or (configuration.member_limits or {}).get("geographical_limit_km")
+    if not radius_km:
+        raise HTTPException(status_code=400, detail="radius_km is required when the configuration has no geographical limit")
+
+    lng, lat = configuration.geog
+    members = []
+    for member, distance_km in crud.member.get_within(
+        db,
+        lng=lng,
+        lat=lat,
+        radius_km=radius_km,
+        configuration_id=None if all_configurations else configuration_id,
+        limit=limit,
+    ):
+        member.distance_km = distance_km
+        members.append(member)
+    return members
+
+@router.post("/{configuration_id}/readings")
+def create_configuration_readings(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.AppUser = Depends(deps.get_current_active_user),
+    configuration_id: int,
+    readings: List[reading_schemas.EnergyReadingCreate],
+) -> Any:
+    """
+    Store a batch of readings (meter or simulation output) for a
+    configuration; they are announced on its events stream.
+    """
+    if not crud.configuration.get(db=db, id=configuration_id):
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    if any(reading.configuration_id != configuration_id for reading in readings):
+        raise HTTPException(status_code=400, detail="Readings belong to another configuration")
+    created = crud.energy_reading.bulk_create(db, readings=[reading.model_dump() for reading in readings])
+    return {"created": created}
+
+@router.get("/{configuration_id}/events")
+async def stream_configuration_events(configuration_id: int, request: Request) -> StreamingResponse:
+    """
+    Server-sent events with simulation progress and new readings for a
+    configuration. Each event's data is a JSON object with type,
+    configuration_id, timestamp and data.
+    """
+    async def events():
+        async with broadcaster.subscribe(channel_for(configuration_id)) as subscription:
+            # Sent once subscribed, so clients know no later event is missed
+            yield b": subscribed\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(settings.LIVE_EVENTS_HEARTBEAT_SECONDS)
+                if message is None:
+                    # Keeps proxies from closing an idle connection
+                    yield b": keepalive\n\n"
+                else:
+                    yield b"data: " + message + b"\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/{configuration_id}/ws")
+async def configuration_events_websocket(websocket: WebSocket, configuration_id: int) -> None:
+    """
+    WebSocket variant of the events stream: one JSON text message per event.
+    """
+    # Subscribed before accepting, so no event published after the handshake is missed
+    async with broadcaster.subscribe(channel_for(configuration_id)) as subscription:
+        await websocket.accept()
+        async def forward():
+            while True:
+                message = await subscription.get(settings.LIVE_EVENTS_HEARTBEAT_SECONDS)
+                if message is not None:
+                    await websocket.send_text(message.decode())
 
-@router.get("/{configuration_id}", response_model=schemas.ConfigurationWithStats)
-async def get_configuration(
+        sender = asyncio.create_task(forward())
+        try:
+            # Clients only listen; reading is how a disconnect is noticed
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+
+@router.get(
+    "/{configuration_id}",
+    response_model=schemas.ConfigurationWithStats,
+    response_class=ORJSONResponse,
+)
+def get_configuration(
     configuration_id: int,
-    db: Session = Depends(deps.get_db)
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    tenant_id: Optional[str] = Depends(deps.get_tenant_id),
 ):
     """
     Get detailed configuration information including statistics.
     """
-    config = crud.configuration.get(db, id=configuration_id)
-    if not config:
+    cache_key = request_cache_key(request, CACHE_NAMESPACE, tenant_id)
+    cached = cached_response(request, cache_key)
+    if cached is not None:
+        return cached
+
+    row = db.execute(
+        select(*Configuration.__table__.columns, _participant_count())
+        .where(Configuration.id == configuration_id)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Configuration not found")
 
-    # Get participant count
-    participant_count = db.query(func.count(Member.id)).filter(
-        Member.configuration_id == configuration_id
-    ).scalar()
+    etag = make_etag("configuration", row.id, row.updated_at or row.created_at, row.participant_count)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
     # Get energy statistics (implement according to your energy tracking model)
     # This is a placeholder - implement actual energy calculations
@@ -124,19 +376,17 @@ async def get_configuration(
         "trees_equivalent": 0
     }
 
-    # Combine configuration data with statistics
-    config_data = {
-        **config.__dict__,
-        "participant_count": participant_count,
-        **energy_stats
-    }
-
-    return schemas.ConfigurationWithStats(**config_data)
+    # Combine configuration data with statistics; validated once here
+    config_data = schemas.ConfigurationWithStats(**row._mapping, **energy_stats)
+    return cache_response(
+        cache_key, ORJSONResponse(config_data.model_dump(), headers=cache_headers(etag))
+    )
 
 @router.put("/{configuration_id}", response_model=schemas.ConfigurationInDB)
 def update_configuration(
     *,
     db: Session = Depends(deps.get_db),
+    current_user: models.AppUser = Depends(deps.get_current_active_user),
     configuration_id: int,
     configuration_in: schemas.ConfigurationUpdate,
 ) -> Any:
@@ -196,6 +446,7 @@ def update_configuration(
             db.delete(member)
         
         db.commit()
+        crud.member.invalidate_cache()
     
     return configuration
 
@@ -203,6 +454,7 @@ def update_configuration(
 def delete_configuration(
     *,
     db: Session = Depends(deps.get_db),
+    current_user: models.AppUser = Depends(deps.get_current_active_user),
     configuration_id: int,
 ) -> Any:
     """
@@ -1,7 +1,7 @@
 from datetime import timedelta
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -9,11 +9,24 @@ from app import crud, schemas
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.rate_limit import (
+    login_account_limiter,
+    login_ip_limiter,
+    password_verification_slot,
+)
 
 router = APIRouter()
 
+def _too_many_requests(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, please retry later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
 @router.post("/login/access-token", response_model=schemas.Token)
 def login_access_token(
+    request: Request,
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
     tenant_id: Optional[int] = Query(None)
@@ -21,17 +34,31 @@ def login_access_token(
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    # Try to authenticate with email
-    user = crud.app_user.authenticate(
-        db, email=form_data.username, password=form_data.password, tenant_id=tenant_id
-    )
-    if not user:
-        # If email auth fails, try username
-        user = crud.app_user.get_by_username(db, username=form_data.username, tenant_id=tenant_id)
-        if user and crud.app_user.authenticate(db, email=user.email, password=form_data.password, tenant_id=tenant_id):
-            pass
-        else:
-            raise HTTPException(status_code=400, detail="Incorrect email/username or password")
+    # Throttle per client and per account before doing any hashing work
+    client_ip = request.client.host if request.client else "unknown"
+    allowed, retry_after = login_ip_limiter.hit(f"login:ip:{client_ip}")
+    if not allowed:
+        raise _too_many_requests(retry_after)
+    account = form_data.username.strip().lower()
+    allowed, retry_after = login_account_limiter.hit(f"login:account:{tenant_id}:{account}")
+    if not allowed:
+        raise _too_many_requests(retry_after)
+
+    with password_verification_slot() as acquired:
+        if not acquired:
+            raise _too_many_requests(1)
+
+        # Try to authenticate with email
+        user = crud.app_user.authenticate(
+            db, email=form_data.username, password=form_data.password, tenant_id=tenant_id
+        )
+        if not user:
+            # If email auth fails, try username
+            user = crud.app_user.get_by_username(db, username=form_data.username, tenant_id=tenant_id)
+            if user and crud.app_user.authenticate(db, email=user.email, password=form_data.password, tenant_id=tenant_id):
+                pass
+            else:
+                raise HTTPException(status_code=400, detail="Incorrect email/username or password")
     
     if not crud.app_user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
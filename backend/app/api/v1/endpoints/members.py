@@ -1,19 +1,24 @@
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from app import crud
 from app.models import Member, Configuration
 from app.schemas import member as schemas
 from app.api import deps
 from app.core.config import settings
+from app.core.export import EXPORT_FORMATS, export_columns, export_stream
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified, query_fingerprint
 
 router = APIRouter()
 
 @router.get("/", response_model=schemas.MemberResponse)
 async def list_members(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1),
@@ -45,8 +50,16 @@ async def list_members(
             (Member.smart_meter_id.ilike(search_term))
         )
 
-    # Get total count for pagination
-    total = query.count()
+    # Total count for pagination plus an aggregate version of the result set
+    total, version = query.with_entities(
+        func.count(Member.id),
+        func.max(func.coalesce(Member.updated_at, Member.created_at)),
+    ).one()
+
+    etag = make_etag("members", query_fingerprint(request), total, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
 
     # Apply pagination
     query = query.offset(skip).limit(limit)
@@ -73,9 +86,57 @@ def create_member(
     member = crud.member.create(db=db, obj_in=member_in)
     return member
 
+@router.get("/export")
+def export_members(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    configuration_id: Optional[int] = Query(None, description="Only export members of this configuration"),
+    type_filter: Optional[str] = Query(None, description="Filter by member type (consumer, producer, prosumer)"),
+    user_type: Optional[str] = Query(None, description="Filter by user type (real, simulated)"),
+    session_factory: Callable[[], Session] = Depends(deps.get_session_factory),
+) -> StreamingResponse:
+    """
+    Stream all matching members as NDJSON or CSV using a server-side cursor.
+    """
+    statement = select(*export_columns(Member.__table__)).order_by(Member.id)
+    if configuration_id is not None:
+        statement = statement.where(Member.configuration_id == configuration_id)
+    if type_filter:
+        statement = statement.where(Member.type == type_filter)
+    if user_type:
+        statement = statement.where(Member.user_type == user_type)
+
+    filename = f"members-{configuration_id}" if configuration_id is not None else "members"
+    return StreamingResponse(
+        export_stream(format, session_factory, statement, settings.EXPORT_BATCH_SIZE),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+@router.get("/nearby", response_model=List[schemas.MemberNearby])
+def list_members_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=1000),
+    configuration_id: Optional[int] = Query(None, description="Only members of this configuration"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Members within `radius_km` of a point, nearest first.
+    """
+    members = []
+    for member, distance_km in crud.member.get_within(
+        db, lng=lng, lat=lat, radius_km=radius_km, configuration_id=configuration_id, limit=limit
+    ):
+        member.distance_km = distance_km
+        members.append(member)
+    return members
+
 @router.get("/{member_id}", response_model=schemas.MemberDetail)
 def get_member(
     member_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
 ) -> Any:
     """
@@ -87,6 +148,10 @@ def get_member(
             status_code=404,
             detail="Member not found",
         )
+    etag = make_etag("member", member.id, member.updated_at or member.created_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     return member
 
 @router.put("/{member_id}", response_model=schemas.MemberInDB)
@@ -0,0 +1,82 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.models import Configuration, Substation
+from app.schemas import substation as schemas
+from app.api import deps
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.SubstationInDB])
+def list_substations(
+    db: Session = Depends(deps.get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    region: Optional[str] = Query(None, description="Filter by region"),
+) -> Any:
+    """
+    Retrieve primary substations (without their areas).
+    """
+    query = db.query(Substation)
+    if region:
+        query = query.filter(Substation.region == region)
+    return query.order_by(Substation.code).offset(skip).limit(limit).all()
+
+@router.post("/", response_model=schemas.SubstationInDB)
+def create_substation(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.AppUser = Depends(deps.get_current_active_superuser),
+    substation_in: schemas.SubstationCreate,
+) -> Any:
+    """
+    Create a primary substation from a GeoJSON area. Superusers only: every
+    coordinate resolution depends on these areas.
+    """
+    if crud.substation.get_by_code(db, code=substation_in.code):
+        raise HTTPException(status_code=400, detail="A substation with this code already exists")
+    return crud.substation.create(db=db, obj_in=substation_in)
+
+@router.post("/resolve", response_model=schemas.SubstationResolveResponse)
+def resolve_substations(
+    *,
+    db: Session = Depends(deps.get_db),
+    resolve_in: schemas.SubstationResolveRequest,
+) -> Any:
+    """
+    Resolve many coordinates to the primary substation serving each, in one call.
+    """
+    if len(resolve_in.points) > settings.SUBSTATION_RESOLVE_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.SUBSTATION_RESOLVE_MAX_POINTS} points per request",
+        )
+
+    required_code = None
+    if resolve_in.configuration_id is not None:
+        required_code = db.execute(
+            select(Configuration.primary_substation_id).where(Configuration.id == resolve_in.configuration_id)
+        ).scalar()
+        if required_code is None:
+            raise HTTPException(status_code=404, detail="Configuration not found")
+
+    codes, cache_hits = crud.substation.resolve(
+        db, points=[(point.lng, point.lat) for point in resolve_in.points]
+    )
+    return {
+        "items": [
+            {
+                "lat": point.lat,
+                "lng": point.lng,
+                "substation_code": code,
+                "eligible": None if required_code is None else code == required_code,
+            }
+            for point, code in zip(resolve_in.points, codes)
+        ],
+        "cache_hits": cache_hits,
+    }
@@ -0,0 +1,33 @@
+from celery import Celery
+from celery.signals import worker_init
+
+from app.core.config import settings
+from app.core.metrics import instrument_celery, metrics_registry
+
+celery = Celery(
+    "sentrics",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.services.sweep", "app.services.billing_fanout"],
+)
+
+celery.conf.update(
+    task_default_queue="cer",
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="Europe/Rome",
+    enable_utc=True,
+)
+
+if settings.METRICS_ENABLED:
+    instrument_celery()
+
+    @worker_init.connect(weak=False)
+    def _start_metrics_server(**kwargs):
+        # With the prefork pool, set PROMETHEUS_MULTIPROC_DIR so the children's
+        # samples are aggregated by this exporter.
+        if settings.CELERY_METRICS_PORT:
+            from prometheus_client import start_http_server
+
+            start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
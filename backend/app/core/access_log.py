@@ -0,0 +1,110 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+ACCESS_LOGGER = "app.access"
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread. The stock
+    handler renders the message in the caller, which would put string
+    formatting back on the event loop.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """Renders a record, plus any structured `fields` attached to it, as one JSON line."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Route all log records through a queue drained by a background thread, so
+    request handlers never block on formatting or stream I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    if settings.LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware emitting one structured access-log record per request:
+    method, route template, status and latency. Request headers and query
+    strings are never logged.
+
+    Successful requests are sampled at `sample_rate`; server errors and
+    requests slower than `slow_ms` are always logged.
+    """
+    def __init__(self, app, *, sample_rate: float = 1.0, slow_ms: float = 1000.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logging.getLogger(ACCESS_LOGGER)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if status_code >= 500 or duration_ms >= self.slow_ms or random.random() < self.sample_rate:
+                route = scope.get("route")
+                # Log the route template (/members/{member_id}) rather than the
+                # concrete path, so records aggregate and ids do not leak
+                path = getattr(route, "path", None) or "<unmatched>"
+                self.logger.info(
+                    "%s %s %s %.1fms",
+                    scope["method"], path, status_code, duration_ms,
+                    extra={"fields": {
+                        "method": scope["method"],
+                        "route": path,
+                        "status": status_code,
+                        "duration_ms": round(duration_ms, 2),
+                    }},
+                )
@@ -0,0 +1,192 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.http_cache import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # Optional: fall back to gzip only
+    brotli = None
+
+# Media types that are already compressed or not worth compressing
+EXCLUDED_MEDIA_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.apache.parquet",
+    "text/event-stream",
+)
+
+class _Compressor:
+    """Incremental compressor with the same interface for gzip and brotli."""
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress = self._compressor.process
+            self.flush = self._compressor.flush
+            self.finish = self._compressor.finish
+        else:
+            # wbits=31: gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress = self._compressor.compress
+            self.flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self._compressor.flush
+
+class CompressedBodyCache:
+    """
+    LRU of compressed response bodies keyed by (path, ETag, encoding), bounded
+    by total size. An ETag identifies the exact representation, so a hit can
+    be sent without compressing again.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple[str, str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli (when installed and
+    accepted) or gzip.
+
+    Bodies below `minimum_size` are sent as is. Streaming responses are
+    compressed chunk by chunk and flushed per chunk, so clients still see
+    data as it is produced. Complete bodies that carry an ETag are kept
+    compressed in `cache`, so repeat requests skip the compressor.
+
+    A compressed body is a different representation, so its ETag gets the
+    encoding as a suffix (see http_cache.encoded_etag). Every response of a
+    compressible type varies on Accept-Encoding, compressed or not, so caches
+    never hand an identity body to a client that asked for gzip or back.
+    """
+    def __init__(
+        self,
+        app,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_max_bytes: int = 64 << 20,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedBodyCache(cache_max_bytes) if cache_max_bytes else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(scope=start_message)
+                media_type = headers.get("content-type", "")
+                compressible = "content-encoding" not in headers and not media_type.startswith(EXCLUDED_MEDIA_TYPES)
+                if compressible:
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is not None and start_message["status"] == 304 and "etag" in headers:
+                    # A 304 repeats the ETag of the representation the client holds: the compressed one
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                if (
+                    encoding is None
+                    or not compressible
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag:
+                    headers["ETag"] = encoded_etag(etag, encoding)
+
+                if not more_body:
+                    # Whole body at once: compress (or reuse) and send with a length
+                    key = (scope["path"], etag, encoding)
+                    compressed = self.cache.get(key) if self.cache is not None and etag else None
+                    if compressed is None:
+                        c = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                        compressed = c.compress(body) + c.finish()
+                        if self.cache is not None and etag:
+                            self.cache.put(key, compressed)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                # Streaming: length is unknown until the end
+                del headers["Content-Length"]
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                await send(start_message)
+
+            if more_body:
+                chunk = compressor.compress(body) + compressor.flush()
+            else:
+                chunk = compressor.compress(body) + compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -24,7 +24,65 @@ class Settings(BaseSettings):
         raise ValueError(v)
 
     PROJECT_NAME: str = "SentricS"
-    
+
+    # Login throttling: token buckets per client IP and per account, plus a
+    # cap on concurrent bcrypt verifications
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_ACCOUNT: int = 5
+    LOGIN_RATE_LIMIT_PERIOD_SECONDS: float = 60.0
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 4
+    LOGIN_VERIFICATION_WAIT_SECONDS: float = 0.0
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Use in-memory buckets when unset
+
+    # Logging
+    LOG_JSON: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Fraction of successful requests logged
+    ACCESS_LOG_SLOW_MS: float = 1000.0  # Requests slower than this are always logged
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    CELERY_METRICS_PORT: Optional[int] = 9808  # Prometheus exporter port in Celery workers
+
+    # Response compression (brotli when installed, else gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Compressed bodies kept per ETag
+
+    # Cache-Control sent with ETagged resources: tenant data, always revalidated
+    HTTP_CACHE_CONTROL: str = "private, no-cache"
+
+    # Response cache for hot read endpoints: "redis", "memory" (single process
+    # only: other workers never see its invalidations), "none", or "auto" for
+    # redis when WEB_CONCURRENCY asks for several workers, else memory
+    RESPONSE_CACHE_BACKEND: str = "auto"
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None  # Defaults to the Celery broker
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Live events (SSE/WebSocket): Redis pub/sub shares them across processes
+    LIVE_EVENTS_REDIS_URL: Optional[str] = None  # In-process delivery only when unset
+    LIVE_EVENTS_QUEUE_SIZE: int = 256  # Events buffered per client before dropping the oldest
+    LIVE_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    LIVE_EVENTS_MAX_READINGS: int = 1000  # Larger batches are announced as a summary
+
+    # Substation lookup: per-coordinate cache and batch size of /substations/resolve
+    SUBSTATION_CACHE_MAX_ENTRIES: int = 100_000
+    SUBSTATION_CACHE_TTL_SECONDS: float = 24 * 3600
+    SUBSTATION_RESOLVE_MAX_POINTS: int = 10_000
+
+    # Rows fetched per server-side cursor round-trip by the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+    TIMESERIES_EXPORT_BATCH_SIZE: int = 50000
+
+    # SQL profiling (development only): per-request statement counts and N+1 warnings
+    SQL_PROFILING: bool = False
+    SQL_PROFILING_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Celery
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
@@ -0,0 +1,146 @@
+import csv
+import enum
+import io
+import tempfile
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, Sequence
+
+import orjson
+from sqlalchemy import Table, types as sqltypes
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.lazy import lazy_import
+from app.db.types import Geography
+
+pa = lazy_import("pyarrow")
+pa_ipc = lazy_import("pyarrow.ipc")
+pq = lazy_import("pyarrow.parquet")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+def export_columns(table: Table) -> list:
+    """
+    Columns of `table` to export. Geography columns are left out: they are
+    derived from coordinate columns that are already exported, and would
+    otherwise reach CSV as a "(lng, lat)" tuple string.
+    """
+    return [column for column in table.columns if not isinstance(column.type, Geography)]
+
+def iter_rows(session_factory: Callable[[], Session], statement: Select, batch_size: int) -> Iterator[Sequence]:
+    """
+    Iterate a SELECT through a server-side cursor, `batch_size` rows at a time,
+    so memory stays flat no matter how many rows match. Owns its session
+    because streaming outlives the request's dependency scope.
+    """
+    with session_factory() as db:
+        result = db.execute(
+            statement.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield partition
+
+def stream_ndjson(session_factory: Callable[[], Session], statement: Select, batch_size: int = 1000) -> Iterator[bytes]:
+    """One JSON object per line, flushed per batch."""
+    fields = [column.key for column in statement.selected_columns]
+    for partition in iter_rows(session_factory, statement, batch_size):
+        yield b"".join(
+            orjson.dumps(dict(zip(fields, row))) + b"\n" for row in partition
+        )
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+def stream_csv(session_factory: Callable[[], Session], statement: Select, batch_size: int = 1000) -> Iterator[bytes]:
+    """CSV with a header row; JSON columns are embedded as JSON strings."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in statement.selected_columns])
+    for partition in iter_rows(session_factory, statement, batch_size):
+        writer.writerows([_csv_value(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _arrow_type(sql_type: sqltypes.TypeEngine):
+    if isinstance(sql_type, sqltypes.DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, sqltypes.Integer):
+        return pa.int64()
+    if isinstance(sql_type, sqltypes.Float):
+        return pa.float64()
+    if isinstance(sql_type, sqltypes.Boolean):
+        return pa.bool_()
+    return pa.string()
+
+def arrow_schema(statement: Select):
+    return pa.schema(
+        [(column.key, _arrow_type(column.type)) for column in statement.selected_columns]
+    )
+
+def iter_record_batches(session_factory: Callable[[], Session], statement: Select, batch_size: int = 10000):
+    """Columnar batches built directly from server-side cursor partitions."""
+    schema = arrow_schema(statement)
+    for partition in iter_rows(session_factory, statement, batch_size):
+        columns = list(zip(*partition))
+        arrays = []
+        for values, field in zip(columns, schema):
+            if pa.types.is_string(field.type):
+                # Enums and JSON columns are exported as their text form
+                values = [None if v is None else v if isinstance(v, str) else str(_csv_value(v)) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def stream_arrow_ipc(session_factory: Callable[[], Session], statement: Select, batch_size: int = 10000) -> Iterator[bytes]:
+    """Arrow IPC stream format: schema message first, then one message per batch."""
+    sink = io.BytesIO()
+    with pa_ipc.new_stream(sink, arrow_schema(statement)) as writer:
+        for batch in iter_record_batches(session_factory, statement, batch_size):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    # End-of-stream marker written on close
+    yield sink.getvalue()
+
+def write_parquet(session_factory: Callable[[], Session], statement: Select, sink, batch_size: int = 10000) -> None:
+    """Write the query result to `sink` (path or binary file) as Parquet, one row group per batch."""
+    with pq.ParquetWriter(sink, arrow_schema(statement), compression="zstd") as writer:
+        for batch in iter_record_batches(session_factory, statement, batch_size):
+            writer.write_batch(batch)
+
+def stream_parquet(session_factory: Callable[[], Session], statement: Select, batch_size: int = 10000, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """
+    Parquet needs its footer written last, so the file is built in a spooled
+    temporary file (memory first, disk when large) and then streamed out.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=64 << 20) as spool:
+        write_parquet(session_factory, statement, spool, batch_size)
+        spool.seek(0)
+        while chunk := spool.read(chunk_size):
+            yield chunk
+
+def export_stream(format: str, session_factory: Callable[[], Session], statement: Select, batch_size: int = 1000) -> Iterator[bytes]:
+    if format == "csv":
+        return stream_csv(session_factory, statement, batch_size)
+    if format == "arrow":
+        return stream_arrow_ipc(session_factory, statement, batch_size)
+    if format == "parquet":
+        return stream_parquet(session_factory, statement, batch_size)
+    return stream_ndjson(session_factory, statement, batch_size)
@@ -0,0 +1,54 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag from the values that determine a representation: row ids and
+    versions (updated_at, falling back to created_at), counts, query params.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def query_fingerprint(request: Request) -> tuple:
+    """Query parameters in a canonical order, so ?a=1&b=2 and ?b=2&a=1 share an ETag."""
+    return tuple(sorted(request.query_params.multi_items()))
+
+# Content codings whose representations get their own ETag, see encoded_etag
+ETAG_ENCODINGS = ("gzip", "br")
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding`-compressed representation: "abc" becomes "abc-gzip"."""
+    return f'{etag[:-1]}-{encoding}"'
+
+def _identity_etag(etag: str) -> str:
+    for encoding in ETAG_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison, so W/ prefixes are ignored, and the
+    ETags of compressed representations match the identity one.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {_identity_etag(tag.strip().removeprefix("W/")) for tag in header.split(",")}
+    return etag in candidates
+
+def cache_headers(etag: str, cache_control: Optional[str] = None) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control or settings.HTTP_CACHE_CONTROL,
+    }
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
@@ -0,0 +1,43 @@
+import importlib
+import types
+from typing import Any
+
+# Scientific stack used by simulation, optimization and billing. None of these
+# may be imported on the `app.main` import path (see tests/test_startup.py);
+# modules that need them bind them through `lazy_import` instead.
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "scipy",
+    "pulp",
+    "shapely",
+    "pyproj",
+    "geoalchemy2",  # pulls in shapely and numpy at import
+    "pyarrow",
+    "matplotlib",
+)
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder that imports the real module on first attribute access, so
+    `np = lazy_import("numpy")` at module level costs nothing until used.
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def channel_for(configuration_id: int) -> str:
+    return f"live:configuration:{configuration_id}"
+
+def make_event(configuration_id: int, type: str, data: Any) -> bytes:
+    return orjson.dumps({
+        "type": type,
+        "configuration_id": configuration_id,
+        "timestamp": datetime.now(timezone.utc),
+        "data": data,
+    })
+
+class Subscription:
+    """
+    Events waiting to be sent to one client. Bounded: when a client falls
+    behind, the oldest events are dropped rather than buffering without limit.
+    """
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, message: bytes) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[bytes]:
+        """Next event, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class Broadcaster:
+    """
+    Fans events out to every client of this process from a single upstream
+    subscription per channel, however many clients watch the same
+    configuration.
+
+    With a Redis URL, events published by any process (API workers, Celery
+    tasks) go through Redis pub/sub. Without one, only events published in
+    this process are delivered, which is enough for a single dev server.
+    """
+    def __init__(self, url: Optional[str] = None, queue_size: int = 256):
+        self.url = url
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._publisher = None
+        self._publisher_lock = threading.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        subscription = Subscription(self.queue_size)
+        async with self._lock:
+            subscribers = self._subscribers.setdefault(channel, set())
+            if not subscribers and self.url:
+                await self._upstream_subscribe(channel)
+            subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            async with self._lock:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+                    if self.url:
+                        await self._pubsub.unsubscribe(channel)
+
+    async def _upstream_subscribe(self, channel: str) -> None:
+        if self._pubsub is None:
+            import redis.asyncio as aioredis
+
+            self._pubsub = aioredis.Redis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(channel)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_upstream())
+
+    async def _read_upstream(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live events subscription failed, retrying")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                if not self._subscribers:
+                    # Yield to the loop while nothing is subscribed
+                    await asyncio.sleep(1.0)
+                continue
+            self._dispatch(message["channel"].decode(), message["data"])
+
+    def _dispatch(self, channel: str, message: bytes) -> None:
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription.put(message)
+
+    def publish(self, channel: str, message: bytes) -> None:
+        """Thread-safe and synchronous, so handlers, CRUD code and tasks can all call it."""
+        if self.url:
+            with self._publisher_lock:
+                if self._publisher is None:
+                    import redis
+
+                    self._publisher = redis.Redis.from_url(self.url)
+            self._publisher.publish(channel, message)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._dispatch, channel, message)
+
+broadcaster = Broadcaster(settings.LIVE_EVENTS_REDIS_URL, settings.LIVE_EVENTS_QUEUE_SIZE)
+
+def publish_event(configuration_id: int, type: str, data: Any) -> None:
+    """Publish an event to a configuration's live channel; failures are logged, never raised."""
+    try:
+        broadcaster.publish(channel_for(configuration_id), make_event(configuration_id, type, data))
+    except Exception:
+        logger.exception("Could not publish %s event for configuration %s", type, configuration_id)
+
+def publish_progress(configuration_id: int, *, task: str, completed: int, total: int, **extra: Any) -> None:
+    """Progress of a long-running job (simulation, optimization, billing) on a configuration."""
+    publish_event(configuration_id, "progress", {"task": task, "completed": completed, "total": total, **extra})
+
+def publish_readings(readings: List[Dict[str, Any]]) -> None:
+    """
+    Announce newly stored readings on their configurations' channels. Large
+    batches (bulk imports, simulation output) are summarized rather than sent.
+    """
+    by_configuration: Dict[int, List[Dict[str, Any]]] = {}
+    for reading in readings:
+        by_configuration.setdefault(reading["configuration_id"], []).append(reading)
+    for configuration_id, batch in by_configuration.items():
+        if len(batch) <= settings.LIVE_EVENTS_MAX_READINGS:
+            publish_event(configuration_id, "readings", batch)
+        else:
+            timestamps = [reading["timestamp"] for reading in batch]
+            publish_event(configuration_id, "readings_summary", {
+                "count": len(batch),
+                "start": min(timestamps),
+                "end": max(timestamps),
+            })
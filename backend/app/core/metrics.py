@@ -0,0 +1,170 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Latency of individual SQL statements",
+    buckets=LATENCY_BUCKETS,
+)
+CELERY_TASK_LATENCY = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+CELERY_TASK_QUEUE_TIME = Histogram(
+    "celery_task_queue_seconds",
+    "Time a Celery task waited in the broker before starting",
+    ["task"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+CELERY_TASKS_FAILED = Counter(
+    "celery_task_failures_total",
+    "Celery tasks that raised",
+    ["task"],
+)
+
+class RequestDBStats:
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+# Set by the middleware for the lifetime of a request. Sync endpoints run in a
+# threadpool that copies the context, so they share the same stats object.
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+def instrument_engine(engine: Engine) -> None:
+    """Record per-statement latency and per-request query count/time on `engine`."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_LATENCY.observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.duration += elapsed
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and DB usage per route."""
+    def __init__(self, app, *, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestDBStats()
+        token = _request_db_stats.set(stats)
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            _request_db_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(method, route).observe(stats.duration)
+
+def instrument_celery() -> None:
+    """Record Celery task run time and broker wait time via task signals."""
+    from celery import signals
+
+    started = {}
+
+    @signals.before_task_publish.connect(weak=False)
+    def _stamp_publish_time(headers=None, **kwargs):
+        if headers is not None:
+            headers.setdefault("published_at", time.time())
+
+    @signals.task_prerun.connect(weak=False)
+    def _task_started(task_id=None, task=None, **kwargs):
+        started[task_id] = time.perf_counter()
+        published_at = task.request.get("published_at") if task is not None else None
+        if published_at:
+            CELERY_TASK_QUEUE_TIME.labels(task.name).observe(max(0.0, time.time() - published_at))
+
+    @signals.task_postrun.connect(weak=False)
+    def _task_finished(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None and task is not None:
+            CELERY_TASK_LATENCY.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+    @signals.task_failure.connect(weak=False)
+    def _task_failed(sender=None, **kwargs):
+        if sender is not None:
+            CELERY_TASKS_FAILED.labels(sender.name).inc()
+
+def metrics_registry():
+    """
+    Registry to export. When PROMETHEUS_MULTIPROC_DIR is set (several uvicorn
+    workers, prefork Celery), samples are aggregated across processes.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def render_latest() -> tuple:
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
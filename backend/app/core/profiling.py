@@ -0,0 +1,123 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists: (%(id_1_1)s, %(id_1_2)s, ...) or (?, ?, ...)
+_IN_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))*\s*\)")
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeated executions of the same query compare equal."""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryProfile:
+    """SQL statements executed while the profile was active, with their timings."""
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statements.append((statement_shape(statement), duration))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_time(self) -> float:
+        return sum(duration for _, duration in self.statements)
+
+    def repeated(self, threshold: int = 2) -> Dict[str, int]:
+        """Statement shapes executed at least `threshold` times: likely N+1 patterns."""
+        counts = Counter(shape for shape, _ in self.statements)
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements in {self.total_time * 1000:.1f}ms"]
+        for shape, n in sorted(self.repeated().items(), key=lambda item: -item[1]):
+            lines.append(f"  x{n}: {shape[:200]}")
+        return "\n".join(lines)
+
+@contextmanager
+def profile_queries(engine: Engine) -> Iterator[QueryProfile]:
+    """
+    Record every statement executed on `engine` inside the block, from any
+    thread. Meant for tests and scripts; use ProfilingMiddleware for requests.
+    """
+    profile = QueryProfile()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        profile.record(statement, time.perf_counter() - conn.info["profile_start"].pop())
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield profile
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
+_request_profile: ContextVar[Optional[QueryProfile]] = ContextVar("request_profile", default=None)
+
+def instrument_engine(engine: Engine) -> None:
+    """Feed statements executed on `engine` into the current request's profile, if any."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _request_profile.get() is not None:
+            conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _request_profile.get()
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - conn.info["profile_start"].pop())
+
+class ProfilingMiddleware:
+    """
+    Development-only ASGI middleware: profiles the SQL issued by each request,
+    reports it in X-DB-Query-Count / X-DB-Query-Time headers and logs a
+    warning when the same statement shape repeats `n_plus_one_threshold` times.
+    """
+    def __init__(self, app, *, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _request_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(profile.count).encode()))
+                headers.append((b"x-db-query-time", f"{profile.total_time * 1000:.1f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_profile.reset(token)
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            suspects = profile.repeated(self.n_plus_one_threshold)
+            if suspects:
+                logger.warning(
+                    "Possible N+1 on %s %s: %s", scope["method"], route, profile.report()
+                )
+            else:
+                logger.debug("%s %s: %s", scope["method"], route, profile.report())
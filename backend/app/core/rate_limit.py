@@ -0,0 +1,134 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+
+class InMemoryTokenBucketBackend:
+    """
+    Process-local token buckets, keyed by an arbitrary string.
+
+    Good enough for a single API process; use the Redis backend when several
+    workers or pods must share the same limits. At most `max_keys` buckets
+    are kept, least recently used first out, so a flood of distinct keys
+    costs O(1) per request and bounded memory. An evicted bucket starts
+    full again, which for the least recently used key it almost always was.
+    """
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, *, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated) * refill_rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        if allowed:
+            return True, 0.0
+        return False, (1 - tokens) / refill_rate
+
+class RedisTokenBucketBackend:
+    """
+    Token buckets stored in Redis so every API worker shares the same limits.
+    The refill/consume step runs as a single Lua script to stay atomic.
+    """
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, *, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        allowed, tokens = self._script(
+            keys=[self.prefix + key], args=[capacity, refill_rate, time.time()]
+        )
+        if int(allowed):
+            return True, 0.0
+        return False, (1 - float(tokens)) / refill_rate
+
+class RateLimiter:
+    """
+    Token-bucket limiter: `capacity` requests per `period` seconds per key,
+    refilled continuously.
+    """
+    def __init__(self, backend, *, capacity: int, period: float):
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+
+    def hit(self, key: str) -> Tuple[bool, int]:
+        """
+        Consume one token for `key`. Returns whether the call is allowed and,
+        if not, the number of seconds after which it should be retried.
+        """
+        allowed, retry_after = self.backend.consume(
+            key, capacity=self.capacity, refill_rate=self.refill_rate
+        )
+        if allowed:
+            return True, 0
+        return False, max(1, math.ceil(retry_after))
+
+def get_backend():
+    if settings.RATE_LIMIT_REDIS_URL:
+        return RedisTokenBucketBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryTokenBucketBackend()
+
+_backend = get_backend()
+
+login_ip_limiter = RateLimiter(
+    _backend,
+    capacity=settings.LOGIN_RATE_LIMIT_PER_IP,
+    period=settings.LOGIN_RATE_LIMIT_PERIOD_SECONDS,
+)
+login_account_limiter = RateLimiter(
+    _backend,
+    capacity=settings.LOGIN_RATE_LIMIT_PER_ACCOUNT,
+    period=settings.LOGIN_RATE_LIMIT_PERIOD_SECONDS,
+)
+
+# Bounds how many bcrypt verifications run at once across the process so a
+# login storm cannot starve the rest of the API of CPU.
+_verification_slots = threading.BoundedSemaphore(settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS)
+
+@contextmanager
+def password_verification_slot(timeout: Optional[float] = None) -> Iterator[bool]:
+    """
+    Try to reserve a password verification slot. Yields False when none frees
+    up within `timeout` seconds, in which case no hashing should be done.
+    """
+    if timeout is None:
+        timeout = settings.LOGIN_VERIFICATION_WAIT_SECONDS
+    acquired = _verification_slots.acquire(timeout=timeout) if timeout > 0 else _verification_slots.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            _verification_slots.release()
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+
+from app.core.config import settings
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified, query_fingerprint
+
+class InMemoryCacheBackend:
+    """
+    Process-local TTL + LRU store, for a single API process (development,
+    one uvicorn worker). Each process keeps its own copy and invalidations
+    only reach the process that made the change, so with several workers
+    use the Redis backend.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+class RedisCacheBackend:
+    """
+    Entries and generation counters shared by every API worker through Redis.
+    Entries expire on their own via TTL; counters are persistent.
+    """
+    def __init__(self, url: str, prefix: str = "respcache:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    def counter(self, key: str) -> int:
+        return int(self._client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(self.prefix + key)
+
+class ResponseCache:
+    """
+    Cache of serialized read responses, grouped in namespaces.
+
+    Every namespace declares the tables its responses are built from. Writing
+    to one of those tables bumps the namespace's generation counter, which is
+    part of every key, so all its entries become unreachable at once without
+    scanning the store; stale entries then age out through TTL/LRU.
+    """
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._dependents: Dict[str, Set[str]] = {}
+
+    def depends_on(self, namespace: str, tables: Iterable[str]) -> None:
+        for table in tables:
+            self._dependents.setdefault(table, set()).add(namespace)
+
+    def generation(self, namespace: str) -> int:
+        return self.backend.counter(f"gen:{namespace}")
+
+    def _key(self, namespace: str, key: str, generation: Optional[int]) -> str:
+        if generation is None:
+            generation = self.generation(namespace)
+        return f"{namespace}:{generation}:{key}"
+
+    def get(self, namespace: str, key: str, generation: Optional[int] = None) -> Optional[Tuple[str, bytes]]:
+        """Cached (etag, body) for `key`, or None; `generation` defaults to the current one."""
+        value = self.backend.get(self._key(namespace, key, generation))
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, namespace: str, key: str, etag: str, body: bytes, generation: Optional[int] = None) -> None:
+        """
+        Store a response. Pass the generation read before the data was, so
+        a write committed in between leaves the entry unreachable instead
+        of filing stale data under the new generation.
+        """
+        self.backend.set(self._key(namespace, key, generation), etag.encode() + b"\n" + body, self.ttl)
+
+    def invalidate(self, table: str) -> None:
+        """Drop every cached response built from `table`."""
+        for namespace in self._dependents.get(table, ()):
+            self.backend.incr(f"gen:{namespace}")
+
+class NullResponseCache:
+    """Stand-in used when caching is disabled."""
+    def depends_on(self, namespace: str, tables: Iterable[str]) -> None:
+        pass
+
+    def generation(self, namespace: str) -> int:
+        return 0
+
+    def get(self, namespace: str, key: str, generation: Optional[int] = None) -> None:
+        return None
+
+    def set(self, namespace: str, key: str, etag: str, body: bytes, generation: Optional[int] = None) -> None:
+        pass
+
+    def invalidate(self, table: str) -> None:
+        pass
+
+def _backend_name() -> str:
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "auto":
+        # uvicorn and gunicorn read their worker count from WEB_CONCURRENCY
+        backend = "redis" if int(os.environ.get("WEB_CONCURRENCY") or 1) > 1 else "memory"
+    return backend
+
+def get_response_cache():
+    backend = _backend_name()
+    if backend == "redis":
+        backend = RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL or settings.CELERY_BROKER_URL)
+    elif backend == "memory":
+        backend = InMemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    else:
+        return NullResponseCache()
+    return ResponseCache(backend, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+response_cache = get_response_cache()
+
+class CacheKey(NamedTuple):
+    namespace: str
+    key: str
+    generation: int
+
+def request_cache_key(request: Request, namespace: str, tenant_id: Optional[str] = None, *parts) -> CacheKey:
+    """
+    Key from the tenant, path parameters and the query string in canonical
+    order, so ?a=1&b=2 and ?b=2&a=1 share an entry, with the namespace's
+    current generation. Take it before querying: the response is stored
+    under that generation.
+    """
+    key = make_etag(tenant_id, request.url.path, query_fingerprint(request), *parts).strip('"')
+    return CacheKey(namespace, key, response_cache.generation(namespace))
+
+def cached_response(request: Request, cache_key: CacheKey) -> Optional[Response]:
+    """Serve a hit, as a 304 when the client already has that representation."""
+    hit = response_cache.get(*cache_key)
+    if hit is None:
+        return None
+    etag, body = hit
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(body, media_type="application/json", headers=cache_headers(etag))
+
+def cache_response(cache_key: CacheKey, response: ORJSONResponse) -> ORJSONResponse:
+    namespace, key, generation = cache_key
+    response_cache.set(namespace, key, response.headers["etag"], response.body, generation)
+    return response
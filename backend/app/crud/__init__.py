@@ -3,5 +3,8 @@ from .member import member
 from .configuration import configuration
 from .crud_participation_request import participation_request
 from .app_user import app_user
+from .energy_reading import energy_reading
+from .substation import substation
+from .billing import tariff_rate, billing_statement, billing_run
 
-__all__ = ["user", "configuration", "member", "participation_request", "app_user"] 
\ No newline at end of file
+__all__ = ["user", "configuration", "member", "participation_request", "app_user", "energy_reading", "substation", "tariff_rate", "billing_statement", "billing_run"] 
\ No newline at end of file
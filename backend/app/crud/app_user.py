@@ -77,6 +77,7 @@ class CRUDAppUser(CRUDBase[AppUser, AppUserCreate, AppUserUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def update(
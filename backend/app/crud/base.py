@@ -4,6 +4,7 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.core.response_cache import response_cache
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -21,6 +22,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    def invalidate_cache(self) -> None:
+        """Drop cached responses built from this model's table; call after commit."""
+        response_cache.invalidate(self.model.__tablename__)
+
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
@@ -35,6 +40,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def update(
@@ -55,10 +61,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
+        self.invalidate_cache()
         return obj 
\ No newline at end of file
@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.billing import BillingRun, BillingStatement, TariffRate
+from app.schemas.billing import (
+    BillingRunCreate, BillingStatementCreate, BillingStatementUpdate, TariffRateCreate, TariffRateUpdate
+)
+
+# Columns a billing run recomputes; status and created_at are left alone
+STATEMENT_AMOUNT_COLUMNS = (
+    "configuration_id",
+    "energy_shared",
+    "base_rate",
+    "regional_bonus",
+    "capacity_bonus",
+    "social_bonus",
+    "total_incentive",
+    "grid_fees",
+    "community_fund",
+    "taxes",
+    "fees",
+    "net_payment",
+    "details",
+)
+
+# Numeric amounts of a statement, compared to tell whether a run changes it
+STATEMENT_AMOUNTS = STATEMENT_AMOUNT_COLUMNS[1:-1]
+
+class CRUDTariffRate(CRUDBase[TariffRate, TariffRateCreate, TariffRateUpdate]):
+    def get_all(self, db: Session) -> List[TariffRate]:
+        return db.query(self.model).order_by(self.model.region, self.model.valid_from).all()
+
+class CRUDBillingStatement(CRUDBase[BillingStatement, BillingStatementCreate, BillingStatementUpdate]):
+    def bulk_upsert(self, db: Session, *, statements: List[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Insert statements in one executemany, replacing the amounts of an
+        existing (member, period) statement while it is still pending.
+        Statements already approved or paid are never rewritten, so a run can
+        be repeated safely.
+        """
+        if not statements:
+            return 0
+        dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+        query = dialect.insert(self.model)
+        query = query.on_conflict_do_update(
+            index_elements=["member_id", "period"],
+            set_={name: query.excluded[name] for name in STATEMENT_AMOUNT_COLUMNS},
+            where=self.model.status == "pending",
+        )
+        db.execute(query, statements)
+        if commit:
+            db.commit()
+            self.invalidate_cache()
+        return len(statements)
+
+    def get_amounts(self, db: Session, *, period: str, configuration_ids: Optional[List[int]] = None) -> List[Any]:
+        """(member_id, status, configuration_id, *STATEMENT_AMOUNTS) of a period's statements."""
+        query = select(
+            self.model.member_id,
+            self.model.status,
+            self.model.configuration_id,
+            *(getattr(self.model, name) for name in STATEMENT_AMOUNTS),
+        ).where(self.model.period == period)
+        if configuration_ids is not None:
+            query = query.where(self.model.configuration_id.in_(configuration_ids))
+        return db.execute(query).all()
+
+    def delete_pending(self, db: Session, *, period: str, member_ids: List[int], commit: bool = True) -> int:
+        """Delete the period's pending statements of the given members."""
+        if not member_ids:
+            return 0
+        deleted = (
+            db.query(self.model)
+            .filter(self.model.period == period, self.model.status == "pending", self.model.member_id.in_(member_ids))
+            .delete(synchronize_session=False)
+        )
+        if commit:
+            db.commit()
+            self.invalidate_cache()
+        return deleted
+
+    def get_totals(self, db: Session, *, period: str, configuration_ids: Optional[List[int]] = None) -> Dict[str, float]:
+        """Statement count and summed amounts of a period, as stored."""
+        query = select(
+            func.count(self.model.id),
+            func.coalesce(func.sum(self.model.energy_shared), 0.0),
+            func.coalesce(func.sum(self.model.total_incentive), 0.0),
+            func.coalesce(func.sum(self.model.net_payment), 0.0),
+        ).where(self.model.period == period)
+        if configuration_ids is not None:
+            query = query.where(self.model.configuration_id.in_(configuration_ids))
+        statements, energy, incentive, net = db.execute(query).one()
+        return {
+            "statements": int(statements),
+            "energy_kwh": float(energy),
+            "total_incentive": float(incentive),
+            "total_net_payment": float(net),
+        }
+
+class CRUDBillingRun(CRUDBase[BillingRun, BillingRunCreate, BillingRunCreate]):
+    def get_unfinished(self, db: Session, *, period: str, scope: str) -> Optional[BillingRun]:
+        """Latest run of the period and scope that did not complete, to resume it."""
+        return (
+            db.query(self.model)
+            .filter(self.model.period == period, self.model.scope == scope, self.model.status != "completed")
+            .order_by(self.model.id.desc())
+            .first()
+        )
+
+    def start(self, db: Session, *, period: str, scope: str, started_at: datetime) -> BillingRun:
+        run = self.model(period=period, scope=scope, status="running", started_at=started_at)
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+
+tariff_rate = CRUDTariffRate(TariffRate)
+billing_statement = CRUDBillingStatement(BillingStatement)
+billing_run = CRUDBillingRun(BillingRun)
@@ -15,6 +15,7 @@ class CRUDConfiguration(CRUDBase[Configuration, ConfigurationCreate, Configurati
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def update(
@@ -33,6 +34,7 @@ class CRUDConfiguration(CRUDBase[Configuration, ConfigurationCreate, Configurati
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def get_multi(
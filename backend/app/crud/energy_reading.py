@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.live import publish_readings
+from app.crud.base import CRUDBase
+from app.models.energy_reading import EnergyReading
+from app.schemas.energy_reading import EnergyReadingCreate, EnergyReadingUpdate
+
+# Columns that can be requested from the time-series export; timestamp and
+# member_id are always included so rows stay identifiable.
+TIMESERIES_KEY_COLUMNS = ("timestamp", "member_id")
+TIMESERIES_VALUE_COLUMNS = (
+    "interval_minutes",
+    "source",
+    "produced_kwh",
+    "consumed_kwh",
+    "shared_kwh",
+    "grid_import_kwh",
+    "grid_export_kwh",
+    "battery_charge_kwh",
+)
+
+class CRUDEnergyReading(CRUDBase[EnergyReading, EnergyReadingCreate, EnergyReadingUpdate]):
+    def timeseries_query(
+        self,
+        *,
+        configuration_id: int,
+        member_id: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: Optional[str] = None,
+    ) -> Select:
+        """
+        SELECT for a configuration's (or one member's) time series with the
+        projection and the [start, end) range pushed down into SQL, ordered to
+        follow the (configuration_id, member_id, timestamp) index.
+        """
+        value_columns = list(columns) if columns else list(TIMESERIES_VALUE_COLUMNS)
+        unknown = set(value_columns) - set(TIMESERIES_VALUE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown time series columns: {', '.join(sorted(unknown))}")
+
+        selected = [getattr(self.model, name) for name in TIMESERIES_KEY_COLUMNS + tuple(value_columns)]
+        query = select(*selected).where(self.model.configuration_id == configuration_id)
+        if member_id is not None:
+            query = query.where(self.model.member_id == member_id)
+        if start is not None:
+            query = query.where(self.model.timestamp >= start)
+        if end is not None:
+            query = query.where(self.model.timestamp < end)
+        if source:
+            query = query.where(self.model.source == source)
+        return query.order_by(self.model.member_id, self.model.timestamp)
+
+    def shared_by_member(
+        self,
+        db: Session,
+        *,
+        start: datetime,
+        end: datetime,
+        configuration_ids: Optional[Sequence[int]] = None,
+    ) -> List[Any]:
+        """(member_id, shared kWh) over [start, end) for every member with readings, in one GROUP BY."""
+        query = (
+            select(self.model.member_id, func.sum(self.model.shared_kwh))
+            .where(self.model.member_id.is_not(None))
+            .where(self.model.timestamp >= start, self.model.timestamp < end)
+            .group_by(self.model.member_id)
+        )
+        if configuration_ids is not None:
+            query = query.where(self.model.configuration_id.in_(configuration_ids))
+        return db.execute(query).all()
+
+    def bulk_create(self, db: Session, *, readings: List[Dict[str, Any]]) -> int:
+        """Insert many readings in one executemany round-trip."""
+        if not readings:
+            return 0
+        db.execute(insert(self.model), readings)
+        db.commit()
+        self.invalidate_cache()
+        publish_readings(readings)
+        return len(readings)
+
+energy_reading = CRUDEnergyReading(EnergyReading)
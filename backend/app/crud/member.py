@@ -1,8 +1,10 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.db.types import make_point
 from app.models.member import Member
 from app.schemas.member import MemberCreate, MemberUpdate
 
@@ -17,6 +19,8 @@ class CRUDMember(CRUDBase[Member, MemberCreate, MemberUpdate]):
         db_obj = Member(
             name=obj_in.name,
             address=obj_in.address,
+            latitude=obj_in.latitude,
+            longitude=obj_in.longitude,
             type=obj_in.type,
             pod_id=obj_in.pod_id,
             smart_meter_id=obj_in.smart_meter_id,
@@ -39,6 +43,7 @@ class CRUDMember(CRUDBase[Member, MemberCreate, MemberUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache()
         return db_obj
 
     def update(
@@ -53,6 +58,29 @@ class CRUDMember(CRUDBase[Member, MemberCreate, MemberUpdate]):
     def get_by_configuration(self, db: Session, *, configuration_id: int) -> list[Member]:
         return db.query(Member).filter(Member.configuration_id == configuration_id).all()
 
+    def get_within(
+        self,
+        db: Session,
+        *,
+        lng: float,
+        lat: float,
+        radius_km: float,
+        configuration_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Tuple[Member, float]]:
+        """
+        Members within `radius_km` of a point, nearest first, with their
+        distance in km. ST_DWithin is answered from the GiST index on geog.
+        """
+        point = make_point(lng, lat)
+        distance = func.ST_Distance(Member.geog, point)
+        query = db.query(Member, (distance / 1000.0).label("distance_km")).filter(
+            func.ST_DWithin(Member.geog, point, radius_km * 1000.0)
+        )
+        if configuration_id is not None:
+            query = query.filter(Member.configuration_id == configuration_id)
+        return query.order_by(distance).limit(limit).all()
+
     def get_by_user(self, db: Session, *, user_id: int) -> list[Member]:
         return db.query(Member).filter(Member.user_id == user_id).all()
 
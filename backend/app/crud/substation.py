@@ -0,0 +1,154 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.response_cache import InMemoryCacheBackend
+from app.crud.base import CRUDBase
+from app.db.types import WGS84
+from app.models.substation import Substation
+from app.schemas.substation import SubstationCreate, SubstationUpdate
+
+# One point-in-polygon probe per input coordinate, all in one round-trip;
+# ST_Covers on the GiST-indexed area keeps each probe an index lookup.
+RESOLVE_SQL = text("""
+    SELECT p.n, s.code
+    FROM unnest(CAST(:lngs AS float8[]), CAST(:lats AS float8[])) WITH ORDINALITY AS p(lng, lat, n)
+    LEFT JOIN LATERAL (
+        SELECT code
+        FROM primary_substations
+        WHERE ST_Covers(area, ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326))
+        ORDER BY code
+        LIMIT 1
+    ) s ON true
+""")
+
+def _area_from_geojson(geometry, srid: int = WGS84):
+    area = func.ST_SetSRID(func.ST_GeomFromGeoJSON(geometry), srid)
+    if srid != WGS84:
+        area = func.ST_Transform(area, WGS84)
+    return func.ST_Multi(area)
+
+class CRUDSubstation(CRUDBase[Substation, SubstationCreate, SubstationUpdate]):
+    def __init__(self, model, *, cache_max_entries: int, cache_ttl: float):
+        super().__init__(model)
+        self.cache_ttl = cache_ttl
+        self._coordinates = InMemoryCacheBackend(cache_max_entries)
+
+    def version(self, db: Session) -> str:
+        """
+        Version of the substation areas, read from the table itself, so
+        writes from any process (scripts/load_substations.py included) are
+        seen: the row count changes on inserts and deletes, the latest
+        timestamp on updates and upserts.
+        """
+        count, latest = db.execute(
+            select(func.count(Substation.id), func.max(func.coalesce(Substation.updated_at, Substation.created_at)))
+        ).one()
+        return f"{count}:{latest.isoformat() if latest else ''}"
+
+    def get_by_code(self, db: Session, *, code: str) -> Optional[Substation]:
+        return db.query(Substation).filter(Substation.code == code).first()
+
+    def create(self, db: Session, *, obj_in: SubstationCreate) -> Substation:
+        obj_in_data = obj_in.dict(exclude={"geometry"})
+        db_obj = Substation(**obj_in_data, area=_area_from_geojson(json.dumps(obj_in.geometry)))
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        self.invalidate_cache()
+        return db_obj
+
+    def update(
+        self, db: Session, *, db_obj: Substation, obj_in: Union[SubstationUpdate, Dict[str, Any]]
+    ) -> Substation:
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        geometry = update_data.pop("geometry", None)
+        if geometry is not None:
+            db_obj.area = _area_from_geojson(json.dumps(geometry))
+        return super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    def upsert_many(self, db: Session, *, substations: Iterable[Dict[str, Any]], srid: int = WGS84) -> int:
+        """
+        Insert or replace substations by code in one executemany. Each item
+        has code, name, region, distributor and a GeoJSON `geometry` in
+        `srid`; areas are stored in WGS 84.
+        """
+        rows = [
+            {
+                "code": str(item["code"]),
+                "name": item.get("name"),
+                "region": item.get("region"),
+                "distributor": item.get("distributor"),
+                "geometry": json.dumps(item["geometry"]),
+            }
+            for item in substations
+        ]
+        if not rows:
+            return 0
+        statement = insert(Substation).values(
+            code=bindparam("code"),
+            name=bindparam("name"),
+            region=bindparam("region"),
+            distributor=bindparam("distributor"),
+            area=_area_from_geojson(bindparam("geometry"), srid),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Substation.code],
+            set_={
+                "name": statement.excluded.name,
+                "region": statement.excluded.region,
+                "distributor": statement.excluded.distributor,
+                "area": statement.excluded.area,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(statement, rows)
+        db.commit()
+        self.invalidate_cache()
+        return len(rows)
+
+    def resolve(self, db: Session, *, points: Sequence[Tuple[float, float]]) -> Tuple[List[Optional[str]], int]:
+        """
+        Substation code covering each (lng, lat) point, or None, plus the
+        number of points answered from the per-coordinate cache. Coordinates
+        are rounded to 6 decimals (about 0.1 m) for caching, and keyed on
+        the table's version so any write orphans every cached coordinate.
+        """
+        version = self.version(db)
+        keys = [f"{version}:{lng:.6f},{lat:.6f}" for lng, lat in points]
+        codes: List[Optional[str]] = [None] * len(points)
+        misses: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            cached = self._coordinates.get(key)
+            if cached is None:
+                misses.setdefault(key, []).append(i)
+            else:
+                codes[i] = cached or None
+        hits = len(points) - sum(len(indexes) for indexes in misses.values())
+
+        if misses:
+            probes = [indexes[0] for indexes in misses.values()]
+            rows = db.execute(RESOLVE_SQL, {
+                "lngs": [points[i][0] for i in probes],
+                "lats": [points[i][1] for i in probes],
+            })
+            for n, code in rows:
+                key = keys[probes[n - 1]]
+                for i in misses[key]:
+                    codes[i] = code
+                # Misses are cached too: most bulk onboarding lists repeat addresses
+                self._coordinates.set(key, code or "", self.cache_ttl)
+        return codes, hits
+
+substation = CRUDSubstation(
+    Substation,
+    cache_max_entries=settings.SUBSTATION_CACHE_MAX_ENTRIES,
+    cache_ttl=settings.SUBSTATION_CACHE_TTL_SECONDS,
+)
@@ -3,6 +3,9 @@ from app.db.base_class import Base  # noqa
 from app.models.configuration import Configuration  # noqa
 from app.models.member import Member  # noqa
 from app.models.user import User  # noqa
+from app.models.energy_reading import EnergyReading  # noqa
+from app.models.substation import Substation  # noqa
+from app.models.billing import TariffRate, BillingStatement, BillingRun  # noqa
 
 # Import all models here that are needed by SQLAlchemy
 # This avoids circular dependencies while still making sure all models are registered 
\ No newline at end of file
@@ -1,7 +1,13 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core import profiling
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), pool_pre_ping=True)
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+if settings.SQL_PROFILING:
+    profiling.instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
@@ -0,0 +1,80 @@
+import re
+import struct
+from typing import Optional, Tuple
+
+from sqlalchemy import cast, func
+from sqlalchemy.types import UserDefinedType
+
+# WGS 84, the SRID of GPS coordinates and of PostGIS geography
+WGS84 = 4326
+
+_WKT_POINT = re.compile(r"^(?:SRID=\d+;)?POINT\s*\(\s*(\S+)\s+(\S+)\s*\)$", re.IGNORECASE)
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """(lng, lat) from a PostGIS point as hex EWKB (the wire format) or (E)WKT."""
+    match = _WKT_POINT.match(value)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    data = bytes.fromhex(value)
+    order = "<" if data[0] == 1 else ">"
+    (geometry_type,) = struct.unpack(order + "I", data[1:5])
+    offset = 9 if geometry_type & 0x20000000 else 5  # Skip the SRID when present
+    return struct.unpack(order + "dd", data[offset:offset + 16])
+
+class Geography(UserDefinedType):
+    """
+    PostGIS `geography` column. Declared without geoalchemy2, which pulls
+    shapely and numpy into every import of the models (see app/core/lazy.py).
+
+    Values are written as (lng, lat) tuples and read back the same way.
+    Distances on geography are in metres on the spheroid.
+    """
+    cache_ok = True
+
+    def __init__(self, geometry_type: str = "POINT", srid: int = WGS84):
+        self.geometry_type = geometry_type
+        self.srid = srid
+
+    def get_col_spec(self, **kw) -> str:
+        return f"geography({self.geometry_type},{self.srid})"
+
+    def bind_processor(self, dialect):
+        srid = self.srid
+
+        def process(value):
+            if value is None or isinstance(value, str):
+                return value
+            lng, lat = value
+            # EWKT; PostgreSQL casts the literal to geography on insert
+            return f"SRID={srid};POINT({lng} {lat})"
+        return process
+
+    def result_processor(self, dialect, coltype):
+        if self.geometry_type != "POINT":
+            return None
+
+        def process(value):
+            if value is None:
+                return None
+            return parse_point(value)
+        return process
+
+class Geometry(Geography):
+    """
+    PostGIS `geometry` column, planar in its SRID. Used for areas, where
+    point-in-polygon tests on geometry are cheaper than on geography.
+    """
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return f"geometry({self.geometry_type},{self.srid})"
+
+def make_point(lng: float, lat: float):
+    """SQL geography point, for use in ST_DWithin / ST_Distance."""
+    return cast(func.ST_SetSRID(func.ST_MakePoint(lng, lat), WGS84), Geography())
+
+def point_from_location(location: Optional[dict]) -> Optional[Tuple[float, float]]:
+    """(lng, lat) from a {"lat": ..., "lng": ...} location dict, when complete."""
+    if not location or location.get("lat") is None or location.get("lng") is None:
+        return None
+    return float(location["lng"]), float(location["lat"])
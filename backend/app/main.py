@@ -1,18 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.api.v1.api import api_router
+from app.core.access_log import AccessLogMiddleware, configure_logging
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.db.base import Base  # Import the Base that includes all models
-from app.db.session import engine
+from app.core.metrics import MetricsMiddleware, render_latest
+from app.core.profiling import ProfilingMiddleware
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic (`alembic upgrade head`); nothing here touches
+# the database at import time, so workers start without a DB round-trip.
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -30,7 +32,7 @@ origins = [
 ]
 
 # Log available origins
-logger.info(f"Configured CORS origins: {origins}")
+logger.info("Configured CORS origins: %s", origins)
 
 app.add_middleware(
     CORSMiddleware,
@@ -41,13 +43,33 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-@app.middleware("http")
-async def log_requests(request, call_next):
-    logger.info(f"Request: {request.method} {request.url}")
-    logger.info(f"Request headers: {request.headers}")
-    response = await call_next(request)
-    logger.info(f"Response: {response.status_code}")
-    return response
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    cache_max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+)
+
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_ms=settings.ACCESS_LOG_SLOW_MS,
+)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        body, content_type = render_latest()
+        return Response(content=body, media_type=content_type)
+
+if settings.SQL_PROFILING:
+    app.add_middleware(
+        ProfilingMiddleware,
+        n_plus_one_threshold=settings.SQL_PROFILING_N_PLUS_ONE_THRESHOLD,
+    )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -3,11 +3,19 @@ from .member import Member
 from .configuration import Configuration
 from .participation_request import ParticipationRequest
 from .app_user import AppUser
+from .energy_reading import EnergyReading
+from .substation import Substation
+from .billing import TariffRate, BillingStatement, BillingRun
 
 __all__ = [
     "User",
     "Member",
     "Configuration",
     "ParticipationRequest",
-    "AppUser"
+    "AppUser",
+    "EnergyReading",
+    "Substation",
+    "TariffRate",
+    "BillingStatement",
+    "BillingRun"
 ] 
\ No newline at end of file
@@ -0,0 +1,91 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+class TariffRate(Base):
+    """
+    Incentive rates (EUR/kWh of shared energy) for a region over a validity
+    interval [valid_from, valid_to). A member earns the base rate, the
+    regional bonus, the bonus of its capacity band and, for vulnerable
+    households, the social bonus.
+    """
+    __tablename__ = "tariff_rates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    region = Column(String, nullable=False)
+    base_rate = Column(Float, nullable=False)
+    regional_bonus = Column(Float, nullable=False, default=0.0)
+    capacity_bonus_small = Column(Float, nullable=False, default=0.0)  # < 10 kW
+    capacity_bonus_medium = Column(Float, nullable=False, default=0.0)  # 10-50 kW
+    capacity_bonus_large = Column(Float, nullable=False, default=0.0)  # > 50 kW
+    social_bonus = Column(Float, nullable=False, default=0.0)
+    valid_from = Column(DateTime(timezone=True), nullable=False)
+    valid_to = Column(DateTime(timezone=True), nullable=True)  # Open-ended when null
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_tariff_rates_region_valid_from", "region", "valid_from"),
+    )
+
+class BillingStatement(Base):
+    """Incentive statement of one member for one billing period (YYYY-MM)."""
+    __tablename__ = "billing_statements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(Integer, ForeignKey("members.id", ondelete="CASCADE"), nullable=False)
+    configuration_id = Column(Integer, ForeignKey("cer_configuration.id", ondelete="CASCADE"), nullable=False)
+    period = Column(String, nullable=False)
+
+    # Shared energy in kWh, rates in EUR/kWh, amounts in EUR
+    energy_shared = Column(Float, nullable=False, default=0.0)
+    base_rate = Column(Float, nullable=False)
+    regional_bonus = Column(Float, nullable=False, default=0.0)
+    capacity_bonus = Column(Float, nullable=False, default=0.0)
+    social_bonus = Column(Float, nullable=False, default=0.0)
+    total_incentive = Column(Float, nullable=False)
+    grid_fees = Column(Float, nullable=False, default=0.0)
+    community_fund = Column(Float, nullable=False, default=0.0)
+    taxes = Column(Float, nullable=False, default=0.0)
+    fees = Column(Float, nullable=False, default=0.0)  # Configuration's monthly fee
+    net_payment = Column(Float, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, approved, paid
+    details = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("member_id", "period", name="uq_billing_statements_member_period"),
+        Index("ix_billing_statements_configuration_period", "configuration_id", "period"),
+    )
+
+class BillingRun(Base):
+    """
+    One billing pass over a period for a scope ("all" or a sorted list of
+    configuration ids). Members are processed in (configuration_id, id)
+    order and the last one committed is kept as a checkpoint, so an
+    interrupted run resumes where it stopped.
+    """
+    __tablename__ = "billing_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    period = Column(String, nullable=False)
+    scope = Column(String, nullable=False, default="all")
+    status = Column(String, nullable=False, default="running")  # running, completed, failed
+    total_members = Column(Integer, nullable=False, default=0)
+    processed_members = Column(Integer, nullable=False, default=0)
+    written_statements = Column(Integer, nullable=False, default=0)
+    last_configuration_id = Column(Integer, nullable=True)  # Checkpoint: last member committed
+    last_member_id = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_billing_runs_period_scope", "period", "scope"),
+    )
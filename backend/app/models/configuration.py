@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from app.db.base_class import Base
+from app.db.types import Geography, point_from_location
 
 class Configuration(Base):
     __tablename__ = "cer_configuration"
@@ -19,6 +20,7 @@ class Configuration(Base):
     location = Column(JSON, nullable=False)
     region = Column(String, nullable=False)
     primary_substation_id = Column(String, nullable=False)
+    geog = Column(Geography(), nullable=True)  # Derived from `location`, GiST-indexed for proximity queries
     
     # Configuration settings
     technical_info = Column(JSON, nullable=False, server_default='{}')
@@ -34,6 +36,15 @@ class Configuration(Base):
     
     # Relationships - using string reference to avoid circular imports
     members = relationship("Member", back_populates="configuration", cascade="all, delete-orphan", lazy="selectin")
+
+    __table_args__ = (
+        Index("ix_cer_configuration_geog", "geog", postgresql_using="gist"),
+    )
+
+    @validates("location")
+    def _sync_geog(self, key, location):
+        self.geog = point_from_location(location)
+        return location
     
     # Add any relationships here if needed
     # members = relationship("Member", back_populates="configuration") 
\ No newline at end of file
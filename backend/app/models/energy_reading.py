@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+class EnergyReading(Base):
+    """
+    One interval of energy data for a configuration, or one of its members
+    when member_id is set. Holds both meter readings and simulation output,
+    told apart by `source`.
+    """
+    __tablename__ = "energy_readings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    configuration_id = Column(Integer, ForeignKey("cer_configuration.id", ondelete="CASCADE"), nullable=False)
+    member_id = Column(Integer, ForeignKey("members.id", ondelete="CASCADE"), nullable=True)
+    timestamp = Column(DateTime(timezone=True), nullable=False)  # Start of the interval
+    interval_minutes = Column(Integer, nullable=False, default=60)
+    source = Column(String, nullable=False, default="meter")  # meter, simulation
+
+    # Energy values in kWh over the interval
+    produced_kwh = Column(Float)
+    consumed_kwh = Column(Float)
+    shared_kwh = Column(Float)
+    grid_import_kwh = Column(Float)
+    grid_export_kwh = Column(Float)
+    battery_charge_kwh = Column(Float)  # Battery state of charge at interval end
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_energy_readings_configuration_member_timestamp", "configuration_id", "member_id", "timestamp"),
+    )
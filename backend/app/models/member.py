@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Enum, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Enum, Float, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
 
 from app.db.base_class import Base
+from app.db.types import Geography
 
 class MemberType(str, enum.Enum):
     CONSUMER = "consumer"
@@ -31,6 +32,9 @@ class Member(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     address = Column(String, nullable=False)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geog = Column(Geography(), nullable=True)  # Derived from latitude/longitude, GiST-indexed
     type = Column(Enum(MemberType), nullable=False)
     user_type = Column(Enum(UserType), nullable=False, default=UserType.REAL)
     status = Column(Enum(MemberStatus), nullable=False, default=MemberStatus.ACTIVE)
@@ -77,4 +81,15 @@ class Member(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now()) 
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_members_geog", "geog", postgresql_using="gist"),
+    )
+
+    @validates("latitude", "longitude")
+    def _sync_geog(self, key, value):
+        latitude = value if key == "latitude" else self.latitude
+        longitude = value if key == "longitude" else self.longitude
+        self.geog = None if latitude is None or longitude is None else (longitude, latitude)
+        return value
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+from app.db.types import Geometry
+
+class Substation(Base):
+    """
+    Service area of a primary substation (cabina primaria). A CER may only
+    include members connected under the substation its configuration names
+    in `primary_substation_id`, which holds the substation `code`.
+    """
+    __tablename__ = "primary_substations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, nullable=False, unique=True, index=True)
+    name = Column(String)
+    region = Column(String)
+    distributor = Column(String)  # DSO operating the substation
+    area = Column(Geometry("MULTIPOLYGON"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_primary_substations_area", "area", postgresql_using="gist"),
+    )
@@ -1,9 +1,9 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .token import Token, TokenPayload
-from .member import Member, MemberCreate, MemberUpdate, MemberInDB, MemberList, MemberDetail, MemberResponse
+from .member import Member, MemberCreate, MemberUpdate, MemberInDB, MemberList, MemberNearby, MemberDetail, MemberResponse
 from .configuration import (
     Configuration, ConfigurationCreate, ConfigurationUpdate, ConfigurationInDB,
-    ConfigurationList, ConfigurationWithStats, ConfigurationResponse
+    ConfigurationList, ConfigurationNearby, ConfigurationWithStats, ConfigurationResponse
 )
 from .participation_request import (
     ParticipationRequestBase,
@@ -12,5 +12,15 @@ from .participation_request import (
     ParticipationRequestInDB,
     ParticipationRequestWithDetails
 )
+from .energy_reading import EnergyReadingCreate, EnergyReadingUpdate, EnergyReadingInDB
+from .substation import (
+    SubstationCreate, SubstationUpdate, SubstationInDB,
+    SubstationResolveRequest, SubstationMatch, SubstationResolveResponse
+)
+from .billing import (
+    TariffRateCreate, TariffRateUpdate, TariffRateInDB,
+    BillingStatementCreate, BillingStatementUpdate, BillingStatementInDB,
+    BillingRunCreate, BillingRunInDB
+)
 
 # All models are already imported directly, no need for re-export 
\ No newline at end of file
@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+class TariffRateBase(BaseModel):
+    region: str
+    base_rate: float
+    regional_bonus: float = 0.0
+    capacity_bonus_small: float = 0.0
+    capacity_bonus_medium: float = 0.0
+    capacity_bonus_large: float = 0.0
+    social_bonus: float = 0.0
+    valid_from: datetime
+    valid_to: Optional[datetime] = None
+
+class TariffRateCreate(TariffRateBase):
+    pass
+
+class TariffRateUpdate(TariffRateBase):
+    pass
+
+class TariffRateInDB(TariffRateBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class BillingStatementBase(BaseModel):
+    member_id: int
+    configuration_id: int
+    period: str = Field(..., description="Billing period (YYYY-MM)")
+    energy_shared: float = 0.0
+    base_rate: float
+    regional_bonus: float = 0.0
+    capacity_bonus: float = 0.0
+    social_bonus: float = 0.0
+    total_incentive: float
+    grid_fees: float = 0.0
+    community_fund: float = 0.0
+    taxes: float = 0.0
+    fees: float = 0.0
+    net_payment: float
+    status: str = "pending"  # pending, approved, paid
+    details: Optional[Dict[str, Any]] = None
+
+class BillingStatementCreate(BillingStatementBase):
+    pass
+
+class BillingStatementUpdate(BillingStatementBase):
+    pass
+
+class BillingStatementInDB(BillingStatementBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BillingRunBase(BaseModel):
+    period: str = Field(..., description="Billing period (YYYY-MM)")
+    scope: str = "all"  # "all" or comma-separated configuration ids
+
+class BillingRunCreate(BillingRunBase):
+    pass
+
+class BillingRunInDB(BillingRunBase):
+    id: int
+    status: str  # running, completed, failed
+    total_members: int
+    processed_members: int
+    written_statements: int
+    last_configuration_id: Optional[int] = None
+    last_member_id: Optional[int] = None
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -91,6 +91,9 @@ class ConfigurationList(BaseModel):
     class Config:
         from_attributes = True
 
+class ConfigurationNearby(ConfigurationList):
+    distance_km: float
+
 class ConfigurationWithStats(ConfigurationInDB):
     participant_count: int = 0
     total_energy_produced: float = 0
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+class EnergyReadingBase(BaseModel):
+    configuration_id: int
+    member_id: Optional[int] = None
+    timestamp: datetime
+    interval_minutes: int = 60
+    source: str = "meter"  # meter, simulation
+    produced_kwh: Optional[float] = None
+    consumed_kwh: Optional[float] = None
+    shared_kwh: Optional[float] = None
+    grid_import_kwh: Optional[float] = None
+    grid_export_kwh: Optional[float] = None
+    battery_charge_kwh: Optional[float] = None
+
+class EnergyReadingCreate(EnergyReadingBase):
+    pass
+
+class EnergyReadingUpdate(EnergyReadingBase):
+    pass
+
+class EnergyReadingInDB(EnergyReadingBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
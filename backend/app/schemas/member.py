@@ -6,6 +6,8 @@ from app.models.member import MemberType, LoadProfileType, UserType, MemberStatu
 class MemberBase(BaseModel):
     name: str
     address: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     type: MemberType  # consumer, producer, prosumer
     user_type: UserType = UserType.REAL
     status: MemberStatus = MemberStatus.ACTIVE
@@ -68,6 +70,14 @@ class MemberList(BaseModel):
     configuration_id: int
     user_id: Optional[int] = None
 
+class MemberNearby(MemberList):
+    latitude: float
+    longitude: float
+    distance_km: float
+
+    class Config:
+        from_attributes = True
+
 class MemberDetail(MemberInDB):
     energy_produced: float = 0
     energy_consumed: float = 0
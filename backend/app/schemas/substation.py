@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.configuration import Location
+
+class SubstationBase(BaseModel):
+    code: str
+    name: Optional[str] = None
+    region: Optional[str] = None
+    distributor: Optional[str] = None
+
+class SubstationCreate(SubstationBase):
+    geometry: Dict[str, Any] = Field(..., description="GeoJSON Polygon or MultiPolygon in WGS 84")
+
+class SubstationUpdate(SubstationBase):
+    geometry: Optional[Dict[str, Any]] = None
+
+class SubstationInDB(SubstationBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class SubstationResolveRequest(BaseModel):
+    points: List[Location]
+    configuration_id: Optional[int] = Field(
+        None, description="Also report whether each point is under this configuration's substation"
+    )
+
+class SubstationMatch(BaseModel):
+    lat: float
+    lng: float
+    substation_code: Optional[str] = None
+    eligible: Optional[bool] = None
+
+class SubstationResolveResponse(BaseModel):
+    items: List[SubstationMatch]
+    cache_hits: int
@@ -0,0 +1,403 @@
+"""
+Billing engine: incentive statements for every member of every
+configuration for a period, computed as one vectorized pass.
+
+Tariffs are few and read once into a TariffTable, an array index over
+(region, validity start) that resolves the tariff in force for any number
+of members with a single searchsorted. Shared energy comes from one GROUP BY
+over the readings, member attributes from one SELECT, and statements are
+written with batched executemany upserts.
+
+Scheduled billing goes through run_incremental_billing, which compares the
+recomputed statements with the stored ones and writes only those that
+changed, and checkpoints every batch in a BillingRun so an interrupted run
+resumes instead of starting over.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.live import publish_progress
+from app.crud.billing import STATEMENT_AMOUNTS
+from app.models.billing import BillingRun
+from app.models.configuration import Configuration
+from app.models.member import Member, MemberStatus
+from app.services.time_grid import TIMEZONE
+
+# Capacity bands by installed/contracted power: small < 10 kW <= medium <= 50 kW < large
+CAPACITY_BAND_LIMITS_KW = (10.0, 50.0)
+GRID_FEE_RATE = 0.03  # EUR per shared kWh
+COMMUNITY_FUND_SHARE = 0.20  # Of the total incentive, unless billing_settings says otherwise
+VAT_RATE = 0.22
+
+# Columns of TariffTable.rates
+RATE_COLUMNS = (
+    "base_rate",
+    "regional_bonus",
+    "capacity_bonus_small",
+    "capacity_bonus_medium",
+    "capacity_bonus_large",
+    "social_bonus",
+)
+
+# Region codes are spaced by more than any timestamp in seconds, so one
+# int64 key orders tariffs by region, then validity start.
+_REGION_STRIDE = 1 << 36
+
+def _seconds(values) -> np.ndarray:
+    index = pd.DatetimeIndex(values)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("s").asi8
+
+class TariffTable:
+    """Tariff rows indexed by (region, validity interval) for vectorized lookup."""
+    def __init__(self, tariffs: Sequence[Any]):
+        self.regions = sorted({tariff.region for tariff in tariffs})
+        self._region_codes = {region: code for code, region in enumerate(self.regions)}
+        codes = np.array([self._region_codes[tariff.region] for tariff in tariffs], dtype=np.int64)
+        starts = _seconds([tariff.valid_from for tariff in tariffs]) if tariffs else np.empty(0, np.int64)
+        ends = np.array([
+            _seconds([tariff.valid_to])[0] if tariff.valid_to is not None else np.iinfo(np.int64).max
+            for tariff in tariffs
+        ], dtype=np.int64)
+        keys = codes * _REGION_STRIDE + starts
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.codes = codes[order]
+        self.ends = ends[order]
+        self.ids = np.array([getattr(tariff, "id", None) or 0 for tariff in tariffs], dtype=np.int64)[order]
+        self.rates = np.array(
+            [[getattr(tariff, name) or 0.0 for name in RATE_COLUMNS] for tariff in tariffs], dtype=np.float64
+        ).reshape(-1, len(RATE_COLUMNS))[order]
+
+    @classmethod
+    def from_db(cls, db: Session) -> "TariffTable":
+        return cls(crud.tariff_rate.get_all(db))
+
+    def region_codes(self, regions) -> np.ndarray:
+        """Code of every region, -1 for regions without tariffs."""
+        regions = pd.Categorical(np.asarray(regions, dtype=object), categories=self.regions)
+        return np.asarray(regions.codes, dtype=np.int64)
+
+    def lookup(self, regions, at, until=None) -> np.ndarray:
+        """
+        Row of the tariff in force in each region at each time, -1 where
+        none is. With `until`, the tariff in force at any time of [at, until)
+        instead, so one starting or ending within the interval counts. The
+        latest-starting tariff wins when several qualify.
+        """
+        codes = self.region_codes(regions)
+        at = np.broadcast_to(_seconds(np.atleast_1d(at)), codes.shape)
+        if until is None:
+            rows = np.searchsorted(self.keys, codes * _REGION_STRIDE + at, side="right") - 1
+        else:
+            # Latest tariff starting before the interval ends
+            until = np.broadcast_to(_seconds(np.atleast_1d(until)), codes.shape)
+            rows = np.searchsorted(self.keys, codes * _REGION_STRIDE + until, side="left") - 1
+        safe = np.clip(rows, 0, None)
+        found = (codes >= 0) & (rows >= 0) & (self.codes[safe] == codes) & (at < self.ends[safe])
+        return np.where(found, rows, -1)
+
+def capacity_band(capacity_kw: np.ndarray) -> np.ndarray:
+    """0 (small), 1 (medium) or 2 (large); unknown capacity counts as small."""
+    small, large = CAPACITY_BAND_LIMITS_KW
+    capacity_kw = np.nan_to_num(np.asarray(capacity_kw, dtype=float))
+    return (capacity_kw >= small).astype(np.int64) + (capacity_kw > large)
+
+def compute_statements(
+    tariffs: TariffTable,
+    *,
+    energy_kwh: np.ndarray,
+    regions: np.ndarray,
+    capacity_kw: np.ndarray,
+    social: np.ndarray,
+    at,
+    until=None,
+    community_fund_share: Any = COMMUNITY_FUND_SHARE,
+    monthly_fee: Any = 0.0,
+    grid_fee_rate: float = GRID_FEE_RATE,
+    vat_rate: float = VAT_RATE,
+) -> Dict[str, np.ndarray]:
+    """
+    Statement amounts for N members as arrays of length N. Tariffs are
+    those in force at `at`, or at any time of the period [at, until) when
+    `until` is given; members without a tariff get tariff_row -1 and zero
+    rates. Per-configuration settings may be arrays aligned with the members.
+    """
+    rows = tariffs.lookup(regions, at, until)
+    has_tariff = rows >= 0
+    rates = np.where(has_tariff[:, None], tariffs.rates[np.clip(rows, 0, None)], 0.0)
+    band = capacity_band(capacity_kw)
+    capacity_bonus = rates[np.arange(len(rows)), 2 + band]
+    social_bonus = np.where(np.asarray(social, dtype=bool), rates[:, 5], 0.0)
+
+    energy_kwh = np.nan_to_num(np.asarray(energy_kwh, dtype=float))
+    rate = rates[:, 0] + rates[:, 1] + capacity_bonus + social_bonus
+    total_incentive = energy_kwh * rate
+    grid_fees = energy_kwh * grid_fee_rate
+    community_fund = total_incentive * community_fund_share
+    taxes = total_incentive * vat_rate
+    fees = np.broadcast_to(np.asarray(monthly_fee, dtype=float), energy_kwh.shape)
+    return {
+        "tariff_row": rows,
+        "energy_shared": energy_kwh,
+        "base_rate": rates[:, 0],
+        "regional_bonus": rates[:, 1],
+        "capacity_bonus": capacity_bonus,
+        "social_bonus": social_bonus,
+        "total_incentive": total_incentive,
+        "grid_fees": grid_fees,
+        "community_fund": community_fund,
+        "taxes": taxes,
+        "fees": fees,
+        "net_payment": total_incentive - grid_fees - community_fund - taxes - fees,
+    }
+
+def period_bounds(period: str):
+    """[start, end) of a YYYY-MM period in Italian local time."""
+    start = pd.Timestamp(f"{period}-01", tz=TIMEZONE)
+    return start.to_pydatetime(), (start + pd.offsets.MonthBegin(1)).to_pydatetime()
+
+def _setting(settings: Optional[Dict[str, Any]], name: str, default: float) -> float:
+    value = (settings or {}).get(name)
+    return default if value is None else float(value)
+
+def billing_inputs(db: Session, *, period: str, configuration_ids: Optional[Sequence[int]] = None) -> pd.DataFrame:
+    """
+    One row per active member, in (configuration_id, member_id) order:
+    configuration settings, capacity, social flag and shared energy over
+    the period, from two queries.
+    """
+    start, end = period_bounds(period)
+    query = (
+        select(
+            Member.id.label("member_id"),
+            Member.configuration_id,
+            Member.contracted_power,
+            Member.billing_preferences,
+            Configuration.region,
+            Configuration.billing_settings,
+        )
+        .join(Configuration, Member.configuration_id == Configuration.id)
+        .where(Member.status == MemberStatus.ACTIVE)
+        .order_by(Member.configuration_id, Member.id)
+    )
+    if configuration_ids is not None:
+        query = query.where(Member.configuration_id.in_(configuration_ids))
+    members = pd.DataFrame(db.execute(query).all(), columns=[
+        "member_id", "configuration_id", "contracted_power", "billing_preferences", "region", "billing_settings",
+    ])
+    shared = pd.DataFrame(
+        crud.energy_reading.shared_by_member(db, start=start, end=end, configuration_ids=configuration_ids),
+        columns=["member_id", "energy_kwh"],
+    )
+    members = members.merge(shared, on="member_id", how="left")
+    members["energy_kwh"] = members["energy_kwh"].fillna(0.0)
+    members["social"] = [bool((p or {}).get("social_bonus")) for p in members["billing_preferences"]]
+
+    # Settings are per configuration: parse each once, then broadcast
+    settings = members.drop_duplicates("configuration_id").set_index("configuration_id")["billing_settings"]
+    fund_share = settings.map(lambda s: _setting(s, "community_fund_share", COMMUNITY_FUND_SHARE))
+    monthly_fee = settings.map(lambda s: _setting(s, "monthly_fee", 0.0))
+    members["community_fund_share"] = members["configuration_id"].map(fund_share)
+    members["monthly_fee"] = members["configuration_id"].map(monthly_fee)
+    return members.drop(columns=["billing_preferences", "billing_settings"])
+
+@dataclass
+class BillingRunSummary:
+    period: str
+    statements: int = 0
+    members_without_tariff: List[int] = field(default_factory=list)
+    total_energy_kwh: float = 0.0
+    total_incentive: float = 0.0
+    total_net_payment: float = 0.0
+
+def statement_rows(period: str, members: pd.DataFrame, amounts: Dict[str, np.ndarray], tariffs: TariffTable) -> List[Dict[str, Any]]:
+    """Insert parameters for members that have a tariff."""
+    billable = amounts["tariff_row"] >= 0
+    tariff_ids = tariffs.ids[np.clip(amounts["tariff_row"], 0, None)]
+    columns = {
+        "member_id": members["member_id"].to_numpy(),
+        "configuration_id": members["configuration_id"].to_numpy(),
+        **{name: values for name, values in amounts.items() if name != "tariff_row"},
+    }
+    names = list(columns)
+    values = [np.asarray(columns[name])[billable].tolist() for name in names]
+    tariff_ids = tariff_ids[billable].tolist()
+    return [
+        {**dict(zip(names, row)), "period": period, "status": "pending", "details": {"tariff_id": tariff_id}}
+        for row, tariff_id in zip(zip(*values), tariff_ids)
+    ]
+
+def run_billing(
+    db: Session,
+    *,
+    period: str,
+    configuration_ids: Optional[Sequence[int]] = None,
+    tariffs: Optional[TariffTable] = None,
+    batch_size: int = 5000,
+) -> BillingRunSummary:
+    """Compute and store the statements of every active member for a YYYY-MM period."""
+    tariffs = tariffs or TariffTable.from_db(db)
+    members = billing_inputs(db, period=period, configuration_ids=configuration_ids)
+    start, end = period_bounds(period)
+    amounts = compute_statements(
+        tariffs,
+        energy_kwh=members["energy_kwh"].to_numpy(),
+        regions=members["region"].to_numpy(),
+        capacity_kw=members["contracted_power"].to_numpy(dtype=float, na_value=np.nan),
+        social=members["social"].to_numpy(),
+        at=start,
+        until=end,
+        community_fund_share=members["community_fund_share"].to_numpy(),
+        monthly_fee=members["monthly_fee"].to_numpy(),
+    )
+    rows = statement_rows(period, members, amounts, tariffs)
+    for offset in range(0, len(rows), batch_size):
+        crud.billing_statement.bulk_upsert(db, statements=rows[offset:offset + batch_size])
+
+    billable = amounts["tariff_row"] >= 0
+    return BillingRunSummary(
+        period=period,
+        statements=len(rows),
+        members_without_tariff=members["member_id"].to_numpy()[~billable].tolist(),
+        total_energy_kwh=float(amounts["energy_shared"][billable].sum()),
+        total_incentive=float(amounts["total_incentive"][billable].sum()),
+        total_net_payment=float(amounts["net_payment"][billable].sum()),
+    )
+
+def _scope(configuration_ids: Optional[Sequence[int]]) -> str:
+    return "all" if configuration_ids is None else ",".join(str(i) for i in sorted(configuration_ids))
+
+def _changes(db: Session, period: str, members: pd.DataFrame, amounts: Dict[str, np.ndarray],
+             configuration_ids: Optional[Sequence[int]], force: bool):
+    """
+    (write, stale): the members whose statement is missing or differs from
+    the recomputed one, and the members of the scope with a pending
+    statement the run no longer produces (no longer active, or without a
+    tariff). Comparing with what is stored rather than tracking changes
+    sees every edit to readings, members, configurations and tariffs,
+    deletions included.
+    """
+    stored = pd.DataFrame(
+        crud.billing_statement.get_amounts(db, period=period, configuration_ids=configuration_ids),
+        columns=["member_id", "status", "configuration_id", *STATEMENT_AMOUNTS],
+    )
+    billable = amounts["tariff_row"] >= 0
+    produced = members["member_id"].to_numpy()[billable]
+    stale = stored.loc[(stored["status"] == "pending") & ~stored["member_id"].isin(produced), "member_id"].tolist()
+    if force:
+        return billable, stale
+
+    stored = members[["member_id"]].merge(stored, on="member_id", how="left")
+    same = stored["configuration_id"].to_numpy(dtype=float, na_value=np.nan) == members["configuration_id"].to_numpy()
+    for name in STATEMENT_AMOUNTS:
+        same &= np.isclose(stored[name].to_numpy(dtype=float, na_value=np.nan), amounts[name])
+    locked = (stored["status"].notna() & (stored["status"] != "pending")).to_numpy()
+    return billable & ~(same | locked), stale
+
+def _publish_batch_progress(run: BillingRun, configuration_ids: np.ndarray, first: Dict[int, int],
+                            count: Dict[int, int], start: int, stop: int) -> None:
+    for configuration_id in np.unique(configuration_ids[start:stop]).tolist():
+        completed = min(stop, first[configuration_id] + count[configuration_id]) - first[configuration_id]
+        publish_progress(
+            configuration_id, task="billing", completed=completed, total=count[configuration_id],
+            period=run.period, run_id=run.id,
+        )
+
+def _process_run(db: Session, run: BillingRun, *, configuration_ids: Optional[Sequence[int]],
+                 tariffs: TariffTable, batch_size: int, force: bool) -> BillingRun:
+    members = billing_inputs(db, period=run.period, configuration_ids=configuration_ids)
+    start, end = period_bounds(run.period)
+    amounts = compute_statements(
+        tariffs,
+        energy_kwh=members["energy_kwh"].to_numpy(),
+        regions=members["region"].to_numpy(),
+        capacity_kw=members["contracted_power"].to_numpy(dtype=float, na_value=np.nan),
+        social=members["social"].to_numpy(),
+        at=start,
+        until=end,
+        community_fund_share=members["community_fund_share"].to_numpy(),
+        monthly_fee=members["monthly_fee"].to_numpy(),
+    )
+    member_ids = members["member_id"].to_numpy()
+    member_configurations = members["configuration_id"].to_numpy()
+    write, stale = _changes(db, run.period, members, amounts, configuration_ids, force)
+
+    # Resume after the checkpoint; members are in (configuration_id, id) order
+    resume_at = 0
+    if run.last_member_id is not None:
+        after = (member_configurations > run.last_configuration_id) | (
+            (member_configurations == run.last_configuration_id) & (member_ids > run.last_member_id)
+        )
+        resume_at = int(np.argmax(after)) if after.any() else len(members)
+    run.total_members = len(members)
+    first = members.drop_duplicates("configuration_id").reset_index().set_index("configuration_id")["index"].to_dict()
+    count = members.groupby("configuration_id").size().to_dict()
+
+    for offset in range(resume_at, len(members), batch_size):
+        stop = min(offset + batch_size, len(members))
+        batch = np.zeros(len(members), dtype=bool)
+        batch[offset:stop] = True
+        batch &= write
+        rows = statement_rows(run.period, members[batch], {k: v[batch] for k, v in amounts.items()}, tariffs)
+        crud.billing_statement.bulk_upsert(db, statements=rows, commit=False)
+        # The checkpoint commits with the statements it covers
+        run.processed_members = stop
+        run.written_statements += len(rows)
+        run.last_configuration_id = int(member_configurations[stop - 1])
+        run.last_member_id = int(member_ids[stop - 1])
+        db.commit()
+        _publish_batch_progress(run, member_configurations, first, count, offset, stop)
+
+    crud.billing_statement.delete_pending(db, period=run.period, member_ids=stale, commit=False)
+    run.processed_members = len(members)
+    run.status = "completed"
+    run.finished_at = db.execute(select(func.now())).scalar()
+    db.commit()
+    crud.billing_statement.invalidate_cache()
+    return run
+
+def run_incremental_billing(
+    db: Session,
+    *,
+    periods: Sequence[str],
+    configuration_ids: Optional[Sequence[int]] = None,
+    tariffs: Optional[TariffTable] = None,
+    batch_size: int = 5000,
+    force: bool = False,
+    scope: Optional[str] = None,
+) -> List[BillingRun]:
+    """
+    Bill the periods and return their runs. Statements are recomputed
+    from the current inputs and only those that changed are written (all
+    of them with `force`); pending statements the run no longer produces
+    are removed. An unfinished run of a period and scope is resumed from
+    its checkpoint rather than restarted; `scope` names it, by default
+    after the configuration ids.
+    """
+    tariffs = tariffs or TariffTable.from_db(db)
+    scope = scope or _scope(configuration_ids)
+    runs = []
+    for period in periods:
+        run = crud.billing_run.get_unfinished(db, period=period, scope=scope)
+        if run is None:
+            run = crud.billing_run.start(db, period=period, scope=scope, started_at=db.execute(select(func.now())).scalar())
+        run.status = "running"
+        try:
+            runs.append(_process_run(
+                db, run, configuration_ids=configuration_ids, tariffs=tariffs, batch_size=batch_size, force=force
+            ))
+        except Exception as e:
+            db.rollback()
+            run.status = "failed"
+            run.error = str(e)[:1000]
+            db.commit()
+            raise
+    return runs
@@ -0,0 +1,138 @@
+"""
+Billing fan-out: a billing period split into shards of whole configurations,
+billed as Celery tasks on the `cer` queue (or in-process), and reduced to
+totals over every shard.
+
+A shard is a fixed range of configuration ids, so members or configurations
+joining and leaving never move a shard boundary, and a repeated or retried
+shard task finds the BillingRun of its own range and resumes it. Statements
+are compared with the stored ones and upserted on (member, period): running
+a shard twice writes nothing new. The reducer reads the totals back from
+the stored statements, so unchanged shards count too.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.celery_config import celery
+from app.db.session import SessionLocal
+from app.models.configuration import Configuration
+from app.services.billing import TariffTable, run_incremental_billing
+
+# Configuration ids per shard: with ~20 members each, a few thousand members a task
+DEFAULT_SHARD_SIZE = 100
+
+TOTAL_KEYS = ("statements", "written_statements", "energy_kwh", "total_incentive", "total_net_payment")
+
+def configuration_ids_to_bill(db: Session, *, configuration_ids: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Every configuration, not only those with active members, so a run
+    still removes the statements of members who all left.
+    """
+    query = select(Configuration.id)
+    if configuration_ids is not None:
+        query = query.where(Configuration.id.in_(configuration_ids))
+    return list(db.execute(query).scalars())
+
+def shard_configurations(configuration_ids: Iterable[int], shard_size: int = DEFAULT_SHARD_SIZE) -> List[Tuple[str, List[int]]]:
+    """
+    (scope, configuration ids) of the non-empty shards: shard k holds the
+    ids in [k * shard_size, (k + 1) * shard_size) and its scope names that
+    range, whichever ids exist.
+    """
+    shards: Dict[int, List[int]] = {}
+    for configuration_id in sorted(configuration_ids):
+        shards.setdefault(configuration_id // shard_size, []).append(configuration_id)
+    return [
+        (f"configurations {k * shard_size}-{(k + 1) * shard_size - 1}", ids)
+        for k, ids in shards.items()
+    ]
+
+def bill_shard(
+    db: Session,
+    *,
+    period: str,
+    scope: str,
+    configuration_ids: List[int],
+    tariffs: Optional[TariffTable] = None,
+    batch_size: int = 5000,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Bill one shard and return its stored totals; JSON-friendly."""
+    began = time.perf_counter()
+    (run,) = run_incremental_billing(
+        db, periods=[period], configuration_ids=configuration_ids, tariffs=tariffs, batch_size=batch_size,
+        force=force, scope=scope,
+    )
+    return {
+        "configurations": len(configuration_ids),
+        "written_statements": run.written_statements,
+        **crud.billing_statement.get_totals(db, period=period, configuration_ids=configuration_ids),
+        "seconds": time.perf_counter() - began,
+    }
+
+def reduce_totals(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals over the shard results of one period."""
+    totals: Dict[str, Any] = {key: sum(result[key] for result in results) for key in TOTAL_KEYS}
+    totals.update(
+        shards=len(results),
+        unchanged_shards=sum(result["written_statements"] == 0 for result in results),
+        configurations=sum(result["configurations"] for result in results),
+        shard_seconds=[result["seconds"] for result in results],
+    )
+    return totals
+
+@celery.task(name="billing.bill_shard", acks_late=True)
+def bill_shard_task(
+    period: str, scope: str, configuration_ids: List[int], batch_size: int = 5000, force: bool = False
+) -> Dict[str, Any]:
+    # Acknowledged after it returns: a shard lost with its worker is delivered again and resumes
+    db = SessionLocal()
+    try:
+        return bill_shard(
+            db, period=period, scope=scope, configuration_ids=configuration_ids, batch_size=batch_size, force=force
+        )
+    finally:
+        db.close()
+
+@celery.task(name="billing.reduce_totals")
+def reduce_totals_task(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return reduce_totals(results)
+
+def run_sharded_billing(
+    db: Session,
+    *,
+    period: str,
+    configuration_ids: Optional[Sequence[int]] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    batch_size: int = 5000,
+    force: bool = False,
+    executor: str = "celery",
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Bill a YYYY-MM period shard by shard and return the reduced totals.
+
+    `executor` is "celery" (a chord of shard tasks with the reducer as its
+    callback; waits up to `timeout` seconds) or "serial" (every shard in
+    this process, on `db`).
+    """
+    if executor not in ("serial", "celery"):
+        raise ValueError(f"Unknown executor: {executor}")
+    shards = shard_configurations(configuration_ids_to_bill(db, configuration_ids=configuration_ids), shard_size)
+    if executor == "serial" or not shards:
+        tariffs = TariffTable.from_db(db)
+        return reduce_totals([
+            bill_shard(
+                db, period=period, scope=scope, configuration_ids=ids, tariffs=tariffs, batch_size=batch_size, force=force
+            )
+            for scope, ids in shards
+        ])
+
+    from celery import chord
+
+    job = chord(bill_shard_task.s(period, scope, ids, batch_size, force) for scope, ids in shards)(reduce_totals_task.s())
+    return job.get(timeout=timeout)
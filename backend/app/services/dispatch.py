@@ -0,0 +1,484 @@
+"""
+Community dispatch optimizer: schedules battery charge/discharge to maximize
+incentivized shared energy, which per CER rules is, for every interval, the
+minimum of the energy injected and the energy withdrawn by the community.
+
+The model is assembled as a sparse constraint matrix from NumPy index
+arrays, so its size is driven by batteries × steps, never by member count:
+members only enter through their aggregated injection/withdrawal. Long
+horizons are solved as a rolling sequence of fixed-size windows that share
+one model structure; only bounds, right-hand sides and costs change between
+windows.
+
+With solver="cbc" each window is warm-started (a MIP start) from the
+previous window's solution, shifted; the model goes to the CBC binary that
+ships with pulp as an MPS file formatted from the sparse arrays in bulk.
+HiGHS through scipy (the default) has no warm-start hook, so its windows
+are solved cold: the pure LP solves in milliseconds either way, and CBC's
+warm start pays off on the MILP of `exclusive_modes`.
+"""
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import List, Optional, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+ArrayLike = Union[float, np.ndarray]
+
+@dataclass
+class BatteryFleet:
+    """Per-battery parameters; scalars are broadcast to `count` batteries."""
+    capacity_kwh: ArrayLike
+    power_kw: ArrayLike
+    charge_efficiency: ArrayLike = 0.95
+    discharge_efficiency: ArrayLike = 0.95
+    min_soc: ArrayLike = 0.1  # Fraction of capacity that is never used
+    initial_soc_kwh: Optional[ArrayLike] = None  # Defaults to the minimum state of charge
+    self_discharge: ArrayLike = 0.0  # Fraction of stored energy lost per step
+    count: Optional[int] = None
+
+    def __post_init__(self):
+        if self.initial_soc_kwh is None:
+            self.initial_soc_kwh = np.asarray(self.min_soc, dtype=float) * np.asarray(self.capacity_kwh, dtype=float)
+        names = (
+            "capacity_kwh", "power_kw", "charge_efficiency", "discharge_efficiency",
+            "min_soc", "initial_soc_kwh", "self_discharge",
+        )
+        values = [np.atleast_1d(np.asarray(getattr(self, name), dtype=float)) for name in names]
+        size = self.count or max(len(v) for v in values)
+        for name, value in zip(names, values):
+            setattr(self, name, np.broadcast_to(value, (size,)).copy())
+        self.count = size
+        floor = self.min_soc * self.capacity_kwh
+        self.initial_soc_kwh = np.clip(self.initial_soc_kwh, floor, self.capacity_kwh)
+
+@dataclass
+class WindowStats:
+    start: int
+    steps: int
+    solve_seconds: float
+    status: str
+    objective: float
+
+@dataclass
+class DispatchResult:
+    charge_kwh: np.ndarray  # (B, T)
+    discharge_kwh: np.ndarray  # (B, T)
+    soc_kwh: np.ndarray  # (B, T), at the end of each step
+    injection_kwh: np.ndarray  # (T,)
+    withdrawal_kwh: np.ndarray  # (T,)
+    shared_kwh: np.ndarray  # (T,)
+    incentive_eur: float
+    windows: List[WindowStats] = field(default_factory=list)
+
+    @property
+    def solve_seconds(self) -> float:
+        return sum(w.solve_seconds for w in self.windows)
+
+def community_flows(production: np.ndarray, consumption: np.ndarray):
+    """
+    Injection and withdrawal per step from (members × steps) arrays. Each
+    member nets its own production first, as its meter does.
+    """
+    net = np.atleast_2d(production) - np.atleast_2d(consumption)
+    injection = np.clip(net, 0, None).sum(axis=0)
+    withdrawal = np.clip(-net, 0, None).sum(axis=0)
+    return injection, withdrawal
+
+class DispatchModel:
+    """
+    Constraint structure for one window of `horizon` steps.
+
+    Variables, in blocks of B×H (battery-major) or H:
+        charge, discharge, soc, shared[, mode]
+    Rows:
+        soc[b,t] - (1-sd)·soc[b,t-1] - ηc·charge[b,t] + discharge[b,t]/ηd = (1-sd)·soc0[b] if t == 0 else 0
+        Σb charge[b,t]                              ≤ injection[t]   (charge from surplus only)
+        shared[t] + Σb charge[b,t] - Σb discharge[b,t] ≤ injection[t]
+        charge[b,t] - Pmax·mode[b,t]                ≤ 0              (exclusive modes only)
+        discharge[b,t] + Pmax·mode[b,t]             ≤ Pmax
+    shared[t] ≤ withdrawal[t] is a variable bound.
+    """
+    def __init__(self, batteries: BatteryFleet, horizon: int, step_hours: float = 1.0, exclusive_modes: bool = False):
+        self.batteries = batteries
+        self.horizon = H = horizon
+        self.step_hours = step_hours
+        self.exclusive_modes = exclusive_modes
+        B = batteries.count
+        self.B = B
+
+        self.charge = np.arange(B * H).reshape(B, H)
+        self.discharge = self.charge + B * H
+        self.soc = self.charge + 2 * B * H
+        self.shared = np.arange(H) + 3 * B * H
+        self.mode = self.charge + 3 * B * H + H if exclusive_modes else None
+        self.n = 3 * B * H + H + (B * H if exclusive_modes else 0)
+
+        retain = np.repeat(1 - batteries.self_discharge, H).reshape(B, H)
+        eta_c = np.repeat(batteries.charge_efficiency, H).reshape(B, H)
+        eta_d = np.repeat(batteries.discharge_efficiency, H).reshape(B, H)
+        self.max_step_kwh = batteries.power_kw * step_hours
+
+        rows, cols, data = [], [], []
+        # State of charge dynamics
+        soc_rows = np.arange(B * H).reshape(B, H)
+        rows += [soc_rows.ravel(), soc_rows[:, 1:].ravel(), soc_rows.ravel(), soc_rows.ravel()]
+        cols += [self.soc.ravel(), self.soc[:, :-1].ravel(), self.charge.ravel(), self.discharge.ravel()]
+        data += [np.ones(B * H), -retain[:, 1:].ravel(), -eta_c.ravel(), 1 / eta_d.ravel()]
+        self.soc_rows = soc_rows
+        # Charge only from surplus
+        surplus_rows = B * H + np.arange(H)
+        rows += [np.tile(surplus_rows, B)]
+        cols += [self.charge.ravel()]
+        data += [np.ones(B * H)]
+        # Shared energy cannot exceed injection
+        shared_rows = surplus_rows + H
+        rows += [shared_rows, np.tile(shared_rows, B), np.tile(shared_rows, B)]
+        cols += [self.shared, self.charge.ravel(), self.discharge.ravel()]
+        data += [np.ones(H), np.ones(B * H), -np.ones(B * H)]
+        self.surplus_rows = surplus_rows
+        self.shared_rows = shared_rows
+        n_rows = B * H + 2 * H
+        if exclusive_modes:
+            pmax = np.repeat(self.max_step_kwh, H)
+            charge_rows = n_rows + np.arange(B * H)
+            discharge_rows = charge_rows + B * H
+            rows += [charge_rows, charge_rows, discharge_rows, discharge_rows]
+            cols += [self.charge.ravel(), self.mode.ravel(), self.discharge.ravel(), self.mode.ravel()]
+            data += [np.ones(B * H), -pmax, np.ones(B * H), pmax]
+            self.mode_rows = (charge_rows, discharge_rows)
+            n_rows += 2 * B * H
+
+        self.A = sparse.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=(n_rows, self.n)
+        )
+        self.n_rows = n_rows
+        self.equality = np.zeros(n_rows, dtype=bool)
+        self.equality[: B * H] = True
+
+        # Bounds that do not change between windows
+        self.lower = np.zeros(self.n)
+        self.upper = np.empty(self.n)
+        self.upper[self.charge] = self.max_step_kwh[:, None]
+        self.upper[self.discharge] = self.max_step_kwh[:, None]
+        self.lower[self.soc] = (batteries.min_soc * batteries.capacity_kwh)[:, None]
+        self.upper[self.soc] = batteries.capacity_kwh[:, None]
+        if exclusive_modes:
+            self.upper[self.mode] = 1
+        self.integrality = np.zeros(self.n)
+        if exclusive_modes:
+            self.integrality[self.mode] = 1
+        self._cbc: Optional[_CbcModel] = None
+
+    def window_arrays(
+        self,
+        injection: np.ndarray,
+        withdrawal: np.ndarray,
+        incentive: np.ndarray,
+        export_price: np.ndarray,
+        soc0: np.ndarray,
+        cycle_cost: float,
+    ):
+        """Costs, variable bounds and row bounds for one window (arrays of length horizon)."""
+        B, H = self.B, self.horizon
+        c = np.zeros(self.n)
+        c[self.shared] = -incentive
+        c[self.charge] = export_price + cycle_cost
+        c[self.discharge] = -export_price + cycle_cost
+
+        lower, upper = self.lower, self.upper.copy()
+        upper[self.shared] = withdrawal
+
+        row_upper = np.zeros(self.n_rows)
+        row_upper[self.soc_rows[:, 0]] = (1 - self.batteries.self_discharge) * soc0
+        row_upper[self.surplus_rows] = injection
+        row_upper[self.shared_rows] = injection
+        if self.exclusive_modes:
+            row_upper[self.mode_rows[1]] = np.repeat(self.max_step_kwh, H)
+        row_lower = np.where(self.equality, row_upper, -np.inf)
+        return c, lower, upper, row_lower, row_upper
+
+    def solve(self, c, lower, upper, row_lower, row_upper, *, solver: str = "highs",
+              warm_start: Optional[np.ndarray] = None, time_limit: Optional[float] = None,
+              mip_gap: float = 1e-4):
+        if solver == "cbc":
+            return self._solve_cbc(c, lower, upper, row_upper, warm_start, time_limit, mip_gap)
+        options = {"disp": False, "mip_rel_gap": mip_gap}
+        if time_limit:
+            options["time_limit"] = time_limit
+        # HiGHS through scipy has no warm-start hook; it is fast enough cold
+        result = milp(
+            c,
+            integrality=self.integrality,
+            bounds=Bounds(lower, upper),
+            constraints=LinearConstraint(self.A, row_lower, row_upper),
+            options=options,
+        )
+        if result.x is None:
+            raise RuntimeError(f"Dispatch window could not be solved: {result.message}")
+        return result.x, "optimal" if result.status == 0 else result.message, result.fun
+
+    def _solve_cbc(self, c, lower, upper, row_upper, warm_start, time_limit, mip_gap):
+        if self._cbc is None:
+            self._cbc = _CbcModel(self)
+        return self._cbc.solve(c, lower, upper, row_upper, warm_start, time_limit, mip_gap)
+
+def _join(*parts) -> np.ndarray:
+    """Element-wise concatenation of string arrays and scalars."""
+    return reduce(np.char.add, parts)
+
+def _numbers(values: np.ndarray) -> np.ndarray:
+    return np.char.mod("%21.12e", np.asarray(values, dtype=float))
+
+# CBC's first solution line, as read by pulp: "Optimal - objective value 12.3"
+_CBC_STATUS = {"Optimal": "optimal", "Infeasible": "infeasible", "Integer": "infeasible",
+               "Unbounded": "unbounded", "Stopped": "not solved"}
+
+class _CbcModel:
+    """
+    A DispatchModel as fixed-format MPS for the CBC binary shipped with pulp.
+    The ROWS section and the constraint matrix are formatted once from the
+    sparse arrays; a window only formats its costs, bounds, right-hand sides
+    and warm start, as whole arrays.
+    """
+    def __init__(self, model: DispatchModel):
+        import pulp
+
+        self.path = pulp.PULP_CBC_CMD().path
+        self.n = model.n
+        self.columns = np.char.add("X", np.char.zfill(np.arange(model.n).astype(str), 7))
+        rows = np.char.add("C", np.char.zfill(np.arange(model.n_rows).astype(str), 7))
+        self.rows = rows
+        self.header = "\n".join([
+            "NAME          DISPATCH", "ROWS", " N  OBJ",
+            *_join(np.where(model.equality, " E  ", " L  "), rows).tolist(),
+            "COLUMNS", "",
+        ])
+        A = model.A.tocsc()
+        self.matrix_columns = np.repeat(np.arange(model.n), np.diff(A.indptr))
+        self.matrix = _join("    ", self.columns[self.matrix_columns], "  ", rows[A.indices], _numbers(A.data))
+        integer = np.flatnonzero(model.integrality)
+        # Integer columns (the mode block) are contiguous, so one marker pair brackets them
+        self.integer = (int(integer[0]), int(integer[-1]) + 1) if len(integer) else None
+
+    def write(self, path: str, c, lower, upper, row_upper) -> None:
+        costs = np.flatnonzero(c)
+        entry_columns = np.concatenate([costs, self.matrix_columns])
+        entries = np.concatenate([_join("    ", self.columns[costs], "  OBJ     ", _numbers(c[costs])), self.matrix])
+        order = np.argsort(entry_columns, kind="stable")
+        entry_columns, entries = entry_columns[order], entries[order].tolist()
+        if self.integer is not None:
+            first, last = np.searchsorted(entry_columns, self.integer)
+            entries[last:last] = ["    MARK      'MARKER'                 'INTEND'"]
+            entries[first:first] = ["    MARK      'MARKER'                 'INTORG'"]
+        rhs = np.flatnonzero(row_upper)
+        with open(path, "w") as f:
+            f.write(self.header)
+            f.write("\n".join(entries))
+            f.write("\nRHS\n")
+            f.write("\n".join(_join("    RHS       ", self.rows[rhs], _numbers(row_upper[rhs])).tolist()))
+            f.write("\nBOUNDS\n")
+            f.write("\n".join(_join(" LO BND       ", self.columns, _numbers(lower)).tolist()))
+            f.write("\n")
+            f.write("\n".join(_join(" UP BND       ", self.columns, _numbers(upper)).tolist()))
+            f.write("\nENDATA\n")
+
+    def write_start(self, path: str, x: np.ndarray) -> None:
+        # Same layout as pulp's writesol: index, name, value, reduced cost
+        lines = _join(np.arange(self.n).astype(str), " ", self.columns, " ", _numbers(x), " 0")
+        with open(path, "w") as f:
+            f.write("Stopped on time - objective value 0\n")
+            f.write("\n".join(lines.tolist()))
+            f.write("\n")
+
+    def solve(self, c, lower, upper, row_upper, warm_start, time_limit, mip_gap):
+        with tempfile.TemporaryDirectory(prefix="dispatch-") as directory:
+            model_path, start_path, solution_path = (
+                os.path.join(directory, name) for name in ("model.mps", "start.mst", "solution.sol")
+            )
+            self.write(model_path, c, lower, upper, row_upper)
+            args = [self.path, model_path]
+            if warm_start is not None:
+                # CBC rejects starts outside the bounds, e.g. by float rounding
+                self.write_start(start_path, np.clip(warm_start, lower, upper))
+                args += ["mips", start_path]
+            if time_limit:
+                args += ["sec", str(time_limit)]
+            args += ["ratio", str(mip_gap), "branch" if self.integer is not None else "initialSolve",
+                     "printingOptions", "all", "solution", solution_path]
+            subprocess.run(
+                args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, check=True
+            )
+            with open(solution_path) as f:
+                first, _, body = f.read().replace("**", "").partition("\n")
+
+        words = first.split()
+        status = _CBC_STATUS.get(words[0], "undefined")
+        if status == "not solved" and "objective" in words:
+            status = "optimal"  # Stopped on a limit with a feasible solution, as pulp reports it
+        objective = float(words[-1]) if "objective" in words else 0.0
+        # Rows, then columns: index, name, value, reduced cost (or dual)
+        fields = np.array(body.split(), dtype=str).reshape(-1, 4)
+        names, values = fields[:, 1], fields[:, 2]
+        is_column = np.char.startswith(names, "X")
+        x = np.zeros(self.n)
+        x[np.char.lstrip(names[is_column], "X").astype(int)] = values[is_column].astype(float)
+        return x, status, objective
+
+def optimize_dispatch(
+    production: np.ndarray,
+    consumption: np.ndarray,
+    batteries: BatteryFleet,
+    *,
+    incentive: ArrayLike,
+    export_price: ArrayLike = 0.0,
+    step_hours: float = 1.0,
+    horizon_steps: Optional[int] = None,
+    commit_steps: Optional[int] = None,
+    solver: str = "highs",
+    exclusive_modes: bool = False,
+    cycle_cost: float = 1e-4,
+    time_limit: Optional[float] = None,
+    model: Optional[DispatchModel] = None,
+) -> DispatchResult:
+    """
+    Battery schedule maximizing incentive on shared energy (plus export
+    value, when `export_price` is given) over T steps.
+
+    `production`/`consumption` are kWh per step, shaped (members, T) or (T,).
+    With `horizon_steps` < T the horizon is rolled: each window of
+    `horizon_steps` is optimized, its first `commit_steps` are kept, and the
+    next window starts from the resulting state of charge. Pass `model` to
+    reuse a structure across calls with the same batteries and horizon.
+
+    Round-trip losses and `cycle_cost` already make charging and discharging
+    in the same step unprofitable, so by default the model is a pure LP;
+    `exclusive_modes` adds one binary per battery and step to forbid it
+    outright, at several times the solve time.
+    """
+    injection, withdrawal = community_flows(production, consumption)
+    T = injection.shape[0]
+    H = horizon_steps or T
+    S = min(commit_steps or H, H)
+    incentive = np.broadcast_to(np.asarray(incentive, dtype=float), (T,))
+    export_price = np.broadcast_to(np.asarray(export_price, dtype=float), (T,))
+    if model is None:
+        model = DispatchModel(batteries, H, step_hours, exclusive_modes)
+    B = batteries.count
+
+    charge = np.zeros((B, T))
+    discharge = np.zeros((B, T))
+    soc = np.zeros((B, T))
+    shared = np.zeros(T)
+    soc0 = batteries.initial_soc_kwh.copy()
+    windows = []
+    previous = None
+
+    for start in range(0, T, S):
+        # Every window has the same shape; the tail is padded with idle steps
+        pad = max(0, start + H - T)
+        def window(values):
+            return np.concatenate([values[start:start + H], np.zeros(pad)])
+
+        arrays = model.window_arrays(
+            window(injection), window(withdrawal), window(incentive), window(export_price), soc0, cycle_cost
+        )
+        warm_start = None
+        if previous is not None:
+            warm_start = _shift(model, previous, S)
+        began = time.perf_counter()
+        x, status, objective = model.solve(
+            *arrays, solver=solver, warm_start=warm_start, time_limit=time_limit
+        )
+        elapsed = time.perf_counter() - began
+
+        kept = min(S, T - start)
+        charge[:, start:start + kept] = x[model.charge[:, :kept]]
+        discharge[:, start:start + kept] = x[model.discharge[:, :kept]]
+        soc[:, start:start + kept] = x[model.soc[:, :kept]]
+        shared[start:start + kept] = x[model.shared[:kept]]
+        # Solvers return values within their tolerance; a start below the floor can make the next window infeasible
+        soc0 = np.clip(soc[:, start + kept - 1], batteries.min_soc * batteries.capacity_kwh, batteries.capacity_kwh)
+        windows.append(WindowStats(start, kept, elapsed, status, float(objective)))
+        previous = x
+
+    injection_with_storage = injection - charge.sum(axis=0) + discharge.sum(axis=0)
+    return DispatchResult(
+        charge_kwh=charge,
+        discharge_kwh=discharge,
+        soc_kwh=soc,
+        injection_kwh=injection_with_storage,
+        withdrawal_kwh=withdrawal,
+        shared_kwh=shared,
+        incentive_eur=float(incentive @ shared),
+        windows=windows,
+    )
+
+def _shift(model: DispatchModel, x: np.ndarray, steps: int) -> np.ndarray:
+    """Previous window's solution moved `steps` earlier, as a starting point."""
+    shifted = np.zeros_like(x)
+    for block in (model.charge, model.discharge, model.soc, model.mode):
+        if block is None:
+            continue
+        shifted[block[:, :-steps]] = x[block[:, steps:]]
+        if block is model.soc:
+            shifted[block[:, -steps:]] = x[block[:, -1:]]
+    shifted[model.shared[:-steps]] = x[model.shared[steps:]]
+    return shifted
+
+def shared_energy(injection: np.ndarray, withdrawal: np.ndarray) -> np.ndarray:
+    """Shared energy per step as defined for CER incentives."""
+    return np.minimum(injection, withdrawal)
+
+def greedy_dispatch(
+    production: np.ndarray,
+    consumption: np.ndarray,
+    capacity: ArrayLike,
+    *,
+    min_soc: ArrayLike = 0.1,
+    loss: ArrayLike = 0.02,
+    initial_soc: ArrayLike = 0.0,
+):
+    """
+    The "charge on surplus, discharge on deficit" rule of simulate_bess, for
+    a battery at the production site. Production and consumption are
+    (..., T) and battery parameters broadcast against their leading
+    dimensions; every leading index (scenario, realization) is an
+    independent battery, so the loop is over time only. On discharge, `loss` × state of charge is lost from the
+    energy delivered.
+
+    Returns charge, delivered discharge and end-of-step state of charge, (..., T).
+    """
+    production, consumption = np.broadcast_arrays(np.asarray(production, dtype=float),
+                                                   np.asarray(consumption, dtype=float))
+    capacity, min_soc, loss, initial_soc = (np.asarray(v, dtype=float) for v in (capacity, min_soc, loss, initial_soc))
+    shape = np.broadcast_shapes(production.shape[:-1], capacity.shape, min_soc.shape, loss.shape, initial_soc.shape)
+    surplus = np.broadcast_to(production - consumption, shape + production.shape[-1:])
+    capacity = np.broadcast_to(capacity, shape)
+    floor = np.broadcast_to(min_soc, shape) * capacity
+    loss = np.broadcast_to(loss, shape)
+    soc = np.broadcast_to(initial_soc, shape).copy()
+
+    # Time-major copies, so every step reads and writes contiguous memory
+    surplus = np.ascontiguousarray(np.moveaxis(surplus, -1, 0))
+    charge = np.empty(surplus.shape)
+    discharge = np.empty(surplus.shape)
+    soc_end = np.empty(surplus.shape)
+    headroom = np.empty(shape)
+    for t in range(surplus.shape[0]):
+        # [t, ...] stays an array view even for a single battery, so it can be an `out`
+        step = surplus[t]
+        np.subtract(capacity, soc, out=headroom)
+        stored = np.clip(np.minimum(step, headroom, out=charge[t, ...]), 0, None, out=charge[t, ...])
+        drawn = np.clip(np.minimum(-step, soc - floor), 0, None)
+        np.clip(drawn - loss * soc, 0, None, out=discharge[t, ...])
+        soc += stored
+        soc -= drawn
+        soc_end[t] = soc
+    return tuple(np.moveaxis(values, 0, -1) for values in (charge, discharge, soc_end))
@@ -0,0 +1,155 @@
+"""
+Monte Carlo consumption uncertainty: K consumption realizations drawn as
+(K × T) arrays from a seeded Generator, pushed through the battery and
+sharing computations together, and summarized as percentile bands.
+
+Realizations are processed in chunks sized to `max_chunk_bytes`, so memory
+stays bounded whatever K is. Chunks are drawn one after the other from
+the same Generator, which yields the same numbers as a single (K × T) draw:
+results depend on the seed only, not on the chunk size.
+
+Several plants are simulated one by one, each with its own battery and an
+independent seed, and their results added realization by realization with
+combine().
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.live import publish_progress
+from app.services.dispatch import greedy_dispatch, shared_energy
+
+# Hourly consumption of simulate_consumption (MWh): mean, lower and upper clip
+_BANDS = [
+    (range(1, 7), 0.075, 0.050, 0.100),
+    (range(7, 9), 0.200, 0.150, 0.300),
+    (range(9, 13), 0.550, 0.450, 0.700),
+    (range(13, 15), 0.500, 0.400, 0.600),
+]
+_OTHER_HOURS = (0.150, 0.100, 0.200)
+
+def consumption_profile():
+    """(mean, lower, upper) arrays indexed by hour of day."""
+    profile = np.tile(np.array(_OTHER_HOURS), (24, 1))
+    for hours, loc, low, high in _BANDS:
+        profile[list(hours)] = (loc, low, high)
+    return profile[:, 0], profile[:, 1], profile[:, 2]
+
+def sample_consumption(hours: np.ndarray, realizations: int, rng: np.random.Generator, st_dev: float = 0.050) -> np.ndarray:
+    """(realizations × T) clipped-normal consumption for the given hours of day."""
+    mean, low, high = consumption_profile()
+    hours = np.asarray(hours)
+    draw = rng.standard_normal((realizations, hours.shape[0]))
+    draw *= st_dev
+    draw += mean[hours]
+    return np.clip(draw, low[hours], high[hours], out=draw)
+
+@dataclass
+class MonteCarloResult:
+    shared_mwh: np.ndarray  # (K,) total shared energy per realization
+    incentive_eur: np.ndarray  # (K,)
+    consumption_mwh: np.ndarray  # (K,)
+    period_shared_mwh: Optional[np.ndarray] = None  # (K, periods)
+    period_labels: Optional[np.ndarray] = None
+
+    def bands(self, percentiles: Sequence[float] = (10, 50, 90)) -> pd.DataFrame:
+        """Percentiles of the totals, one row per metric and a P<n> column per percentile."""
+        metrics = {
+            "shared_mwh": self.shared_mwh,
+            "incentive_eur": self.incentive_eur,
+            "consumption_mwh": self.consumption_mwh,
+        }
+        values = np.percentile(np.stack(list(metrics.values())), percentiles, axis=1).T
+        return pd.DataFrame(values, index=list(metrics), columns=[f"P{p:g}" for p in percentiles])
+
+    def period_bands(self, percentiles: Sequence[float] = (10, 50, 90)) -> pd.DataFrame:
+        """Percentiles of shared energy per period (e.g. per day), one row per period."""
+        if self.period_shared_mwh is None:
+            raise ValueError("No periods were given to the simulation")
+        values = np.percentile(self.period_shared_mwh, percentiles, axis=0).T
+        return pd.DataFrame(values, index=self.period_labels, columns=[f"P{p:g}" for p in percentiles])
+
+def simulate(
+    production: np.ndarray,
+    hours: np.ndarray,
+    *,
+    realizations: int = 1000,
+    seed: Union[int, np.random.SeedSequence, None] = None,
+    chunk_size: Optional[int] = None,
+    max_chunk_bytes: int = 256 << 20,
+    st_dev: float = 0.050,
+    capacity_mwh: float = 2.0,
+    min_soc: float = 0.1,
+    loss: float = 0.02,
+    incentive: float = 110.0,
+    periods: Optional[np.ndarray] = None,
+    configuration_id: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Shared energy and incentive of a plant with an on-site battery (greedy
+    rule of simulate_bess) over `realizations` consumption draws.
+
+    `production` and `hours` (hour of day) are length-T arrays in time
+    order. `periods` optionally labels every step (e.g. its date); labels
+    must be contiguous, and shared energy is then also totalled per period.
+    Unless `chunk_size` is given, chunks are as large as `max_chunk_bytes`
+    allows; larger chunks mean fewer passes of the per-step battery loop.
+    With a `configuration_id`, the realizations completed are published on
+    its live channel after every chunk.
+    """
+    production = np.asarray(production, dtype=float)
+    if chunk_size is None:
+        # Consumption, surplus, charge, discharge, state of charge and shared energy
+        chunk_size = max(1, max_chunk_bytes // (6 * 8 * production.shape[0]))
+    rng = np.random.default_rng(seed)
+    shared_total = np.empty(realizations)
+    consumption_total = np.empty(realizations)
+    period_starts = period_labels = period_shared = None
+    if periods is not None:
+        periods = np.asarray(periods)
+        period_starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        period_labels = periods[period_starts]
+        period_shared = np.empty((realizations, len(period_starts)))
+
+    for start in range(0, realizations, chunk_size):
+        stop = min(start + chunk_size, realizations)
+        consumption = sample_consumption(hours, stop - start, rng, st_dev)
+        charge, discharge, _ = greedy_dispatch(production, consumption, capacity_mwh, min_soc=min_soc, loss=loss)
+        shared = shared_energy(production - charge + discharge, consumption)
+        shared_total[start:stop] = shared.sum(axis=1)
+        consumption_total[start:stop] = consumption.sum(axis=1)
+        if period_starts is not None:
+            period_shared[start:stop] = np.add.reduceat(shared, period_starts, axis=1)
+        if configuration_id is not None:
+            publish_progress(configuration_id, task="monte_carlo", completed=stop, total=realizations)
+
+    return MonteCarloResult(
+        shared_mwh=shared_total,
+        incentive_eur=shared_total * incentive,
+        consumption_mwh=consumption_total,
+        period_shared_mwh=period_shared,
+        period_labels=period_labels,
+    )
+
+def combine(results: List[MonteCarloResult]) -> MonteCarloResult:
+    """
+    Totals over plants simulated separately with the same number of
+    realizations: realization k of the sum adds realization k of every
+    plant, so bands are percentiles of the total, not sums of percentiles.
+    Periods are matched by label.
+    """
+    period_shared = period_labels = None
+    if all(result.period_shared_mwh is not None for result in results):
+        period_labels = np.unique(np.concatenate([result.period_labels for result in results]))
+        period_shared = np.zeros((len(results[0].shared_mwh), len(period_labels)))
+        for result in results:
+            period_shared[:, np.searchsorted(period_labels, result.period_labels)] += result.period_shared_mwh
+    return MonteCarloResult(
+        shared_mwh=sum(result.shared_mwh for result in results),
+        incentive_eur=sum(result.incentive_eur for result in results),
+        consumption_mwh=sum(result.consumption_mwh for result in results),
+        period_shared_mwh=period_shared,
+        period_labels=period_labels,
+    )
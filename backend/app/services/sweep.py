@@ -0,0 +1,208 @@
+"""
+Scenario sweeps for battery sizing and member mix.
+
+The timeseries are written once to memory-mapped files (under /dev/shm when
+available, so they live in shared memory) and every worker maps them
+read-only; a scenario is sent as a small JSON-friendly dict, never as a
+DataFrame. Scenarios run in-process, in a process pool, or as Celery tasks
+on the `cer` queue; Celery workers must see the same files, i.e. run on the
+same host or a shared filesystem.
+"""
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.celery_config import celery
+from app.core.live import publish_progress
+from app.services.dispatch import greedy_dispatch, shared_energy
+
+# Incentive on shared energy (EUR/MWh), as in simulation.py
+DEFAULT_INCENTIVE_EUR_MWH = 110.0
+
+class SharedTimeseries:
+    """
+    Production of the plant and consumption per member type (MWh per step),
+    stored as memory-mapped arrays. Use as a context manager; the files are
+    removed on exit.
+    """
+    def __init__(self, timestamps, production, profiles: Mapping[str, Iterable[float]], directory: Optional[str] = None):
+        timestamps = pd.DatetimeIndex(timestamps)
+        order = np.argsort(timestamps.asi8, kind="stable")
+        timestamps = timestamps[order]
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        self.directory = tempfile.mkdtemp(prefix="sweep-", dir=directory)
+        self.member_types = list(profiles)
+
+        arrays = {
+            "production": np.asarray(production, dtype=np.float64)[order],
+            "profiles": np.stack([np.asarray(profiles[name], dtype=np.float64)[order] for name in self.member_types]),
+        }
+        arrays_spec = {}
+        for name, values in arrays.items():
+            path = os.path.join(self.directory, f"{name}.f64")
+            mapped = np.memmap(path, dtype=np.float64, mode="w+", shape=values.shape)
+            mapped[:] = values
+            mapped.flush()
+            arrays_spec[name] = {"path": path, "shape": list(values.shape)}
+
+        years = timestamps.year.to_numpy()
+        self.spec = {
+            "arrays": arrays_spec,
+            "member_types": self.member_types,
+            # Timestamps are sorted, so every year is a contiguous slice
+            "years": {
+                str(year): [int(np.searchsorted(years, year)), int(np.searchsorted(years, year, side="right"))]
+                for year in np.unique(years)
+            },
+        }
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "SharedTimeseries":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def _array(spec: Dict[str, Any]) -> np.memmap:
+    # Mapped per call and unmapped when the last view goes, so a long-lived
+    # worker never pins the segments of sweeps that have closed
+    return np.memmap(spec["path"], dtype=np.float64, mode="r", shape=tuple(spec["shape"]))
+
+def scenario_grid(**parameters: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter values, as a list of scenarios."""
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*parameters.values())]
+
+def _member_mix(spec: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, int]:
+    # Without a mix, one member of every type
+    mix = scenario.get("member_mix") or {name: 1 for name in spec["member_types"]}
+    return {name: mix.get(name, 0) for name in spec["member_types"]}
+
+def run_scenarios(spec: Dict[str, Any], scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Greedy battery simulation of scenarios sharing the same year and member
+    mix; the battery parameters are stacked, so all of them are simulated in
+    a single pass over time. Recognized keys: capacity_mwh, loss, min_soc,
+    member_mix ({member type: count}), year, incentive.
+    """
+    began = time.perf_counter()
+    scenario = scenarios[0]
+    production = _array(spec["arrays"]["production"])
+    profiles = _array(spec["arrays"]["profiles"])
+    if scenario.get("year") is not None:
+        start, stop = spec["years"][str(scenario["year"])]
+    else:
+        start, stop = 0, production.shape[0]
+
+    counts = np.array(list(_member_mix(spec, scenario).values()), dtype=np.float64)
+    production = np.asarray(production[start:stop])
+    consumption = counts @ profiles[:, start:stop]
+    capacity = np.array([s.get("capacity_mwh", 0.0) for s in scenarios], dtype=np.float64)
+    incentive = np.array([s.get("incentive", DEFAULT_INCENTIVE_EUR_MWH) for s in scenarios], dtype=np.float64)
+
+    charge, discharge, _ = greedy_dispatch(
+        production, consumption, capacity,
+        min_soc=np.array([s.get("min_soc", 0.1) for s in scenarios]),
+        loss=np.array([s.get("loss", 0.02) for s in scenarios]),
+    )
+    shared = shared_energy(production - charge + discharge, consumption).sum(axis=1)
+    shared_without_bess = shared_energy(production, consumption).sum()
+    cycles = np.divide(charge.sum(axis=1), capacity, out=np.zeros_like(capacity), where=capacity > 0)
+    seconds = (time.perf_counter() - began) / len(scenarios)
+    return [
+        {
+            "production_mwh": float(production.sum()),
+            "consumption_mwh": float(consumption.sum()),
+            "shared_mwh": float(shared[i]),
+            "shared_without_bess_mwh": float(shared_without_bess),
+            "incentive_eur": float(shared[i] * incentive[i]),
+            "incentive_gain_eur": float((shared[i] - shared_without_bess) * incentive[i]),
+            "bess_cycles": float(cycles[i]),
+            "seconds": seconds,
+        }
+        for i in range(len(scenarios))
+    ]
+
+@celery.task(name="sweep.run_scenarios")
+def run_scenarios_task(spec: Dict[str, Any], scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return run_scenarios(spec, scenarios)
+
+def run_sweep(
+    timeseries: SharedTimeseries,
+    scenarios: List[Dict[str, Any]],
+    *,
+    executor: str = "process",
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    configuration_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Run every scenario and return one row per scenario: its parameters (the
+    member mix spread over `members_<type>` columns) followed by the metrics
+    of run_scenarios, in the order of `scenarios`.
+
+    `executor` is "process" (a pool of `workers` processes), "celery", or
+    "serial". With a `configuration_id`, progress (scenarios completed) is
+    published on that configuration's live channel as batches finish.
+    """
+    if executor not in ("serial", "process", "celery"):
+        raise ValueError(f"Unknown executor: {executor}")
+    spec = timeseries.spec
+    # Round-trip through JSON so every executor sees exactly what Celery would
+    scenarios = json.loads(json.dumps(scenarios))
+    # One unit of work per (year, member mix): same consumption, stacked batteries
+    batches: Dict[str, List[int]] = {}
+    for index, scenario in enumerate(scenarios):
+        key = json.dumps([scenario.get("year"), _member_mix(spec, scenario)])
+        batches.setdefault(key, []).append(index)
+    work = [[scenarios[index] for index in indices] for indices in batches.values()]
+
+    batch_results: List[List[Dict[str, Any]]] = []
+
+    def collect(finished: Iterable[List[Dict[str, Any]]]) -> None:
+        for batch_result in finished:
+            batch_results.append(batch_result)
+            if configuration_id is not None:
+                publish_progress(
+                    configuration_id, task="sweep", completed=sum(map(len, batch_results)), total=len(scenarios)
+                )
+
+    if executor == "serial":
+        collect(run_scenarios(spec, batch) for batch in work)
+    elif executor == "process":
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(run_scenarios, itertools.repeat(spec), work))
+    else:
+        from celery import group
+
+        job = group(run_scenarios_task.s(spec, batch) for batch in work).apply_async()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Collected in order, so progress advances as the leading batches finish
+        collect(
+            result.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            for result in job.results
+        )
+
+    results: List[Dict[str, Any]] = [{}] * len(scenarios)
+    for indices, batch_result in zip(batches.values(), batch_results):
+        for index, result in zip(indices, batch_result):
+            results[index] = result
+
+    rows = []
+    for scenario, result in zip(scenarios, results):
+        row = {key: value for key, value in scenario.items() if key != "member_mix"}
+        row.update({f"members_{name}": count for name, count in _member_mix(spec, scenario).items()})
+        row.update(result)
+        rows.append(row)
+    return pd.DataFrame(rows)
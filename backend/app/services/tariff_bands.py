@@ -0,0 +1,126 @@
+"""
+ARERA time-of-use bands (fasce orarie) of Italian electricity tariffs:
+
+    F1  Monday to Friday 08-19
+    F2  Monday to Friday 07-08 and 19-23, Saturday 07-23
+    F3  Monday to Saturday 00-07 and 23-24, Sundays and national holidays
+
+The band depends on the local hour only, so it is tabulated once per hour
+over a range of years, holidays included, indexed either by local wall
+clock time or by UTC. Classifying timestamps is then an integer division
+and a table lookup per value. Tables are cached, and rebuilt wider when
+timestamps fall outside them.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.time_grid import TIMEZONE
+
+# Band codes; 0 marks NaT
+F1, F2, F3 = 1, 2, 3
+BAND_NAMES = {F1: "F1", F2: "F2", F3: "F3"}
+
+# Years tabulated up front: about 0.5 MB per table
+DEFAULT_YEARS = (2000, 2060)
+
+# National holidays on fixed dates (month, day); Easter Monday moves
+FIXED_HOLIDAYS = ((1, 1), (1, 6), (4, 25), (5, 1), (6, 2), (8, 15), (11, 1), (12, 8), (12, 25), (12, 26))
+
+_NS_PER_HOUR = 3_600_000_000_000
+_NAT = np.iinfo(np.int64).min
+
+# Band by hour of day on working days, Saturdays, and Sundays or holidays
+_DAY_TYPE_BANDS = np.array([
+    [F3] * 7 + [F2] + [F1] * 11 + [F2] * 4 + [F3],
+    [F3] * 7 + [F2] * 16 + [F3],
+    [F3] * 24,
+], dtype=np.uint8)
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+def holidays(year: int) -> List[date]:
+    """National holidays that make a day F3, Easter Monday included."""
+    return sorted([date(year, month, day) for month, day in FIXED_HOLIDAYS] + [easter_sunday(year) + timedelta(days=1)])
+
+@lru_cache(maxsize=8)
+def _table(first_year: int, last_year: int, utc: bool) -> Tuple[int, np.ndarray]:
+    """(first hour since the epoch, band of every hour) over the years, read-only."""
+    start = np.datetime64(f"{first_year}-01-01", "h").astype(np.int64)
+    end = np.datetime64(f"{last_year + 1}-01-01", "h").astype(np.int64)
+    if utc:
+        # A day either side, so UTC hours near the ends still map to covered local days
+        start, end = start - 24, end + 24
+    hours = np.arange(start, end, dtype=np.int64)
+    local = hours
+    if utc:
+        index = pd.DatetimeIndex(hours.view("datetime64[h]").astype("datetime64[ns]")).tz_localize("UTC")
+        local = index.tz_convert(TIMEZONE).tz_localize(None).asi8 // _NS_PER_HOUR
+
+    days = local // 24
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+    day_type = np.where(weekday < 5, 0, np.where(weekday == 5, 1, 2))
+    holiday_days = np.array(
+        [h for year in range(first_year - 1, last_year + 2) for h in holidays(year)], dtype="datetime64[D]"
+    ).astype(np.int64)
+    day_type[np.isin(days, holiday_days)] = 2
+
+    bands = _DAY_TYPE_BANDS[day_type, local % 24]
+    bands.flags.writeable = False
+    return int(start), bands
+
+def _years(ns: np.ndarray) -> Tuple[int, int]:
+    valid = ns[ns != _NAT]
+    if not len(valid):
+        return DEFAULT_YEARS
+    years = np.array([valid.min(), valid.max()]).view("datetime64[ns]").astype("datetime64[Y]").astype(int) + 1970
+    return min(DEFAULT_YEARS[0], int(years[0])), max(DEFAULT_YEARS[1], int(years[1]))
+
+def classify(times, *, utc: bool = False) -> np.ndarray:
+    """
+    Band code (F1, F2, F3; 0 for NaT) of every timestamp, as uint8.
+
+    Naive timestamps are Italian wall clock time unless `utc` is set;
+    tz-aware ones (a DatetimeIndex or Series) are converted. Pass
+    datetime64[ns] arrays for the fast path: anything else is converted
+    through pandas first.
+    """
+    if isinstance(times, np.ndarray) and times.dtype.kind == "M":
+        ns = times.astype("datetime64[ns]", copy=False).view(np.int64)
+    else:
+        index = pd.DatetimeIndex(times)
+        if index.tz is not None:
+            index, utc = index.tz_convert("UTC").tz_localize(None), True
+        ns = index.as_unit("ns").asi8
+
+    first, table = _table(*DEFAULT_YEARS, utc)
+    position = ns // _NS_PER_HOUR - first
+    if len(position) and (position.min() < 0 or position.max() >= len(table)):
+        first, table = _table(*_years(ns), utc)
+        position = ns // _NS_PER_HOUR - first
+        # Only NaT can still fall outside the table
+        return np.where(ns != _NAT, table[np.clip(position, 0, len(table) - 1)], 0).astype(np.uint8)
+    return table[position]
+
+def band_values(codes: np.ndarray, values: Mapping[str, float], default: float = np.nan) -> np.ndarray:
+    """
+    Per-band values spread over band codes, e.g. prices by band for
+    optimize_dispatch: band_values(classify(times), {"F1": 0.12, "F2": 0.10, "F3": 0.08}).
+    """
+    lookup = np.full(len(BAND_NAMES) + 1, default, dtype=float)
+    for code, name in BAND_NAMES.items():
+        lookup[code] = values.get(name, default)
+    return lookup[codes]
@@ -0,0 +1,146 @@
+"""
+Time grid for aligning series recorded at different intervals and in
+different time conventions: PVGIS hourly data (UTC), meter readings every
+15, 30 or 60 minutes (Italian local time) and tariff bands (step functions).
+
+A grid is a regular sequence of UTC instants, so it is DST-correct by
+construction: a local day has 92, 96 or 100 quarter hours. Its local wall
+clock times (Europe/Rome) are computed once, with the grid, and cached per
+(range, interval). Alignment works on int64 nanoseconds with NumPy only.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+TIMEZONE = "Europe/Rome"
+
+# TechnicalInfo.metering_interval values
+INTERVALS = {
+    "quarter_hourly": np.timedelta64(15, "m"),
+    "half_hourly": np.timedelta64(30, "m"),
+    "hourly": np.timedelta64(60, "m"),
+}
+
+@dataclass(frozen=True)
+class TimeGrid:
+    utc: np.ndarray  # datetime64[ns], start of every interval
+    local: np.ndarray  # datetime64[ns], naive wall clock time in TIMEZONE
+    interval: np.timedelta64
+
+    def __len__(self) -> int:
+        return self.utc.shape[0]
+
+    @property
+    def step_hours(self) -> float:
+        return self.interval / np.timedelta64(1, "h")
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Interval boundaries as int64 nanoseconds, len(self) + 1 of them."""
+        ns = self.utc.view(np.int64)
+        return np.append(ns, ns[-1] + self.interval.astype("timedelta64[ns]").astype(np.int64))
+
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.utc).tz_localize("UTC").tz_convert(TIMEZONE)
+
+def to_utc(times, tz: str = TIMEZONE) -> np.ndarray:
+    """
+    datetime64[ns] UTC from timestamps. Aware values are converted; naive
+    ones are read as wall clock time in `tz`, with the repeated autumn hour
+    resolved from the order of the data.
+    """
+    index = pd.DatetimeIndex(times)
+    if index.tz is None:
+        index = index.tz_localize(tz, ambiguous="infer" if tz != "UTC" else "raise", nonexistent="shift_forward")
+    return index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]")
+
+def _interval(interval) -> np.timedelta64:
+    if isinstance(interval, str) and interval in INTERVALS:
+        interval = INTERVALS[interval]
+    return pd.Timedelta(interval).to_timedelta64()
+
+@lru_cache(maxsize=64)
+def _grid(start: int, end: int, step: int) -> TimeGrid:
+    utc = np.arange(start, end, step, dtype=np.int64).view("datetime64[ns]")
+    local = pd.DatetimeIndex(utc).tz_localize("UTC").tz_convert(TIMEZONE).tz_localize(None).to_numpy()
+    utc.flags.writeable = False
+    local.flags.writeable = False
+    return TimeGrid(utc, local, np.timedelta64(step, "ns"))
+
+def time_grid(start, end, interval="quarter_hourly") -> TimeGrid:
+    """
+    Grid of `interval` steps covering [start, end). Naive bounds are local
+    time, so time_grid("2024-03-31", "2024-04-01") is one Italian day (23 h).
+    Grids are cached and read-only.
+    """
+    start_ns, end_ns = (_utc_ns(value) for value in (start, end))
+    return _grid(start_ns, end_ns, int(_interval(interval).astype("timedelta64[ns]").astype(np.int64)))
+
+def _utc_ns(value) -> int:
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(TIMEZONE)
+    return timestamp.tz_convert("UTC").value
+
+def _cumulative(times: np.ndarray, values: np.ndarray, duration: Optional[np.timedelta64]):
+    """
+    Breakpoints of the running total of per-interval quantities: each value
+    covers [time, time + duration) and missing intervals add nothing.
+    """
+    starts = np.asarray(times, dtype="datetime64[ns]").view(np.int64)
+    order = np.argsort(starts, kind="stable")
+    starts, values = starts[order], values[order]
+    if duration is None:
+        duration = np.median(np.diff(starts)) if len(starts) > 1 else 0
+    else:
+        duration = int(pd.Timedelta(duration).value)
+    ends = starts + int(duration)
+    total = np.cumsum(values, axis=0)
+    before = np.concatenate([np.zeros((1,) + values.shape[1:]), total[:-1]])
+    x = np.empty(2 * len(starts), dtype=np.int64)
+    x[0::2], x[1::2] = starts, ends
+    y = np.empty((2 * len(starts),) + values.shape[1:])
+    y[0::2], y[1::2] = before, total
+    return x, y
+
+def _interp(x_new, x, y):
+    if y.ndim == 1:
+        return np.interp(x_new, x, y)
+    return np.stack([np.interp(x_new, x, column) for column in y.T], axis=1)
+
+def align_energy(times, values, grid: TimeGrid, duration=None) -> np.ndarray:
+    """
+    Energy per grid interval from energy per source interval, conserving
+    totals: hourly values are spread over quarter hours and quarter-hour
+    values summed into hours. `times` are UTC interval starts (see to_utc);
+    `duration` is the source interval, inferred from the data by default.
+    `values` may be (T,) or (T, columns).
+    """
+    x, y = _cumulative(times, np.asarray(values, dtype=float), duration)
+    return np.diff(_interp(grid.edges, x, y), axis=0)
+
+def align_mean(times, values, grid: TimeGrid, duration=None) -> np.ndarray:
+    """Time-weighted mean per grid interval of an intensive quantity (power, price)."""
+    values = np.asarray(values, dtype=float)
+    x, y = _cumulative(times, np.ones(values.shape[0]), duration)
+    covered = np.diff(np.interp(grid.edges, x, y))
+    # Weight every value by its coverage so the ratio is a time-weighted mean
+    x, y = _cumulative(times, values, duration)
+    summed = np.diff(_interp(grid.edges, x, y), axis=0)
+    covered = covered.reshape((-1,) + (1,) * (summed.ndim - 1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(covered > 0, summed / covered, np.nan)
+
+def align_steps(times, codes, grid: TimeGrid, fill=0) -> np.ndarray:
+    """
+    Value in force at the start of every grid interval for a step function
+    given by its change points (tariff bands); `fill` before the first one.
+    """
+    changes = np.asarray(times, dtype="datetime64[ns]").view(np.int64)
+    codes = np.asarray(codes)
+    position = np.searchsorted(changes, grid.utc.view(np.int64), side="right") - 1
+    aligned = codes[np.clip(position, 0, None)]
+    return np.where(position >= 0, aligned, fill)
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Any, Dict
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -8,23 +8,26 @@ from app.core.config import settings
 from app.tests.utils.configuration import create_random_configuration
 from app.tests.utils.utils import random_lower_string
 from app.models.configuration import Configuration
+from app.schemas.configuration import ConfigurationList, ConfigurationWithStats
 
-def test_create_configuration(
-    client: TestClient, superuser_token_headers: Dict[str, str], db: Session
-) -> None:
-    data = {
+def configuration_data() -> Dict[str, Any]:
+    return {
         "name": random_lower_string(),
         "description": random_lower_string(),
         "type": "residential",
-        "version": "1.0",
-        "energy_source": "solar",
-        "capacity": 100.5,
+        "legal_type": "cooperative",
+        "status": "draft",
         "address": "123 Test St",
         "location": {"lat": 45.5, "lng": -122.6},
         "region": "Test Region",
         "primary_substation_id": "SUB123",
-        "legal_type": "cooperative"
+        "technical_info": {"total_capacity": 100.5},
     }
+
+def test_create_configuration(
+    client: TestClient, superuser_token_headers: Dict[str, str], db: Session
+) -> None:
+    data = configuration_data()
     response = client.post(
         f"{settings.API_V1_STR}/configurations/",
         headers=superuser_token_headers,
@@ -35,8 +38,7 @@ def test_create_configuration(
     assert content["name"] == data["name"]
     assert content["description"] == data["description"]
     assert content["type"] == data["type"]
-    assert content["energy_source"] == data["energy_source"]
-    assert content["capacity"] == data["capacity"]
+    assert content["technical_info"] == data["technical_info"]
     assert content["status"] == "draft"
     assert "id" in content
 
@@ -52,6 +54,7 @@ def test_read_configuration(
     content = response.json()
     assert content["name"] == configuration.name
     assert content["id"] == configuration.id
+    assert set(content) == set(ConfigurationWithStats.model_fields)
 
 def test_read_configurations(
     client: TestClient, superuser_token_headers: Dict[str, str], db: Session
@@ -63,18 +66,18 @@ def test_read_configurations(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) > 0
-    assert any(config["id"] == configuration.id for config in content)
+    assert content["total"] > 0
+    assert any(config["id"] == configuration.id for config in content["items"])
+    # Items are serialized from rows without response_model validation
+    for item in content["items"]:
+        assert set(item) == set(ConfigurationList.model_fields)
+        ConfigurationList(**item)
 
 def test_update_configuration(
     client: TestClient, superuser_token_headers: Dict[str, str], db: Session
 ) -> None:
     configuration = create_random_configuration(db)
-    data = {
-        "name": random_lower_string(),
-        "description": random_lower_string(),
-        "energy_source": "wind"
-    }
+    data = {**configuration_data(), "status": "active"}
     response = client.put(
         f"{settings.API_V1_STR}/configurations/{configuration.id}",
         headers=superuser_token_headers,
@@ -84,7 +87,7 @@ def test_update_configuration(
     content = response.json()
     assert content["name"] == data["name"]
     assert content["description"] == data["description"]
-    assert content["energy_source"] == data["energy_source"]
+    assert content["status"] == "active"
     assert content["id"] == configuration.id
 
 def test_delete_configuration(
@@ -129,10 +132,61 @@ def test_create_configuration_invalid_data(
 def test_update_nonexistent_configuration(
     client: TestClient, superuser_token_headers: Dict[str, str]
 ) -> None:
-    data = {"name": random_lower_string()}
+    data = configuration_data()
     response = client.put(
         f"{settings.API_V1_STR}/configurations/99999",
         headers=superuser_token_headers,
         json=data,
     )
-    assert response.status_code == 404 
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_configuration_writes_require_authentication(client: TestClient, db: Session) -> None:
+    configuration = create_random_configuration(db)
+    url = f"{settings.API_V1_STR}/configurations/{configuration.id}"
+
+    assert client.post(f"{settings.API_V1_STR}/configurations/", json={"name": "test"}).status_code == 401
+    assert client.put(url, json={"name": random_lower_string()}).status_code == 401
+    assert client.delete(url).status_code == 401
+    assert client.get(url).status_code == 200
+    assert crud.configuration.get(db=db, id=configuration.id) is not None
+
+def test_stored_readings_are_streamed_to_subscribers(
+    client: TestClient, superuser_token_headers: Dict[str, str], db: Session
+) -> None:
+    configuration = create_random_configuration(db)
+    url = f"{settings.API_V1_STR}/configurations/{configuration.id}"
+    reading = {"configuration_id": configuration.id, "timestamp": "2024-05-10T12:00:00+00:00", "shared_kwh": 4.5}
+
+    with client.websocket_connect(f"{url}/ws") as websocket:
+        response = client.post(f"{url}/readings", headers=superuser_token_headers, json=[reading])
+        assert response.status_code == 200
+        assert response.json() == {"created": 1}
+        event = websocket.receive_json()
+
+    assert event["type"] == "readings"
+    assert event["configuration_id"] == configuration.id
+    assert [r["shared_kwh"] for r in event["data"]] == [4.5]
+
+def test_read_configurations_query_budget(
+    client: TestClient, superuser_token_headers: Dict[str, str], db: Session, query_budget
+) -> None:
+    for _ in range(5):
+        create_random_configuration(db)
+    # count + page select, regardless of page size
+    with query_budget(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/configurations/",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+
+def test_read_configuration_query_budget(
+    client: TestClient, superuser_token_headers: Dict[str, str], db: Session, query_budget
+) -> None:
+    configuration = create_random_configuration(db)
+    with query_budget(1):
+        response = client.get(
+            f"{settings.API_V1_STR}/configurations/{configuration.id}",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
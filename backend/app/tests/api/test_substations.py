@@ -0,0 +1,22 @@
+from typing import Dict
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+def test_create_substation_requires_a_superuser(
+    client: TestClient, superuser_token_headers: Dict[str, str]
+) -> None:
+    data = {
+        "code": random_lower_string(8),
+        "name": "Cabina primaria",
+        "region": "Lazio",
+        "geometry": {"type": "Polygon", "coordinates": [[[12.4, 41.8], [12.6, 41.8], [12.6, 42.0], [12.4, 41.8]]]},
+    }
+    url = f"{settings.API_V1_STR}/substations/"
+
+    assert client.post(url, json=data).status_code == 401
+    response = client.post(url, headers=superuser_token_headers, json=data)
+    assert response.status_code == 200
+    assert response.json()["code"] == data["code"]
@@ -0,0 +1,50 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import etag_matches
+
+ETAG = '"abc"'
+BODY = b"x" * 4096
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/data")
+    def data(request: Request) -> Response:
+        if etag_matches(request, ETAG):
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return Response(BODY, media_type="application/json", headers={"ETag": ETAG})
+
+    @app.get("/small")
+    def small() -> Response:
+        return Response(b"{}", media_type="application/json")
+
+    return TestClient(app)
+
+def test_compressed_response_has_its_own_etag() -> None:
+    client = make_client()
+    gzipped = client.get("/data", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == '"abc-gzip"'
+    assert gzipped.content == BODY
+
+    identity = client.get("/data", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == ETAG
+
+    revalidated = client.get("/data", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == '"abc-gzip"'
+
+    revalidated = client.get("/data", headers={"Accept-Encoding": "identity", "If-None-Match": ETAG})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == ETAG
+
+def test_identity_responses_vary_on_accept_encoding() -> None:
+    client = make_client()
+    for path, accept_encoding in (("/data", "identity"), ("/small", "gzip"), ("/small", "identity")):
+        response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
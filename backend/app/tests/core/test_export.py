@@ -0,0 +1,11 @@
+from sqlalchemy import select
+
+from app.core.export import export_columns
+from app.models import Configuration, Member
+
+def test_geography_columns_are_not_exported() -> None:
+    for model, coordinates in ((Member, {"latitude", "longitude"}), (Configuration, {"location"})):
+        keys = {column.key for column in select(*export_columns(model.__table__)).selected_columns}
+        assert "geog" not in keys
+        assert coordinates <= keys
+        assert keys == {column.key for column in model.__table__.columns} - {"geog"}
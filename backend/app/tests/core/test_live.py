@@ -0,0 +1,47 @@
+import asyncio
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from app.core.live import Broadcaster, Subscription, broadcaster, channel_for
+from app.services.sweep import SharedTimeseries, run_sweep, scenario_grid
+
+def test_events_reach_every_subscriber_of_a_channel() -> None:
+    async def scenario():
+        broadcaster = Broadcaster()
+        async with broadcaster.subscribe("a") as first, broadcaster.subscribe("a") as second, \
+                broadcaster.subscribe("b") as other:
+            broadcaster.publish("a", b"event")
+            assert await first.get(1) == b"event"
+            assert await second.get(1) == b"event"
+            assert await other.get(0.01) is None
+        assert not broadcaster._subscribers
+
+    asyncio.run(scenario())
+
+def test_slow_subscriber_drops_oldest_events() -> None:
+    async def scenario():
+        subscription = Subscription(maxsize=2)
+        for message in (b"1", b"2", b"3"):
+            subscription.put(message)
+        assert subscription.dropped == 1
+        assert await subscription.get(1) == b"2"
+
+    asyncio.run(scenario())
+
+def test_sweep_progress_reaches_configuration_subscribers() -> None:
+    timestamps = pd.date_range("2021-06-01", periods=48, freq="h")
+    production = np.clip(np.sin((timestamps.hour.to_numpy() - 6) / 12 * np.pi), 0, None)
+
+    async def scenario():
+        async with broadcaster.subscribe(channel_for(7)) as subscription:
+            with SharedTimeseries(timestamps, production, {"residential": np.full(48, 0.3)}) as timeseries:
+                scenarios = scenario_grid(capacity_mwh=[0.5, 1.0], member_mix=[{"residential": 1}, {"residential": 2}])
+                run_sweep(timeseries, scenarios, executor="serial", configuration_id=7)
+            events = [orjson.loads(await subscription.get(1)) for _ in range(2)]
+        assert [event["type"] for event in events] == ["progress", "progress"]
+        assert [event["data"]["completed"] for event in events] == [2, 4]
+        assert events[-1]["data"] == {"task": "sweep", "completed": 4, "total": 4}
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+from app.core.rate_limit import (
+    InMemoryTokenBucketBackend,
+    RateLimiter,
+    password_verification_slot,
+)
+from app.core.config import settings
+
+def test_token_bucket_rejects_after_capacity() -> None:
+    limiter = RateLimiter(InMemoryTokenBucketBackend(), capacity=3, period=60)
+    assert all(limiter.hit("login:ip:1.2.3.4")[0] for _ in range(3))
+    allowed, retry_after = limiter.hit("login:ip:1.2.3.4")
+    assert not allowed
+    assert retry_after >= 1
+
+def test_token_bucket_keys_are_independent() -> None:
+    limiter = RateLimiter(InMemoryTokenBucketBackend(), capacity=1, period=60)
+    assert limiter.hit("login:account:a")[0]
+    assert not limiter.hit("login:account:a")[0]
+    assert limiter.hit("login:account:b")[0]
+
+def test_token_buckets_are_bounded() -> None:
+    backend = InMemoryTokenBucketBackend(max_keys=2)
+    limiter = RateLimiter(backend, capacity=1, period=60)
+    limiter.hit("login:ip:a")
+    limiter.hit("login:ip:b")
+    assert not limiter.hit("login:ip:a")[0]
+    for n in range(100):
+        limiter.hit(f"login:account:{n}")
+    assert len(backend._buckets) == 2
+
+def test_verification_slots_are_bounded() -> None:
+    held = []
+    try:
+        for _ in range(settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS):
+            slot = password_verification_slot(timeout=0)
+            assert slot.__enter__()
+            held.append(slot)
+        with password_verification_slot(timeout=0) as acquired:
+            assert not acquired
+    finally:
+        for slot in held:
+            slot.__exit__(None, None, None)
+    with password_verification_slot(timeout=0) as acquired:
+        assert acquired
@@ -0,0 +1,38 @@
+import time
+
+from app.core.response_cache import InMemoryCacheBackend, ResponseCache
+
+def test_entries_expire_after_ttl() -> None:
+    cache = ResponseCache(InMemoryCacheBackend(), ttl=0.01)
+    cache.set("configurations", "k", '"etag"', b"{}")
+    assert cache.get("configurations", "k") == ('"etag"', b"{}")
+    time.sleep(0.02)
+    assert cache.get("configurations", "k") is None
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = ResponseCache(InMemoryCacheBackend(max_entries=2), ttl=60)
+    cache.set("configurations", "a", '"a"', b"a")
+    cache.set("configurations", "b", '"b"', b"b")
+    cache.get("configurations", "a")
+    cache.set("configurations", "c", '"c"', b"c")
+    assert cache.get("configurations", "a") is not None
+    assert cache.get("configurations", "b") is None
+
+def test_table_writes_invalidate_dependent_namespaces() -> None:
+    cache = ResponseCache(InMemoryCacheBackend(), ttl=60)
+    cache.depends_on("configurations", ("configurations", "members"))
+    cache.depends_on("users", ("app_users",))
+    cache.set("configurations", "k", '"c"', b"c")
+    cache.set("users", "k", '"u"', b"u")
+    cache.invalidate("members")
+    assert cache.get("configurations", "k") is None
+    assert cache.get("users", "k") is not None
+
+def test_response_read_before_a_write_is_not_served_after_it() -> None:
+    cache = ResponseCache(InMemoryCacheBackend(), ttl=60)
+    cache.depends_on("configurations", ("configurations",))
+    generation = cache.generation("configurations")
+    # A write commits between the handler's query and storing its response
+    cache.invalidate("configurations")
+    cache.set("configurations", "k", '"old"', b"old", generation)
+    assert cache.get("configurations", "k") is None
@@ -0,0 +1,80 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.billing import TariffTable, compute_statements
+from app.services.billing_fanout import reduce_totals, shard_configurations
+
+def make_tariff(region, base_rate, valid_from, valid_to=None):
+    return SimpleNamespace(
+        id=None, region=region, base_rate=base_rate, regional_bonus=0.02,
+        capacity_bonus_small=0.05, capacity_bonus_medium=0.03, capacity_bonus_large=0.01,
+        social_bonus=0.04, valid_from=valid_from, valid_to=valid_to,
+    )
+
+def test_lookup_picks_the_tariff_in_force() -> None:
+    tariffs = TariffTable([
+        make_tariff("Lazio", 0.11, datetime(2024, 1, 1), datetime(2025, 1, 1)),
+        make_tariff("Lazio", 0.12, datetime(2025, 1, 1)),
+        make_tariff("Sicilia", 0.15, datetime(2024, 6, 1), datetime(2024, 7, 1)),
+    ])
+
+    rows = tariffs.lookup(
+        ["Lazio", "Lazio", "Sicilia", "Sicilia", "Molise"],
+        np.array(["2024-05-01", "2030-01-01", "2024-06-01", "2024-07-01", "2024-05-01"], dtype="datetime64[ns]"),
+    )
+
+    assert list(tariffs.rates[rows[:3], 0]) == [0.11, 0.12, 0.15]
+    assert list(rows[3:]) == [-1, -1]
+
+def test_tariff_valid_from_mid_period_applies() -> None:
+    tariffs = TariffTable([
+        make_tariff("Lazio", 0.11, datetime(2024, 1, 1), datetime(2024, 5, 10)),
+        make_tariff("Lazio", 0.12, datetime(2024, 5, 10)),
+        make_tariff("Sicilia", 0.15, datetime(2024, 5, 20)),
+        make_tariff("Puglia", 0.13, datetime(2024, 6, 1)),
+    ])
+    start, end = np.datetime64("2024-05-01"), np.datetime64("2024-06-01")
+
+    rows = tariffs.lookup(["Lazio", "Sicilia", "Puglia"], start, end)
+
+    assert list(tariffs.rates[rows[:2], 0]) == [0.12, 0.15]
+    assert rows[2] == -1
+    assert list(tariffs.lookup(["Lazio", "Sicilia"], start)) == [0, -1]
+
+def test_statements_apply_band_and_social_bonuses() -> None:
+    tariffs = TariffTable([make_tariff("Lazio", 0.10, datetime(2024, 1, 1))])
+
+    amounts = compute_statements(
+        tariffs,
+        energy_kwh=np.array([100.0, 100.0, 100.0, 100.0]),
+        regions=np.array(["Lazio", "Lazio", "Lazio", "Molise"]),
+        capacity_kw=np.array([3.0, 20.0, 80.0, 3.0]),
+        social=np.array([True, False, False, False]),
+        at=np.datetime64("2024-05-01"),
+        monthly_fee=np.array([1.0, 0.0, 0.0, 0.0]),
+    )
+
+    assert np.allclose(amounts["total_incentive"], [21.0, 15.0, 13.0, 0.0])
+    expected_net = 21.0 - 3.0 - 21.0 * 0.2 - 21.0 * 0.22 - 1.0
+    assert np.isclose(amounts["net_payment"][0], expected_net)
+    assert list(amounts["tariff_row"] >= 0) == [True, True, True, False]
+
+def test_shards_are_fixed_configuration_ranges() -> None:
+    shards = shard_configurations([3, 1, 250, 99, 100], shard_size=100)
+
+    assert shards == [("configurations 0-99", [1, 3, 99]), ("configurations 100-199", [100]),
+                      ("configurations 200-299", [250])]
+    # A new configuration joins its range without moving the others
+    assert shard_configurations([1, 3, 99, 100, 150, 250], shard_size=100)[1] == ("configurations 100-199", [100, 150])
+
+    results = [
+        {"configurations": len(ids), "written_statements": 0 if i == 0 else 5,
+         "statements": 5, "energy_kwh": 100.0, "total_incentive": 10.0, "total_net_payment": 4.0, "seconds": 0.1}
+        for i, (_, ids) in enumerate(shards)
+    ]
+    totals = reduce_totals(results)
+    assert totals["statements"] == 15 and totals["written_statements"] == 10
+    assert totals["unchanged_shards"] == 1 and totals["configurations"] == 5
+    assert np.isclose(totals["total_incentive"], 30.0)
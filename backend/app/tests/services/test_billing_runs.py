@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.models import BillingStatement, Configuration, EnergyReading, Member, TariffRate
+from app.services.billing import run_incremental_billing
+from app.tests.utils.utils import random_lower_string
+
+PERIOD = "2024-05"
+
+def create_community(db: Session) -> Configuration:
+    region = random_lower_string(12)
+    db.add(TariffRate(region=region, base_rate=0.10, valid_from=datetime(2024, 1, 1)))
+    configuration = Configuration(
+        name=random_lower_string(), type="active", legal_type="association", status="active",
+        address="Via Roma 1", location={"lat": 41.9, "lng": 12.5}, region=region,
+        primary_substation_id="AC001", billing_settings={"monthly_fee": 1.0},
+    )
+    db.add(configuration)
+    db.flush()
+    member = Member(
+        name="Member", address="Via Verdi 1", type="consumer", pod_id=random_lower_string(14),
+        load_profile_type="residential", contracted_power=3.0, configuration_id=configuration.id,
+    )
+    db.add(member)
+    db.flush()
+    db.add(EnergyReading(
+        configuration_id=configuration.id, member_id=member.id,
+        timestamp=datetime(2024, 5, 10, 12, tzinfo=timezone.utc), shared_kwh=100.0,
+    ))
+    db.commit()
+    return configuration
+
+def statement(db: Session, configuration: Configuration) -> BillingStatement:
+    db.expire_all()
+    return db.query(BillingStatement).filter_by(configuration_id=configuration.id, period=PERIOD).one()
+
+def test_configuration_edit_is_billed_again(db: Session) -> None:
+    configuration = create_community(db)
+    run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+    assert statement(db, configuration).fees == 1.0
+
+    (unchanged,) = run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+    assert unchanged.written_statements == 0
+
+    configuration.billing_settings = {"monthly_fee": 2.5}
+    db.commit()
+    (run,) = run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+
+    assert run.written_statements == 1
+    assert statement(db, configuration).fees == 2.5
+
+def test_reading_correction_is_billed_again(db: Session) -> None:
+    configuration = create_community(db)
+    run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+    assert statement(db, configuration).energy_shared == 100.0
+
+    reading = db.query(EnergyReading).filter_by(configuration_id=configuration.id).one()
+    reading.shared_kwh = 80.0
+    db.commit()
+    run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+    assert statement(db, configuration).energy_shared == 80.0
+
+    # Without readings the member still has a (zero) statement
+    db.delete(reading)
+    db.commit()
+    run_incremental_billing(db, periods=[PERIOD], configuration_ids=[configuration.id])
+    assert statement(db, configuration).energy_shared == 0.0
@@ -0,0 +1,56 @@
+import numpy as np
+
+from app.services.dispatch import BatteryFleet, community_flows, greedy_dispatch, optimize_dispatch, shared_energy
+
+def make_day():
+    # One producer with a midday surplus, one consumer with an evening peak
+    production = np.zeros((2, 24))
+    production[0, 10:14] = 5.0
+    consumption = np.zeros((2, 24))
+    consumption[1, 10:14] = 1.0
+    consumption[1, 18:22] = 3.0
+    return production, consumption
+
+def test_battery_shifts_surplus_to_evening() -> None:
+    production, consumption = make_day()
+    fleet = BatteryFleet(capacity_kwh=20.0, power_kw=5.0, min_soc=0.1)
+    baseline = shared_energy(*community_flows(production, consumption)).sum()
+
+    result = optimize_dispatch(production, consumption, fleet, incentive=0.11)
+
+    assert baseline == 4.0
+    assert result.shared_kwh.sum() > 12.0
+    assert np.allclose(result.shared_kwh, np.minimum(result.injection_kwh, result.withdrawal_kwh), atol=1e-6)
+    assert (result.soc_kwh >= 2.0 - 1e-6).all() and (result.soc_kwh <= 20.0 + 1e-6).all()
+    assert np.isclose(result.incentive_eur, 0.11 * result.shared_kwh.sum())
+
+def test_rolling_horizon_matches_single_window_with_full_lookahead() -> None:
+    production, consumption = make_day()
+    fleet = BatteryFleet(capacity_kwh=20.0, power_kw=5.0)
+
+    single = optimize_dispatch(production, consumption, fleet, incentive=0.11)
+    rolled = optimize_dispatch(production, consumption, fleet, incentive=0.11, horizon_steps=24, commit_steps=6)
+
+    assert len(rolled.windows) == 4
+    assert np.isclose(rolled.shared_kwh.sum(), single.shared_kwh.sum(), atol=1e-6)
+
+def test_cbc_rolling_windows_match_highs() -> None:
+    production, consumption = make_day()
+    fleet = BatteryFleet(capacity_kwh=20.0, power_kw=5.0)
+
+    highs = optimize_dispatch(production, consumption, fleet, incentive=0.11, horizon_steps=12, commit_steps=6)
+    cbc = optimize_dispatch(
+        production, consumption, fleet, incentive=0.11, horizon_steps=12, commit_steps=6, solver="cbc",
+        exclusive_modes=True,
+    )
+
+    assert [w.status for w in cbc.windows] == ["optimal"] * 4
+    assert np.isclose(cbc.shared_kwh.sum(), highs.shared_kwh.sum(), atol=1e-6)
+    assert (cbc.charge_kwh * cbc.discharge_kwh < 1e-9).all()
+
+def test_greedy_dispatch_of_a_single_battery_and_series() -> None:
+    production, consumption = make_day()
+    charge, discharge, soc = greedy_dispatch(production.sum(axis=0), consumption.sum(axis=0), 20.0, loss=0.0)
+
+    assert charge.shape == discharge.shape == soc.shape == (24,)
+    assert np.isclose(charge.sum(), 16.0) and np.isclose(discharge.sum(), 12.0)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.services.monte_carlo import combine, simulate
+
+def make_day(days: int = 3):
+    hours = np.tile(np.arange(24), days)
+    production = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None) * 0.5
+    return production, hours, np.repeat(np.arange(days), 24)
+
+def test_results_depend_on_seed_not_chunk_size() -> None:
+    production, hours, _ = make_day()
+
+    chunked = simulate(production, hours, realizations=50, seed=3, chunk_size=7)
+    whole = simulate(production, hours, realizations=50, seed=3, chunk_size=50)
+
+    assert np.allclose(chunked.shared_mwh, whole.shared_mwh)
+    assert np.allclose(chunked.consumption_mwh, whole.consumption_mwh)
+
+def test_bands_are_ordered_per_metric_and_period() -> None:
+    production, hours, days = make_day()
+
+    result = simulate(production, hours, realizations=200, seed=1, periods=days)
+    bands = result.bands()
+    daily = result.period_bands()
+
+    assert list(bands.columns) == ["P10", "P50", "P90"]
+    assert (bands["P10"] <= bands["P50"]).all() and (bands["P50"] <= bands["P90"]).all()
+    assert np.allclose(bands.loc["incentive_eur"], bands.loc["shared_mwh"] * 110.0)
+    assert list(daily.index) == [0, 1, 2]
+    assert np.isclose(result.period_shared_mwh.sum(axis=1), result.shared_mwh).all()
+
+def test_combined_plants_add_up_per_realization_and_period() -> None:
+    production, hours, days = make_day()
+    first = simulate(production, hours, realizations=100, seed=1, periods=days)
+    second = simulate(production[24:], hours[24:], realizations=100, seed=2, periods=days[24:])
+
+    total = combine([first, second])
+
+    assert np.allclose(total.shared_mwh, first.shared_mwh + second.shared_mwh)
+    assert list(total.period_labels) == [0, 1, 2]
+    assert np.allclose(total.period_shared_mwh[:, 0], first.period_shared_mwh[:, 0])
+    assert np.allclose(total.period_shared_mwh[:, 1:], first.period_shared_mwh[:, 1:] + second.period_shared_mwh)
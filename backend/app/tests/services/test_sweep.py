@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from app.services.sweep import SharedTimeseries, run_scenarios, run_sweep, scenario_grid
+
+def make_timeseries() -> SharedTimeseries:
+    timestamps = pd.date_range("2021-12-25", "2022-01-05", freq="h")
+    hours = timestamps.hour.to_numpy()
+    production = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None)
+    profiles = {
+        "residential": np.where((hours >= 18) & (hours <= 22), 0.004, 0.001),
+        "commercial": np.where((hours >= 9) & (hours <= 18), 0.02, 0.004),
+    }
+    return SharedTimeseries(timestamps, production, profiles)
+
+def test_sweep_returns_one_row_per_scenario_in_order() -> None:
+    scenarios = scenario_grid(
+        capacity_mwh=[0.0, 1.0],
+        loss=[0.02],
+        member_mix=[{"residential": 100}, {"residential": 50, "commercial": 5}],
+        year=[2021, 2022],
+    )
+    with make_timeseries() as timeseries:
+        serial = run_sweep(timeseries, scenarios, executor="serial")
+        pooled = run_sweep(timeseries, scenarios, executor="process", workers=2)
+        alone = run_scenarios(timeseries.spec, [scenarios[-1]])[0]
+
+    assert len(serial) == len(scenarios)
+    assert list(serial["members_commercial"]) == [0, 0, 5, 5] * 2
+    pd.testing.assert_frame_equal(serial.drop(columns="seconds"), pooled.drop(columns="seconds"))
+    assert np.isclose(serial["shared_mwh"].iloc[-1], alone["shared_mwh"])
+    with_battery = serial[serial["capacity_mwh"] > 0]
+    assert (with_battery["incentive_gain_eur"] > 0).all()
+    assert np.allclose(serial.loc[serial["capacity_mwh"] == 0, "incentive_gain_eur"], 0)
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from app.services.tariff_bands import F1, F2, F3, classify, easter_sunday
+
+def test_bands_follow_weekdays_and_holidays() -> None:
+    times = np.array([
+        "2024-04-02T10:00",  # Tuesday
+        "2024-04-02T07:30",
+        "2024-04-02T19:00",
+        "2024-04-02T23:15",
+        "2024-04-06T10:00",  # Saturday
+        "2024-04-07T10:00",  # Sunday
+        "2024-04-01T10:00",  # Easter Monday
+        "2024-12-25T10:00",
+        "1990-05-02T10:00",  # Outside the precomputed years
+        "NaT",
+    ], dtype="datetime64[ns]")
+
+    assert classify(times).tolist() == [F1, F2, F2, F3, F2, F3, F3, F3, F1, 0]
+    assert easter_sunday(2025).isoformat() == "2025-04-20"
+
+def test_utc_and_aware_timestamps_use_italian_time() -> None:
+    # 06:30 UTC is 08:30 in summer (CEST) but 07:30 in winter (CET)
+    utc = np.array(["2024-07-02T06:30", "2024-01-02T06:30"], dtype="datetime64[ns]")
+
+    assert classify(utc, utc=True).tolist() == [F1, F2]
+    aware = pd.DatetimeIndex(utc).tz_localize("UTC").tz_convert("America/New_York")
+    assert classify(aware).tolist() == [F1, F2]
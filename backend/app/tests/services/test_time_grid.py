@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from app.services.time_grid import align_energy, align_steps, time_grid, to_utc
+
+def test_grid_follows_daylight_saving_time() -> None:
+    spring = time_grid("2024-03-31", "2024-04-01")
+    autumn = time_grid("2024-10-27", "2024-10-28", "hourly")
+
+    assert len(spring) == 92
+    assert len(autumn) == 25
+    assert str(spring.local[8]) == "2024-03-31T03:00:00.000000000"
+    assert time_grid("2024-03-31", "2024-04-01") is spring
+
+def test_energy_is_conserved_across_intervals() -> None:
+    grid = time_grid("2024-10-27", "2024-10-28", "hourly")
+    # Local meter data, with the repeated 02:00-03:00 hour
+    quarters = pd.date_range("2024-10-27", "2024-10-28", freq="15min", tz="Europe/Rome", inclusive="left")
+    readings = np.ones(len(quarters))
+
+    hourly = align_energy(to_utc(quarters.tz_localize(None)), readings, grid)
+    spread = align_energy(grid.utc, hourly, time_grid("2024-10-27", "2024-10-28"))
+
+    assert np.allclose(hourly, 4.0)
+    assert np.allclose(spread, 1.0) and len(spread) == 100
+
+def test_steps_take_the_value_in_force() -> None:
+    grid = time_grid("2024-03-31", "2024-04-01", "hourly")
+    changes = to_utc(["2024-03-31 08:00", "2024-03-31 19:00"])
+
+    bands = align_steps(changes, [1, 2], grid, fill=3)
+
+    assert list(bands[:7]) == [3] * 7
+    assert bands[7] == 1 and bands[-1] == 2
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.lazy import HEAVY_MODULES
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Budgets are generous on purpose: they catch regressions such as DB access or
+# heavy imports on the startup path, not scheduler noise.
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "5.0"))
+FIRST_REQUEST_BUDGET_SECONDS = float(os.getenv("STARTUP_FIRST_REQUEST_BUDGET_SECONDS", "1.0"))
+IMPORTTIME_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORTTIME_BUDGET_SECONDS", "3.0"))
+
+# Runs in a fresh interpreter so module caches from the test session do not
+# hide the real cold-start cost.
+STARTUP_PROBE = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    response = client.get("/")
+    served = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "first_request_seconds": served - ready,
+    "status": response.status_code,
+}))
+"""
+
+def test_startup_time(record_property) -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+
+    record_property("startup_import_seconds", round(timings["import_seconds"], 3))
+    record_property("startup_first_request_seconds", round(timings["first_request_seconds"], 3))
+
+    assert timings["status"] == 200
+    assert timings["import_seconds"] < IMPORT_BUDGET_SECONDS
+    assert timings["first_request_seconds"] < FIRST_REQUEST_BUDGET_SECONDS
+
+def test_app_import_path_avoids_heavy_dependencies(record_property) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+    # Lines look like "import time:  self [us] | cumulative | module"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        cumulative[module] = int(cumulative_us)
+
+    heavy = sorted({module.split(".")[0] for module in cumulative} & set(HEAVY_MODULES))
+    assert not heavy, f"app.main imports heavy dependencies: {heavy}"
+
+    import_seconds = cumulative["app.main"] / 1e6
+    record_property("startup_importtime_app_main_seconds", round(import_seconds, 3))
+    assert import_seconds < IMPORTTIME_BUDGET_SECONDS
@@ -21,6 +21,7 @@ def create_random_configuration(db: Session) -> models.Configuration:
         region="Test Region",
         primary_substation_id="SUB123",
         legal_type="cooperative",
+        status="draft",
         features={},
         restrictions={},
         technical_info={},
@@ -5,12 +5,17 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.append(str(backend_dir))
 
-from app.database import SessionLocal
+from app.db.session import SessionLocal
 from app.models.billing import TariffRate
-from datetime import datetime, timedelta
+from datetime import datetime
 
 db = SessionLocal()
 
+# Valid from the start of last year, so the months billed by
+# generate_sample_statements.py are covered, until the end of next year
+VALID_FROM = datetime(datetime.utcnow().year - 1, 1, 1)
+VALID_TO = datetime(datetime.utcnow().year + 2, 1, 1)
+
 # Regional tariff configurations based on GSE's 20-year incentive tables
 # and ARERA's latest deliberations (585/2024)
 tariffs = [
@@ -23,8 +28,8 @@ tariffs = [
         'capacity_bonus_medium': 0.03,  # 10-50kW installations
         'capacity_bonus_large': 0.02,  # >50kW installations
         'social_bonus': 0.03,  # Support for vulnerable households
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)  # 1-year validity
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     },
     {
         'region': 'Piemonte',
@@ -34,8 +39,8 @@ tariffs = [
         'capacity_bonus_medium': 0.035,
         'capacity_bonus_large': 0.025,
         'social_bonus': 0.035,
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     },
     # Central Italy
     {
@@ -46,8 +51,8 @@ tariffs = [
         'capacity_bonus_medium': 0.03,
         'capacity_bonus_large': 0.02,
         'social_bonus': 0.04,
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     },
     # Southern Italy (higher incentives as per Decree 199/2021)
     {
@@ -58,8 +63,8 @@ tariffs = [
         'capacity_bonus_medium': 0.04,
         'capacity_bonus_large': 0.03,
         'social_bonus': 0.045,
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     },
     # Islands (highest incentives due to grid costs)
     {
@@ -70,8 +75,8 @@ tariffs = [
         'capacity_bonus_medium': 0.05,
         'capacity_bonus_large': 0.04,
         'social_bonus': 0.05,
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     },
     {
         'region': 'Sardegna',
@@ -81,8 +86,8 @@ tariffs = [
         'capacity_bonus_medium': 0.055,
         'capacity_bonus_large': 0.045,
         'social_bonus': 0.055,
-        'valid_from': datetime.utcnow(),
-        'valid_to': datetime.utcnow() + timedelta(days=365)
+        'valid_from': VALID_FROM,
+        'valid_to': VALID_TO
     }
 ]
 
@@ -0,0 +1,99 @@
+"""
+Time one monthly billing pass for a synthetic population: tariff lookup and
+statement amounts for every member, then the batched upsert (into SQLite
+in memory, so the numbers exclude network round-trips):
+
+    python scripts/benchmark_billing.py --members 100000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.models.billing import BillingStatement
+from app.services.billing import TariffTable, compute_statements, period_bounds, statement_rows
+
+REGIONS = ["Lombardia", "Piemonte", "Lazio", "Puglia", "Sicilia", "Sardegna", "Molise"]
+
+def make_tariffs():
+    tariffs = []
+    for n, region in enumerate(REGIONS[:-1]):  # Molise has no tariff
+        for year in (2023, 2024, 2025):
+            tariffs.append(SimpleNamespace(
+                id=len(tariffs) + 1, region=region, base_rate=0.10 + 0.01 * n, regional_bonus=0.02,
+                capacity_bonus_small=0.05, capacity_bonus_medium=0.03, capacity_bonus_large=0.02, social_bonus=0.03,
+                valid_from=datetime(year, 1, 1), valid_to=datetime(year + 1, 1, 1),
+            ))
+    return TariffTable(tariffs)
+
+def make_members(count, configurations, seed=0):
+    rng = np.random.default_rng(seed)
+    configuration_id = rng.integers(1, configurations + 1, count)
+    return pd.DataFrame({
+        "member_id": np.arange(1, count + 1),
+        "configuration_id": configuration_id,
+        "region": np.array(REGIONS, dtype=object)[configuration_id % len(REGIONS)],
+        "contracted_power": rng.choice([3.0, 6.0, 15.0, 60.0], count),
+        "social": rng.random(count) < 0.1,
+        "energy_kwh": rng.uniform(50, 1000, count),
+        "community_fund_share": 0.2,
+        "monthly_fee": np.where(configuration_id % 2 == 0, 1.5, 0.0),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--configurations", type=int, default=1_000)
+    parser.add_argument("--period", default="2024-05")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    tariffs = make_tariffs()
+    members = make_members(args.members, args.configurations)
+    start, end = period_bounds(args.period)
+
+    began = time.perf_counter()
+    amounts = compute_statements(
+        tariffs,
+        energy_kwh=members["energy_kwh"].to_numpy(),
+        regions=members["region"].to_numpy(),
+        capacity_kw=members["contracted_power"].to_numpy(),
+        social=members["social"].to_numpy(),
+        at=start,
+        until=end,
+        community_fund_share=members["community_fund_share"].to_numpy(),
+        monthly_fee=members["monthly_fee"].to_numpy(),
+    )
+    computed = time.perf_counter()
+    rows = statement_rows(args.period, members, amounts, tariffs)
+    built = time.perf_counter()
+
+    engine = create_engine("sqlite://")
+    BillingStatement.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    for offset in range(0, len(rows), args.batch_size):
+        crud.billing_statement.bulk_upsert(db, statements=rows[offset:offset + args.batch_size])
+    stored = time.perf_counter()
+
+    print(f"{args.members:,} members, {len(rows):,} statements "
+          f"({args.members - len(rows):,} without tariff)")
+    print(f"  compute amounts: {(computed - began) * 1000:8.1f} ms")
+    print(f"  build rows:      {(built - computed) * 1000:8.1f} ms")
+    print(f"  upsert:          {(stored - built) * 1000:8.1f} ms")
+    print(f"  total incentive: {amounts['total_incentive'][amounts['tariff_row'] >= 0].sum():,.2f} EUR")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Sharded billing on a synthetic dataset of 1,000 configurations: builds the
+members, daily readings and tariffs in a scratch database, bills a period
+shard by shard, bills it again (nothing written), then adds readings to a
+few configurations and a member to another, and bills once more (only
+their statements are written, and no shard moves). Shard times are also
+packed onto N workers to show the wall time of the Celery fan-out:
+
+    python scripts/benchmark_billing_shards.py --configurations 1000
+
+By default the database is a SQLite file; pass --database-url for a scratch
+PostgreSQL database. With --executor celery the shards go to the `cer`
+queue, and the workers must use the same database.
+"""
+import argparse
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.types import Geography
+from app.models import Configuration, EnergyReading, Member, TariffRate
+from app.services.billing_fanout import configuration_ids_to_bill, run_sharded_billing, shard_configurations
+
+REGIONS = ["Lombardia", "Piemonte", "Lazio", "Puglia", "Sicilia", "Sardegna", "Molise"]
+
+@compiles(Geography, "sqlite")
+def _geography_sqlite(type_, compiler, **kw):
+    # Geography columns stay empty here; SQLite only needs a column type
+    return "TEXT"
+
+def populate(db, *, configurations: int, mean_members: int, period_start: datetime, days: int, seed: int = 0) -> int:
+    rng = np.random.default_rng(seed)
+    db.execute(insert(TariffRate), [
+        {
+            "region": region, "base_rate": 0.10 + 0.01 * n, "regional_bonus": 0.02, "capacity_bonus_small": 0.05,
+            "capacity_bonus_medium": 0.03, "capacity_bonus_large": 0.02, "social_bonus": 0.03,
+            "valid_from": datetime(2020, 1, 1),
+        }
+        for n, region in enumerate(REGIONS[:-1])  # Molise has no tariff
+    ])
+    db.execute(insert(Configuration), [
+        {
+            "id": i, "name": f"CER {i}", "type": "active", "legal_type": "association", "status": "active",
+            "address": f"Via Roma {i}", "location": {"lat": 41.9, "lng": 12.5}, "region": REGIONS[i % len(REGIONS)],
+            "primary_substation_id": f"AC{i:03d}", "billing_settings": {"monthly_fee": 1.5} if i % 2 else None,
+        }
+        for i in range(1, configurations + 1)
+    ])
+    sizes = rng.integers(mean_members // 4, mean_members * 7 // 4 + 1, configurations)
+    configuration_ids = np.repeat(np.arange(1, configurations + 1), sizes)
+    db.execute(insert(Member), [
+        {
+            "id": i + 1, "name": f"Member {i + 1}", "address": "Via Verdi 1", "type": "consumer",
+            "pod_id": f"IT001E{i + 1:08d}", "load_profile_type": "residential",
+            "contracted_power": float(power), "configuration_id": int(configuration_id),
+            "billing_preferences": {"social_bonus": bool(social)},
+        }
+        for i, (configuration_id, power, social) in enumerate(zip(
+            configuration_ids, rng.choice([3.0, 6.0, 15.0, 60.0], len(configuration_ids)), rng.random(len(configuration_ids)) < 0.1
+        ))
+    ])
+    add_readings(db, member_ids=np.arange(1, len(configuration_ids) + 1), configuration_ids=configuration_ids,
+                 period_start=period_start, days=days, rng=rng)
+    db.commit()
+    return len(configuration_ids)
+
+def add_readings(db, *, member_ids, configuration_ids, period_start: datetime, days: int, rng) -> None:
+    """One reading per member per day, inserted in batches."""
+    shared = rng.uniform(1, 30, (len(member_ids), days))
+    for day in range(days):
+        timestamp = period_start + timedelta(days=day, hours=12)
+        db.execute(insert(EnergyReading), [
+            {"configuration_id": int(c), "member_id": int(m), "timestamp": timestamp, "shared_kwh": float(kwh)}
+            for m, c, kwh in zip(member_ids, configuration_ids, shared[:, day])
+        ])
+
+def wall_time(seconds, workers: int) -> float:
+    """Makespan of the shards on `workers` workers, longest first."""
+    loads = [0.0] * workers
+    for duration in sorted(seconds, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+def report(label: str, totals, elapsed: float) -> None:
+    print(f"{label}: {elapsed:.2f} s, {totals['shards']} shards ({totals['unchanged_shards']} unchanged), "
+          f"{totals['written_statements']:,} statements written, {totals['statements']:,} stored, "
+          f"incentive {totals['total_incentive']:,.2f} EUR")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configurations", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=20, help="Mean members per configuration")
+    parser.add_argument("--shard-size", type=int, default=100, help="Configuration ids per shard")
+    parser.add_argument("--period", default="2024-05")
+    parser.add_argument("--changed", type=int, default=10, help="Configurations that receive new readings")
+    parser.add_argument("--database-url")
+    parser.add_argument("--executor", choices=["serial", "celery"], default="serial")
+    args = parser.parse_args()
+
+    directory = None
+    url = args.database_url
+    if url is None:
+        directory = tempfile.mkdtemp(prefix="billing-bench-")
+        url = f"sqlite:///{os.path.join(directory, 'billing.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    year, month = map(int, args.period.split("-"))
+    period_start = datetime(year, month, 1, tzinfo=timezone.utc)
+    began = time.perf_counter()
+    members = populate(db, configurations=args.configurations, mean_members=args.members, period_start=period_start, days=28)
+    print(f"{args.configurations:,} configurations, {members:,} members, {members * 28:,} readings "
+          f"({time.perf_counter() - began:.1f} s to build)")
+    shards = shard_configurations(configuration_ids_to_bill(db), args.shard_size)
+    print(f"{len(shards)} shards of {args.shard_size:,} configuration ids")
+
+    def bill(label):
+        began = time.perf_counter()
+        totals = run_sharded_billing(db, period=args.period, shard_size=args.shard_size, executor=args.executor)
+        report(label, totals, time.perf_counter() - began)
+        return totals
+
+    first = bill("first run")
+    for workers in (1, 4, 16):
+        print(f"  on {workers:2d} workers: {wall_time(first['shard_seconds'], workers):.2f} s")
+    bill("unchanged")
+
+    # Readings arrive for a few configurations, spread over the shards
+    changed = np.linspace(1, args.configurations, args.changed, dtype=int)
+    rows = db.query(Member.id, Member.configuration_id).filter(Member.configuration_id.in_(changed.tolist())).all()
+    add_readings(db, member_ids=[r[0] for r in rows], configuration_ids=[r[1] for r in rows],
+                 period_start=period_start + timedelta(days=28), days=1, rng=np.random.default_rng(1))
+    # A member joins the first configuration: its shard gains a statement, no shard moves
+    db.add(Member(
+        name="New member", address="Via Verdi 2", type="consumer", pod_id="IT001E99999999",
+        load_profile_type="residential", contracted_power=3.0, configuration_id=1,
+    ))
+    db.commit()
+    bill(f"{args.changed} configurations changed, 1 member joined")
+    db.close()
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
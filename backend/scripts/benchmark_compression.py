@@ -0,0 +1,67 @@
+"""
+Measure bytes on wire and latency of a 1,000-item configuration page with
+and without response compression, and with precompressed cached bodies:
+
+    python scripts/benchmark_compression.py --rows 1000 --requests 200
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.configurations import serialize_rows
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import make_etag
+from scripts.benchmark_configuration_serialization import make_rows
+
+def build_app(rows, cache_max_bytes):
+    app = FastAPI()
+    payload = {"items": serialize_rows(rows), "total": len(rows), "total_pages": 1, "page": 0, "size": len(rows)}
+    etag = make_etag("benchmark", len(rows))
+
+    @app.get("/configurations/")
+    def page():
+        return ORJSONResponse(payload, headers={"ETag": etag})
+
+    app.add_middleware(CompressionMiddleware, cache_max_bytes=cache_max_bytes)
+    return app
+
+def measure(name, client, accept_encoding, n):
+    latencies = []
+    wire = 0
+    for _ in range(n):
+        start = time.perf_counter()
+        response = client.get("/configurations/", headers={"Accept-Encoding": accept_encoding})
+        latencies.append(time.perf_counter() - start)
+        wire = int(response.headers.get("content-length", len(response.content)))
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:>22}: {wire:>10,} bytes  p50 {statistics.median(latencies) * 1000:6.2f} ms  p95 {p95 * 1000:6.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    uncached = TestClient(build_app(rows, cache_max_bytes=0))
+    cached = TestClient(build_app(rows, cache_max_bytes=64 << 20))
+
+    measure("identity", uncached, "identity", args.requests)
+    measure("gzip", uncached, "gzip", args.requests)
+    measure("br", uncached, "br", args.requests)
+    measure("gzip (cached bytes)", cached, "gzip", args.requests)
+    measure("br (cached bytes)", cached, "br", args.requests)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the old and new serialization paths of GET /configurations on a
+synthetic page of rows, without a database:
+
+    python scripts/benchmark_configuration_serialization.py --rows 10000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.api.v1.endpoints.configurations import LIST_FIELDS, serialize_rows
+from app.schemas import configuration as schemas
+
+def make_rows(n):
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            i, f"Configuration {i}", "Sample community", "CER", "cooperative", "active",
+            f"Via Roma {i}, Milano", {"lat": 45.46, "lng": 9.19}, "Lombardia",
+            True, now, now, i % 50,
+        )
+        for i in range(n)
+    ]
+
+def legacy(rows, limit):
+    # Per-row model, response model re-validation, jsonable_encoder, json.dumps
+    items = [schemas.ConfigurationList(**dict(zip(LIST_FIELDS, row))) for row in rows]
+    payload = {"items": items, "total": len(rows), "total_pages": 1, "page": 0, "size": limit}
+    validated = schemas.ConfigurationResponse.model_validate(
+        {**payload, "items": [item.model_dump() for item in items]}
+    )
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+def fast(rows, limit):
+    return orjson.dumps(
+        {"items": serialize_rows(rows), "total": len(rows), "total_pages": 1, "page": 0, "size": limit}
+    )
+
+def bench(name, fn, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows, len(rows))
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>8}: {best * 1000:8.1f} ms  {len(rows) / best:12,.0f} rows/s  {len(body):,} bytes")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    slow = bench("legacy", legacy, rows, args.repeat)
+    quick = bench("orjson", fast, rows, args.repeat)
+    print(f"speedup: {slow / quick:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Solve a synthetic community's battery dispatch for one day of 15-minute
+steps, as a single window and rolled, with each available solver:
+
+    python scripts/benchmark_dispatch.py --members 500 --batteries 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.dispatch import BatteryFleet, community_flows, optimize_dispatch, shared_energy
+
+def make_community(members, batteries, steps, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(steps) * 24 / steps
+    solar = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None)
+    producers = rng.random(members) < 0.4
+    production = np.outer(rng.uniform(0, 3, members) * producers, solar) * 24 / steps
+    evening = 1 + 0.5 * np.sin((hours - 17.5) / 24 * 2 * np.pi)
+    consumption = rng.uniform(0.2, 1.0, (members, 1)) * evening * 24 / steps
+    fleet = BatteryFleet(capacity_kwh=rng.uniform(5, 20, batteries), power_kw=5.0)
+    return production, consumption, fleet
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--batteries", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=96)
+    parser.add_argument("--incentive", type=float, default=0.11, help="EUR per shared kWh")
+    parser.add_argument("--exclusive-modes", action="store_true", help="Solve as a MILP with charge/discharge binaries")
+    args = parser.parse_args()
+
+    production, consumption, fleet = make_community(args.members, args.batteries, args.steps)
+    step_hours = 24 / args.steps
+    injection, withdrawal = community_flows(production, consumption)
+    baseline = float(shared_energy(injection, withdrawal).sum() * args.incentive)
+    print(f"{args.members} members, {args.batteries} batteries, {args.steps} steps; "
+          f"incentive without storage {baseline:,.2f} EUR")
+
+    quarter = args.steps // 4
+    for solver in ("highs", "cbc"):
+        for label, horizon, commit in (("single window", None, None), ("rolling", args.steps // 2, quarter)):
+            start = time.perf_counter()
+            result = optimize_dispatch(
+                production, consumption, fleet,
+                incentive=args.incentive, step_hours=step_hours,
+                horizon_steps=horizon, commit_steps=commit,
+                solver=solver, exclusive_modes=args.exclusive_modes,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{solver:>6} {label:>14}: {elapsed:6.2f} s total, {result.solve_seconds:6.2f} s in "
+                  f"{len(result.windows)} window(s), incentive {result.incentive_eur:,.2f} EUR")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput of the F1/F2/F3 band classifier on random timestamps over ten
+years, for naive (Italian wall clock) and UTC input, against the same
+classification written with pandas datetime accessors:
+
+    python scripts/benchmark_tariff_bands.py --timestamps 20000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.tariff_bands import classify, holidays
+
+def classify_pandas(times: np.ndarray) -> np.ndarray:
+    index = pd.DatetimeIndex(times)
+    hour, weekday = index.hour, index.weekday
+    holiday_days = [d for year in np.unique(index.year) for d in holidays(year)]
+    sunday = (weekday == 6) | np.isin(index.normalize(), pd.DatetimeIndex(holiday_days))
+    working = np.where((hour >= 8) & (hour < 19), 1, np.where((hour == 7) | ((hour >= 19) & (hour < 23)), 2, 3))
+    saturday = np.where((hour >= 7) & (hour < 23), 2, 3)
+    return np.where(sunday, 3, np.where(weekday == 5, saturday, working)).astype(np.uint8)
+
+def rate(count: int, seconds: float) -> str:
+    return f"{seconds * 1000:8.1f} ms  {count / seconds / 1e6:7.1f} M timestamps/s"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timestamps", type=int, default=20_000_000)
+    parser.add_argument("--reference", type=int, default=1_000_000, help="Timestamps for the pandas version")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(0, 10 * 365 * 86400, args.timestamps)
+    times = np.datetime64("2020-01-01", "ns") + seconds * np.timedelta64(1, "s")
+    began = time.perf_counter()
+    classify(times[:1])
+    classify(times[:1], utc=True)
+    print(f"{args.timestamps:,} timestamps; tables built in {(time.perf_counter() - began) * 1000:.1f} ms")
+
+    for label, utc in (("local", False), ("utc", True)):
+        began = time.perf_counter()
+        classify(times, utc=utc)
+        print(f"  {label:8s}{rate(args.timestamps, time.perf_counter() - began)}")
+
+    sample = times[:args.reference]
+    began = time.perf_counter()
+    expected = classify_pandas(sample)
+    print(f"  {'pandas':8s}{rate(len(sample), time.perf_counter() - began)}")
+    assert (classify(sample) == expected).all()
+
+if __name__ == "__main__":
+    main()
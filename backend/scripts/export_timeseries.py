@@ -0,0 +1,51 @@
+"""
+Export a configuration's energy time series to Parquet or an Arrow IPC file:
+
+    python scripts/export_timeseries.py 12 readings.parquet \\
+        --member-id 40 --columns produced_kwh,consumed_kwh \\
+        --start 2024-01-01 --end 2024-02-01
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from app import crud
+from app.core.export import stream_arrow_ipc, write_parquet
+from app.db.session import SessionLocal
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("configuration_id", type=int)
+    parser.add_argument("output", type=Path, help="Output file; .parquet, or .arrow for an IPC stream")
+    parser.add_argument("--member-id", type=int)
+    parser.add_argument("--columns", help="Comma-separated value columns to include")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Inclusive start (ISO 8601)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Exclusive end (ISO 8601)")
+    parser.add_argument("--source", choices=["meter", "simulation"])
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    statement = crud.energy_reading.timeseries_query(
+        configuration_id=args.configuration_id,
+        member_id=args.member_id,
+        columns=args.columns.split(",") if args.columns else None,
+        start=args.start,
+        end=args.end,
+        source=args.source,
+    )
+
+    if args.output.suffix == ".parquet":
+        write_parquet(SessionLocal, statement, str(args.output), args.batch_size)
+    else:
+        with open(args.output, "wb") as f:
+            for chunk in stream_arrow_ipc(SessionLocal, statement, args.batch_size):
+                f.write(chunk)
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
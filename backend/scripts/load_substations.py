@@ -0,0 +1,72 @@
+"""
+Load primary substation areas from GeoJSON or a shapefile, replacing
+existing substations with the same code:
+
+    python scripts/load_substations.py cabine_primarie.geojson --code-property COD_CP
+    python scripts/load_substations.py cabine_primarie.shp --code-property COD_CP --srid 32632
+
+Shapefiles are read with pyshp; their .prj is not read, so pass
+--srid when the data is not in WGS 84.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+from app import crud
+from app.db.session import SessionLocal
+from app.db.types import WGS84
+
+def read_features(path: Path):
+    """(properties, GeoJSON geometry) pairs from a GeoJSON file or shapefile."""
+    if path.suffix.lower() == ".shp":
+        import shapefile
+
+        with shapefile.Reader(str(path)) as reader:
+            for record in reader.iterShapeRecords():
+                yield record.record.as_dict(), record.shape.__geo_interface__
+    else:
+        with open(path) as f:
+            collection = json.load(f)
+        for feature in collection["features"]:
+            yield feature.get("properties") or {}, feature["geometry"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help=".geojson/.json or .shp file")
+    parser.add_argument("--code-property", default="code")
+    parser.add_argument("--name-property", default="name")
+    parser.add_argument("--region-property", default="region")
+    parser.add_argument("--distributor-property", default="distributor")
+    parser.add_argument("--srid", type=int, default=WGS84, help="SRID of the input coordinates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    loaded = 0
+    batch = []
+    try:
+        for properties, geometry in read_features(args.path):
+            if geometry is None or properties.get(args.code_property) is None:
+                continue
+            batch.append({
+                "code": properties[args.code_property],
+                "name": properties.get(args.name_property),
+                "region": properties.get(args.region_property),
+                "distributor": properties.get(args.distributor_property),
+                "geometry": geometry,
+            })
+            if len(batch) >= args.batch_size:
+                loaded += crud.substation.upsert_many(db, substations=batch, srid=args.srid)
+                batch = []
+        loaded += crud.substation.upsert_many(db, substations=batch, srid=args.srid)
+    finally:
+        db.close()
+    print(f"Loaded {loaded} substations from {args.path}")
+
+if __name__ == "__main__":
+    main()
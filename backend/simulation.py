@@ -1,7 +1,16 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from dataclasses import replace
 from datetime import datetime
+from pathlib import Path
+
+from app.core.live import publish_progress
+from app.services import monte_carlo, tariff_bands
+from app.services.dispatch import BatteryFleet, DispatchModel, greedy_dispatch, optimize_dispatch
+
+# Incentive on shared energy (EUR/MWh)
+INCENTIVE_EUR_MWH = 110.0
 
 # Load data from CSV files
 def load_data():
@@ -47,7 +56,10 @@ def generate_plots(df):
     plt.show()
 
 # Battery (BESS) simulation
-def simulate_bess(df):
+# mode='greedy' charges on surplus and discharges on deficit; mode='rolling'
+# plans each day ahead on forecasted production and consumption (see
+# simulate_bess_rolling) and reports the incentive gain over greedy.
+def simulate_bess(df, mode='greedy', horizon_hours=48, commit_hours=24):
     bess_max_mwh = 2.0
     bess_min_charge_pct = 0.1
     bess_loss = 0.02
@@ -57,7 +69,8 @@ def simulate_bess(df):
     start = datetime.now()
 
     for idx, row in df.iterrows():
-        if idx == 0:
+        # Every location has its own battery
+        if not bess_data or bess_data[-1].get('location') != row.get('location'):
             row['bess_charge_start'] = bess_initial_charge
         else:
             row['bess_charge_start'] = bess_data[-1]['bess_charge_end']
@@ -78,18 +91,130 @@ def simulate_bess(df):
         bess_data.append(row)
 
     df_bess = pd.DataFrame(bess_data)
+    if mode == 'rolling':
+        df_bess = simulate_bess_rolling(df_bess, bess_max_mwh, bess_min_charge_pct, bess_loss, bess_initial_charge,
+                                        horizon_hours, commit_hours)
     df_bess.plot(x='DateTime', y=['bess_charge_start', 'bess_charge_end'], figsize=(20, 10), lw=1.2, title='BESS State of Charge (MWh)')
     plt.grid(True)
     plt.show()
 
     return df_bess
 
+# Shared energy of the plant (P_MWh, battery on site) with consumers (C_MWh)
+def bess_incentive(production, consumption, charge, discharge):
+    shared = np.minimum(production - charge + discharge, consumption)
+    return shared, float(shared.sum() * INCENTIVE_EUR_MWH)
+
+# Day-ahead forecast: P_forecast_MWh/C_forecast_MWh when the data has them,
+# otherwise persistence (the same hour of the previous day)
+def forecast_series(df, column, steps_per_day=24):
+    forecast_column = column.replace('_MWh', '_forecast_MWh')
+    if forecast_column in df.columns:
+        return df[forecast_column].to_numpy(dtype=float)
+    actual = df[column].to_numpy(dtype=float)
+    return np.concatenate([actual[:steps_per_day], actual[:-steps_per_day]])[:len(actual)]
+
+# Rolling-horizon schedule: every commit_hours, optimize the next
+# horizon_hours on the forecast, then run the committed hours on actual data.
+# Each location has its own battery and is scheduled on its own hourly series:
+# windows and persistence forecasts count rows, so sites must not interleave.
+def simulate_bess_rolling(df_bess, bess_max_mwh, bess_min_charge_pct, bess_loss, bess_initial_charge,
+                          horizon_hours=48, commit_hours=24):
+    if 'location' in df_bess.columns:
+        sites = {
+            location: _simulate_bess_rolling_site(site, bess_max_mwh, bess_min_charge_pct, bess_loss,
+                                                  bess_initial_charge, horizon_hours, commit_hours)
+            for location, site in df_bess.groupby('location', sort=False)
+        }
+        df_out = pd.concat(sites.values())
+        df_out.attrs = {
+            key: sum(site.attrs[key] for site in sites.values())
+            for key in ('incentive_eur', 'greedy_incentive_eur', 'incentive_gain_eur')
+        }
+        df_out.attrs['solve_seconds_per_window'] = [t for site in sites.values() for t in site.attrs['solve_seconds_per_window']]
+        df_out.attrs['incentive_eur_by_location'] = {location: site.attrs['incentive_eur'] for location, site in sites.items()}
+    else:
+        df_out = _simulate_bess_rolling_site(df_bess, bess_max_mwh, bess_min_charge_pct, bess_loss,
+                                             bess_initial_charge, horizon_hours, commit_hours)
+
+    rolling_eur, greedy_eur = df_out.attrs['incentive_eur'], df_out.attrs['greedy_incentive_eur']
+    solve_seconds = df_out.attrs['solve_seconds_per_window']
+    print(f"Incentive: rolling {rolling_eur:,.2f} EUR, greedy {greedy_eur:,.2f} EUR, gain {rolling_eur - greedy_eur:,.2f} EUR")
+    print(f"Solver time per window: mean {np.mean(solve_seconds) * 1000:.1f} ms, "
+          f"max {np.max(solve_seconds) * 1000:.1f} ms over {len(solve_seconds)} windows")
+    return df_out
+
+# One location: the model is built once and only its numbers change between windows
+def _simulate_bess_rolling_site(df_bess, bess_max_mwh, bess_min_charge_pct, bess_loss, bess_initial_charge,
+                                horizon_hours, commit_hours):
+    df_bess = df_bess.sort_values('DateTime')
+    production = df_bess['P_MWh'].to_numpy(dtype=float)
+    consumption = df_bess['C_MWh'].to_numpy(dtype=float)
+    forecast_p = forecast_series(df_bess, 'P_MWh')
+    forecast_c = forecast_series(df_bess, 'C_MWh')
+    floor = bess_min_charge_pct * bess_max_mwh
+    # Baseline on the same battery physics as the rolling run below, from the same start
+    greedy_charge, greedy_discharge, _ = greedy_dispatch(
+        production, consumption, bess_max_mwh, min_soc=bess_min_charge_pct, loss=bess_loss,
+        initial_soc=max(bess_initial_charge, floor),
+    )
+
+    fleet = BatteryFleet(capacity_kwh=bess_max_mwh, power_kw=bess_max_mwh, charge_efficiency=1.0,
+                         discharge_efficiency=1 - bess_loss, min_soc=bess_min_charge_pct)
+    model = DispatchModel(fleet, horizon_hours)
+    charge = np.zeros(len(df_bess))
+    discharge = np.zeros(len(df_bess))
+    soc_start = np.zeros(len(df_bess))
+    soc_end = np.zeros(len(df_bess))
+    solve_seconds = []
+    soc = max(bess_initial_charge, floor)
+
+    for start in range(0, len(df_bess), commit_hours):
+        window = slice(start, start + horizon_hours)
+        plan = optimize_dispatch(
+            forecast_p[window], forecast_c[window], replace(fleet, initial_soc_kwh=soc),
+            incentive=INCENTIVE_EUR_MWH, horizon_steps=horizon_hours, model=model,
+        )
+        solve_seconds.append(plan.solve_seconds)
+        # Run the plan on actual data, with the battery of the greedy rule
+        # (bess_loss × state of charge lost per discharge; the plan only
+        # approximates it as a conversion loss). Actual surplus is always
+        # stored (it would be exported unpaid otherwise); deficits are
+        # covered only down to the planned state of charge, which keeps the
+        # reserve the plan set aside for later hours. With the reserve at the
+        # floor throughout, this is exactly the greedy rule.
+        for step in range(start, min(start + commit_hours, len(df_bess))):
+            surplus = production[step] - consumption[step]
+            reserve = max(plan.soc_kwh[0, step - start], floor)
+            soc_start[step] = soc
+            charge[step] = min(max(surplus, 0), bess_max_mwh - soc)
+            drawn = max(min(-surplus, soc - reserve), 0)
+            discharge[step] = max(drawn - bess_loss * soc, 0)
+            soc += charge[step] - drawn
+            soc_end[step] = soc
+
+    df_bess['bess_charge_start'] = soc_start
+    df_bess['bess_charge_end'] = soc_end
+    df_bess['prod_to_bess_hourly_load'] = charge
+    df_bess['bess_to_consumption_hourly_net'] = discharge
+
+    _, greedy_eur = bess_incentive(production, consumption, greedy_charge, greedy_discharge)
+    df_bess['shared_MWh'], rolling_eur = bess_incentive(production, consumption, charge, discharge)
+
+    df_bess.attrs.update({
+        'incentive_eur': rolling_eur,
+        'greedy_incentive_eur': greedy_eur,
+        'incentive_gain_eur': rolling_eur - greedy_eur,
+        'solve_seconds_per_window': solve_seconds,
+    })
+    return df_bess
+
 # Consumption simulation
 def simulate_consumption(df):
     def clip_normal_value(loc, scale, min_val, max_val):
         return np.clip(np.random.normal(loc=loc, scale=scale), min_val, max_val)
 
-    df_uc = df[['DateTime']].copy()
+    df_uc = df[[c for c in ('DateTime', 'location') if c in df.columns]].copy()
     st_dev = 0.050
 
     df_uc['C_MWh'] = df_uc['DateTime'].apply(lambda x:
@@ -100,42 +225,132 @@ def simulate_consumption(df):
         clip_normal_value(0.150, st_dev, 0.100, 0.200))
 
     df_uc['G_MWh'] = df_uc['C_MWh'].div(0.9)
-    df_uc.set_index('DateTime').plot(figsize=(20, 10), lw=0.5, title='Consumption (MWh)')
+    df_uc.set_index('DateTime')[['C_MWh', 'G_MWh']].plot(figsize=(20, 10), lw=0.5, title='Consumption (MWh)')
     plt.grid(True)
     plt.show()
 
     print(df_uc.describe())
-    print(df_uc.sum())
+    print(df_uc[['C_MWh', 'G_MWh']].sum())
 
-    df_uc.set_index('DateTime').cumsum().plot(figsize=(20, 10), lw=1.0, title='Cumulated Consumption (MWh)')
+    df_uc.set_index('DateTime')[['C_MWh', 'G_MWh']].cumsum().plot(figsize=(20, 10), lw=1.0, title='Cumulated Consumption (MWh)')
     plt.grid(True)
     plt.show()
 
     return df_uc
 
-# Combine production and consumption
-def combine_data(df_prod, df_uc):
-    df_tot = pd.merge(df_prod.set_index('DateTime'), df_uc.set_index('DateTime'), how='inner', right_index=True).reset_index()
+# Monte Carlo consumption: K realizations of simulate_consumption's model,
+# run through the greedy BESS and sharing together; returns P10/P50/P90 of
+# shared energy and incentives, in total and per day. Every location is
+# simulated on its own series, with its own battery and seed, and the
+# realizations are then added up over the locations. With a configuration_id,
+# progress (locations done) is published on its live channel.
+def simulate_consumption_monte_carlo(df, realizations=1000, seed=None, configuration_id=None):
+    sites = list(df.groupby('location', sort=False)) if 'location' in df.columns else [(None, df)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sites))
+    results = []
+    for (location, site), site_seed in zip(sites, seeds):
+        site = site.sort_values('DateTime')
+        results.append(monte_carlo.simulate(
+            site['P_MWh'].to_numpy(), site['DateTime'].dt.hour.to_numpy(),
+            realizations=realizations, seed=site_seed, incentive=INCENTIVE_EUR_MWH,
+            periods=site['DateTime'].dt.date.to_numpy(),
+        ))
+        if configuration_id is not None:
+            publish_progress(configuration_id, task="monte_carlo", completed=len(results), total=len(sites),
+                             location=location)
+    result = monte_carlo.combine(results)
+    df_bands = result.bands()
+    df_daily = result.period_bands()
+    print(df_bands)
+
+    df_daily.plot(figsize=(20, 10), lw=0.8, title='Daily Shared Energy P10/P50/P90 (MWh)')
+    plt.grid(True)
+    plt.show()
+
+    return df_bands, df_daily
+
+# Combine production and consumption: joined on (location, DateTime) over a
+# sorted, unique index and reindexed to a regular grid per location, with net
+# and cumulative series computed on numeric columns only
+def combine_data(df_prod, df_uc, freq='h'):
+    keys = ['location', 'DateTime'] if 'location' in df_prod.columns and 'location' in df_uc.columns else ['DateTime']
+
+    def indexed(df):
+        df = df.set_index(keys).sort_index()
+        return df[~df.index.duplicated(keep='last')]
+
+    df_p = indexed(df_prod)
+    df_c = indexed(df_uc)
+    df_tot = df_p.join(df_c[df_c.columns.difference(df_p.columns)], how='inner')
+
+    # Regular grid, so gaps show up as missing rows instead of silently merging
+    times = df_tot.index.get_level_values('DateTime')
+    grid = pd.date_range(times.min(), times.max(), freq=freq)
+    if len(keys) == 2:
+        grid = pd.MultiIndex.from_product([df_tot.index.unique('location'), grid], names=keys)
+    else:
+        grid = pd.Index(grid, name='DateTime')
+    df_tot = df_tot.reindex(grid)
+
     df_tot['net_MWh'] = df_tot['P_MWh'] - df_tot['C_MWh']
-    df_tot[['net_MWh', 'P_MWh', 'C_MWh']].set_index('DateTime').plot(figsize=(20, 10), lw=1.0, title='Production and Consumption (MWh)')
+    cumulative = ['net_MWh', 'P_MWh', 'C_MWh']
+    if len(keys) == 2:
+        df_cum = df_tot[cumulative].groupby(level='location').cumsum()
+    else:
+        df_cum = df_tot[cumulative].cumsum()
+    df_tot[[f'{column}_cum' for column in cumulative]] = df_cum.to_numpy()
+    df_tot = df_tot.reset_index()
+
+    df_hourly = df_tot.groupby('DateTime')[cumulative].sum()
+    df_hourly.plot(figsize=(20, 10), lw=1.0, title='Production and Consumption (MWh)')
     plt.grid(True)
     plt.show()
 
-    df_tot.cumsum().plot(figsize=(20, 10), lw=1.0, title='Cumulated (MWh)')
+    df_hourly.cumsum().plot(figsize=(20, 10), lw=1.0, title='Cumulated (MWh)')
     plt.grid(True)
     plt.show()
 
     return df_tot
 
+# Production, consumption and shared energy by ARERA band (F1/F2/F3); the
+# PVGIS timestamps are UTC
+def summarize_bands(df_tot):
+    bands = tariff_bands.classify(df_tot['DateTime'].to_numpy(), utc=True)
+    df_bands = pd.DataFrame({
+        'band': pd.Series(bands).map(tariff_bands.BAND_NAMES).to_numpy(),
+        'P_MWh': df_tot['P_MWh'].to_numpy(),
+        'C_MWh': df_tot['C_MWh'].to_numpy(),
+        'shared_MWh': np.minimum(df_tot['P_MWh'], df_tot['C_MWh']).to_numpy(),
+    }).groupby('band').sum()
+    print(df_bands)
+    return df_bands
+
+# Export simulation output as Parquet (.parquet) or Arrow IPC (.arrow)
+def export_results(df, path, columns=None):
+    path = Path(path)
+    numeric = df.select_dtypes(include=[np.number, 'datetime']).columns
+    df_out = df[[c for c in (columns or numeric) if c in df.columns]]
+    if path.suffix == '.arrow':
+        df_out.reset_index(drop=True).to_feather(path)
+    else:
+        df_out.to_parquet(path, index=False)
+    return path
+
 # Main execution
-def main():
+def main(output_dir=None, bess_mode='greedy'):
     df = load_data()
     year_plot = [2020, 2021, 2022]
     df_filtered = filter_data(df, year_plot)
     generate_plots(df_filtered)
     df_uc = simulate_consumption(df_filtered)
-    df_bess = simulate_bess(df_filtered)
-    combine_data(df_filtered, df_uc)
+    df_tot = combine_data(df_filtered, df_uc)
+    # The battery needs consumption too; grid rows left empty by gaps are skipped
+    df_bess = simulate_bess(df_tot.dropna(subset=['P_MWh', 'C_MWh']).reset_index(drop=True), mode=bess_mode)
+    summarize_bands(df_tot)
+
+    if output_dir:
+        export_results(df_bess, Path(output_dir) / 'bess.parquet')
+        export_results(df_tot, Path(output_dir) / 'combined.parquet')
 
 if __name__ == "__main__":
     main()